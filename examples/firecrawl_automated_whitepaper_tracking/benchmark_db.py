@@ -0,0 +1,147 @@
+__doc__ = """Benchmark of synchronous against asynchronous persistence in the extraction pipeline.
+
+Each simulated paper waits for a fake scrape, is stored with add_paper and gets its
+notification status updated, the same database work process_paper_batch does per paper.
+The sync path calls Database directly from the coroutines, as the pipeline used to, which
+freezes every scrape in flight during a round-trip. The async path goes through
+AsyncDatabase. Rows are written under a reserved URL prefix and deleted afterwards.
+
+Usage:
+    python benchmark_db.py --concurrency 5 20 50 --scrape-latency 0.5
+
+Pass --database-url sqlite:// to benchmark against an in-memory database without network.
+"""
+
+import argparse
+import asyncio
+import os
+import time
+from datetime import datetime
+
+from dotenv import load_dotenv
+from sqlalchemy import text
+
+from logging_config import setup_base_logging
+from supabase_db import AsyncDatabase, Database
+
+logger = setup_base_logging(
+    logger_name="benchmark_db",
+    log_file="benchmark_db.log"
+)
+
+BENCHMARK_URL_PREFIX = "https://benchmark.invalid/papers/"
+DEFAULT_CONCURRENCY = (5, 20, 50)
+DEFAULT_SCRAPE_LATENCY_SECONDS = 0.5
+
+
+def benchmark_paper(index: int) -> dict:
+    """Build the extracted details of a synthetic paper."""
+    return {
+        "url": f"{BENCHMARK_URL_PREFIX}{index}",
+        "paper_title": f"Benchmark paper {index}",
+        "authors": "Jane Doe, John Smith",
+        "abstract_body": "Synthetic paper written by the persistence benchmark.",
+        "view_pdf_url": None,
+        "view_arxiv_page_url": None,
+        "github_repo_url": "",
+        "utc_publication_date_year": 2024,
+        "utc_publication_date_month": 1,
+        "utc_publication_date_day": 1,
+        "utc_submission_date_year": 2024,
+        "utc_submission_date_month": 1,
+        "utc_submission_date_day": 1,
+        "number_of_upvotes": 0,
+        "number_of_comments": 0,
+        "extraction_success": True,
+        "last_extraction_attempt": datetime.now(),
+    }
+
+
+async def run_sync(db: Database, papers: list[dict], scrape_latency: float) -> float:
+    """Process papers calling the blocking Database from the event loop."""
+    async def process(paper_data: dict) -> None:
+        await asyncio.sleep(scrape_latency)
+        db.add_paper(paper_data)
+        db.update_notification_status(paper_data["url"], True)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(process(paper_data) for paper_data in papers))
+    return time.perf_counter() - started
+
+
+async def run_async(db: Database, papers: list[dict], scrape_latency: float) -> float:
+    """Process papers through AsyncDatabase."""
+    async with AsyncDatabase(db) as async_db:
+        async def process(paper_data: dict) -> None:
+            await asyncio.sleep(scrape_latency)
+            await async_db.add_paper(paper_data)
+            await async_db.update_notification_status(paper_data["url"], True)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(process(paper_data) for paper_data in papers))
+        return time.perf_counter() - started
+
+
+def delete_benchmark_rows(db: Database) -> None:
+    """Remove all papers written by the benchmark."""
+    session = db.session_factory()
+    try:
+        session.execute(
+            text("DELETE FROM papers WHERE url LIKE :prefix"),
+            {"prefix": f"{BENCHMARK_URL_PREFIX}%"}
+        )
+        session.commit()
+    finally:
+        session.close()
+
+
+def run_benchmark(
+    db: Database,
+    concurrency_levels: tuple[int, ...] = DEFAULT_CONCURRENCY,
+    scrape_latency: float = DEFAULT_SCRAPE_LATENCY_SECONDS
+) -> list[tuple[int, float, float]]:
+    """
+    Time the sync and async paths at each concurrency level.
+
+    Args:
+        db (Database): Database to benchmark against
+        concurrency_levels (tuple[int, ...]): Numbers of papers processed concurrently
+        scrape_latency (float): Simulated scrape time of each paper in seconds
+
+    Returns:
+        list[tuple[int, float, float]]: Concurrency, sync seconds and async seconds per level
+    """
+    results = []
+    try:
+        for concurrency in concurrency_levels:
+            papers = [benchmark_paper(index) for index in range(concurrency)]
+            delete_benchmark_rows(db)
+            sync_seconds = asyncio.run(run_sync(db, papers, scrape_latency))
+            delete_benchmark_rows(db)
+            async_seconds = asyncio.run(run_async(db, papers, scrape_latency))
+            logger.info(
+                "%d concurrent papers: sync %.2fs, async %.2fs (%.1fx)",
+                concurrency, sync_seconds, async_seconds, sync_seconds / async_seconds
+            )
+            results.append((concurrency, sync_seconds, async_seconds))
+    finally:
+        delete_benchmark_rows(db)
+    return results
+
+
+if __name__ == "__main__":
+    load_dotenv()
+    parser = argparse.ArgumentParser(description='Benchmark sync against async persistence.')
+    parser.add_argument('--concurrency', type=int, nargs='+', default=list(DEFAULT_CONCURRENCY),
+                       help='Numbers of concurrent papers to benchmark (default: 5 20 50)')
+    parser.add_argument('--scrape-latency', type=float, default=DEFAULT_SCRAPE_LATENCY_SECONDS,
+                       help='Simulated scrape time of each paper in seconds')
+    parser.add_argument('--database-url', default=os.getenv("POSTGRES_URL"),
+                       help='Database to benchmark against (default: POSTGRES_URL)')
+    args = parser.parse_args()
+
+    run_benchmark(
+        Database(args.database_url),
+        tuple(args.concurrency),
+        args.scrape_latency
+    )
@@ -74,4 +74,61 @@ homes for papers on agentic LLM systems:
     • Machine Learning (cs.LG)
     • Human-Computer Interaction (cs.HC)
     • Software Engineering (cs.SE)
-"""
\ No newline at end of file
+"""
+# Title and abstract of typical "AI Agents" papers. The lexical prefilter scores papers
+# against each of them as well as against the definition above, so that agent papers worded
+# differently from the definition are still sent to the classifier. Keep them out of
+# labelled_papers.py, which the prefilter threshold is calibrated on.
+CATEGORY_EXEMPLARS = [
+    """HuggingGPT: Solving AI Tasks with ChatGPT and its Friends in Hugging Face
+    We use a large language model as a controller that manages existing AI models from the
+    Hugging Face community to solve complicated tasks. The LLM plans the task, selects models
+    according to their descriptions, executes each subtask with the selected model and
+    summarizes the response from the execution results, handling language, vision and speech
+    tasks autonomously.""",
+    """ChatDev: Communicative Agents for Software Development
+    We present a virtual software company in which LLM-powered agents in roles such as CEO,
+    programmer, reviewer and tester collaborate through chat chains. The agents design, code,
+    test and document software with little human involvement, and communicative dehallucination
+    lets them request missing details from each other before acting.""",
+    """CAMEL: Communicative Agents for "Mind" Exploration of Large Language Model Society
+    We propose a role-playing framework in which two autonomous agents cooperate to complete
+    tasks through multi-turn conversation with inception prompting and minimal human input.
+    The framework generates conversational data for studying the cooperative behaviors and
+    capabilities of multi-agent systems of language models.""",
+    """AppAgent: Multimodal Agents as Smartphone Users
+    We introduce a multimodal agent framework that operates smartphone applications through a
+    simplified action space of taps and swipes, mimicking human interaction. The agent learns
+    to navigate and use new apps by autonomous exploration or by observing demonstrations,
+    building a knowledge base it consults to perform complex tasks across apps.""",
+    """A Survey on Large Language Model based Autonomous Agents
+    Autonomous agents have long been studied, and large language models now show potential for
+    human-level decision making. We review LLM-based autonomous agents through a unified
+    framework of profile, memory, planning and action modules, and summarize their applications
+    in social science, natural science and engineering along with evaluation strategies.""",
+    """Language Agent Tree Search Unifies Reasoning, Acting, and Planning in Language Models
+    We introduce a general framework that uses language models as agents, value functions and
+    optimizers within Monte Carlo tree search. Environment feedback and self-reflection guide
+    the search, letting the agent plan and act adaptively on programming, interactive question
+    answering and web navigation tasks.""",
+    """OpenHands: An Open Platform for AI Software Developers as Generalist Agents
+    We present an open platform for developing agents that interact with the world like human
+    developers: by writing code, running commands in a sandboxed shell and browsing the web.
+    The platform supports new agents, safe code execution, coordination between multiple
+    agents and evaluation on benchmarks for software engineering and web browsing.""",
+    """tau-bench: A Benchmark for Tool-Agent-User Interaction in Real-World Domains
+    We propose a benchmark emulating dynamic conversations between a simulated user and a
+    language agent that has domain-specific API tools and policy guidelines. Agents must gather
+    information, call tools and follow rules over many turns, and even state-of-the-art
+    function calling agents succeed on fewer than half of the tasks and are inconsistent.""",
+    """Magentic-One: A Generalist Multi-Agent System for Solving Complex Tasks
+    Magentic-One is a multi-agent system in which a lead Orchestrator agent plans, tracks
+    progress and re-plans to recover from errors, while directing specialized agents that
+    operate a web browser, navigate local files and write and execute Python code to complete
+    open-ended web and file-based tasks.""",
+    """Agent Workflow Memory
+    Language model agents struggle with long-horizon tasks such as navigating the web. We
+    induce commonly reused routines, or workflows, from past experience and selectively provide
+    them to the agent to guide subsequent generations, both offline from training examples and
+    online from test queries on the fly, improving success rates on web navigation benchmarks.""",
+]
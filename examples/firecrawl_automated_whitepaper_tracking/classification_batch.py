@@ -0,0 +1,228 @@
+__doc__ = """Classification of papers through the OpenAI Batch API.
+
+Submitting papers as one batch job costs half the price of synchronous requests, and each
+request of the job classifies several papers with the desired category sent once (see
+semantic_filter.classify_papers). Results arrive within the completion window rather than
+immediately, so they are written to the classification cache.
+
+The tracker submits the new papers of a run this way when started with
+--classification batch: it stores the papers but holds back their notifications. Collecting
+the finished job then sends the notifications and posts of the papers that belong to the
+category (firecrawl_crawl_extract.collect_batch_classifications), which the tracker does at
+the start of its next run and the collect command below does on demand. Stored papers can
+also be submitted for backfills and evaluations; those carry no URL and are only cached.
+
+Jobs are recorded in the classification_batches table when submitted, so they can be
+collected by a later process, such as the next scheduled run.
+
+Usage:
+    python classification_batch.py submit --date 2024-03-15 --days 7
+    python classification_batch.py collect
+"""
+
+import argparse
+import json
+import os
+from datetime import datetime, timedelta
+from typing import NamedTuple, Optional
+
+from dotenv import load_dotenv
+
+from classification_cache import category_hash, classification_key
+from logging_config import setup_base_logging
+from semantic_filter import (
+    CLASSIFICATION_BATCH_SIZE,
+    CLASSIFIER_MODEL,
+    CLASSIFIER_TEMPERATURE,
+    CONFIDENCE_THRESHOLD,
+    DESIRED_CATEGORY,
+    build_batch_messages,
+    classification_cache,
+    client,
+    parse_batch_classifications
+)
+from supabase_db import AsyncDatabase, Database
+
+logger = setup_base_logging(
+    logger_name="classification_batch",
+    log_file="classification_batch.log"
+)
+
+BATCH_ENDPOINT = "/v1/chat/completions"
+BATCH_COMPLETION_WINDOW = "24h"
+# Batch API job states that will still change
+BATCH_PENDING_STATUSES = ("validating", "in_progress", "finalizing", "cancelling")
+
+
+class BatchCollection(NamedTuple):
+    """Outcome of collect_classification_batches."""
+    stored: int
+    # Papers submitted with a URL (by the tracker) that belong to the category
+    relevant_urls: list[str]
+    # Papers submitted with a URL whose job or request returned no valid result
+    unclassified_urls: list[str]
+
+
+def submit_classification_batch(
+    db: Database,
+    papers: list[tuple],
+    desired_category: str = DESIRED_CATEGORY,
+    batch_size: int = CLASSIFICATION_BATCH_SIZE,
+    openai_client=None
+) -> Optional[str]:
+    """
+    Submit the papers without a cached classification as one Batch API job.
+
+    Args:
+        db (Database): Database holding the classification cache
+        papers (list[tuple]): (title, abstract) of each paper, or (title, abstract, url) for
+            papers whose notification waits for the result
+        desired_category (str): Category definition
+        batch_size (int): Papers per request of the job
+        openai_client: OpenAI client, semantic_filter's by default
+
+    Returns:
+        Optional[str]: ID of the submitted job, None if every paper was cached already
+    """
+    openai_client = openai_client or client
+    keyed = {
+        classification_key(title, abstract, desired_category, CLASSIFIER_MODEL):
+            (title, abstract, url[0] if url else None)
+        for title, abstract, *url in papers
+    }
+    cached = db.get_cached_classification_keys(list(keyed))
+    pending = [(key, *paper) for key, paper in keyed.items() if key not in cached]
+    if not pending:
+        logger.info("All %d papers are classified already", len(keyed))
+        return None
+
+    lines = []
+    requests = {}
+    for start in range(0, len(pending), batch_size):
+        chunk = pending[start:start + batch_size]
+        custom_id = f"classify-{start // batch_size}"
+        lines.append(json.dumps({
+            "custom_id": custom_id,
+            "method": "POST",
+            "url": BATCH_ENDPOINT,
+            "body": {
+                "model": CLASSIFIER_MODEL,
+                "messages": build_batch_messages(
+                    [(title, abstract) for _, title, abstract, _ in chunk], desired_category
+                ),
+                "response_format": {"type": "json_object"},
+                "temperature": CLASSIFIER_TEMPERATURE,
+            },
+        }))
+        requests[custom_id] = [[key, title, url] for key, title, _, url in chunk]
+
+    input_file = openai_client.files.create(
+        file=("classifications.jsonl", "\n".join(lines).encode("utf-8")), purpose="batch"
+    )
+    batch = openai_client.batches.create(
+        input_file_id=input_file.id,
+        endpoint=BATCH_ENDPOINT,
+        completion_window=BATCH_COMPLETION_WINDOW
+    )
+    db.save_classification_batch(
+        batch.id, CLASSIFIER_MODEL, category_hash(desired_category), requests
+    )
+    logger.info(
+        "Submitted batch %s classifying %d papers in %d requests (%d cached)",
+        batch.id, len(pending), len(lines), len(cached)
+    )
+    return batch.id
+
+
+def collect_classification_batches(db: Database, openai_client=None) -> BatchCollection:
+    """
+    Cache the results of every finished classification job.
+
+    Jobs that are still running are left for a later call. Failed, expired and cancelled
+    jobs are closed. Papers submitted by the tracker that got no valid result, because
+    their job or request failed, are reported as unclassified so that the caller can
+    classify them synchronously.
+
+    Returns:
+        BatchCollection: Number of classifications cached, and the URLs of submitted papers
+            that belong to the category or got no result
+    """
+    openai_client = openai_client or client
+    stored = 0
+    relevant_urls = []
+    unclassified_urls = []
+    for batch_id, model, cat_hash, requests in db.get_pending_classification_batches():
+        batch = openai_client.batches.retrieve(batch_id)
+        if batch.status in BATCH_PENDING_STATUSES:
+            logger.info("Batch %s is %s", batch_id, batch.status)
+            continue
+        answered = set()
+        if batch.status == "completed" and batch.output_file_id:
+            output = openai_client.files.content(batch.output_file_id).text
+            for line in output.splitlines():
+                result = json.loads(line)
+                papers = requests.get(result["custom_id"])
+                response = result.get("response") or {}
+                if not papers or result.get("error") or response.get("status_code") != 200:
+                    logger.warning(
+                        "Request %s of batch %s failed: %s",
+                        result["custom_id"], batch_id, result.get("error")
+                    )
+                    continue
+                message = response["body"]["choices"][0]["message"]["content"] or ""
+                for paper_id, match in parse_batch_classifications(message, len(papers)).items():
+                    answered.add((result["custom_id"], paper_id))
+                    # Jobs submitted before URLs were recorded hold [key, title]
+                    key, title, *url = papers[paper_id]
+                    if db.save_classification(
+                        key, cat_hash, model, title, match.belongs_to_category, match.confidence
+                    ):
+                        stored += 1
+                    if (url and url[0] and match.belongs_to_category
+                            and match.confidence > CONFIDENCE_THRESHOLD):
+                        relevant_urls.append(url[0])
+        else:
+            logger.warning("Batch %s ended as %s", batch_id, batch.status)
+        for custom_id, papers in requests.items():
+            for paper_id, (_, _, *url) in enumerate(papers):
+                if url and url[0] and (custom_id, paper_id) not in answered:
+                    unclassified_urls.append(url[0])
+        db.finish_classification_batch(batch_id, batch.status)
+    logger.info(
+        "Cached %d classifications from finished batches, %d papers to notify, "
+        "%d without a result",
+        stored, len(relevant_urls), len(unclassified_urls)
+    )
+    return BatchCollection(stored, relevant_urls, unclassified_urls)
+
+if __name__ == "__main__":
+    load_dotenv()
+    parser = argparse.ArgumentParser(description='Classify papers with the OpenAI Batch API.')
+    parser.add_argument('command', choices=('submit', 'collect'),
+                       help='Submit stored papers as a batch job, or cache finished results '
+                            'and notify the relevant papers submitted by the tracker')
+    parser.add_argument('--date', type=str,
+                       help='First submission date to classify, YYYY-MM-DD (default: today)')
+    parser.add_argument('--days', type=int, default=1,
+                       help='Number of submission days to classify (default: 1)')
+    args = parser.parse_args()
+
+    database = Database(os.getenv("POSTGRES_URL"))
+    classification_cache.use_database(database)
+    if args.command == 'submit':
+        first_day = (datetime.strptime(args.date, "%Y-%m-%d") if args.date
+                     else datetime.now().replace(hour=0, minute=0, second=0, microsecond=0))
+        rows = database.get_papers_submitted_between(
+            first_day, first_day + timedelta(days=args.days), ["title", "abstract"]
+        )
+        submit_classification_batch(database, [(row.title, row.abstract) for row in rows])
+    else:
+        # Imported here, since firecrawl_crawl_extract submits its jobs through this module
+        import asyncio
+        from firecrawl_crawl_extract import collect_batch_classifications
+
+        async def collect():
+            async with AsyncDatabase(database) as async_db:
+                await collect_batch_classifications(async_db)
+
+        asyncio.run(collect())
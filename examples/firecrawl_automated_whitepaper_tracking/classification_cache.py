@@ -0,0 +1,116 @@
+__doc__ = """Persistent cache of semantic filter classifications.
+
+Classifying a paper costs an OpenAI request, and reruns after a crash, backfills and test
+runs see the same papers again. Results are cached under a hash of everything that decides
+them: title, abstract, desired category and model. Editing category_prompt.DESIRED_CATEGORY
+or switching models therefore changes every key, which invalidates the old results without
+deleting them; they stay in the paper_classifications table as a record of past
+relevance evaluations.
+
+Lookups go through an in-process LRU first, then the database when one is attached.
+"""
+
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from typing import Optional
+
+from logging_config import setup_base_logging
+
+logger = setup_base_logging(
+    logger_name="classification_cache",
+    log_file="classification_cache.log"
+)
+
+DEFAULT_LRU_SIZE = 1024
+
+
+def _sha256(value: str) -> str:
+    return hashlib.sha256(value.encode("utf-8")).hexdigest()
+
+
+def classification_key(title: str, abstract: str, desired_category: str, model: str) -> str:
+    """Cache key of a classification: a hash of all of its inputs."""
+    return _sha256(json.dumps([title, abstract, desired_category, model]))
+
+
+def category_hash(desired_category: str) -> str:
+    """Hash identifying a desired category, stored with each classification."""
+    return _sha256(desired_category)
+
+
+class ClassificationCache:
+    """Two-level cache of (belongs_to_category, confidence) results.
+
+    Thread-safe, since classifications run in worker threads of the pipeline. Database
+    errors are logged by Database and count as misses, so the cache never fails a
+    classification.
+    """
+
+    def __init__(self, db=None, max_size: int = DEFAULT_LRU_SIZE):
+        self.db = db
+        self.max_size = max_size
+        self._entries: OrderedDict[str, tuple[bool, float]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.memory_hits = 0
+        self.db_hits = 0
+        self.misses = 0
+
+    @property
+    def hits(self) -> int:
+        return self.memory_hits + self.db_hits
+
+    def use_database(self, db) -> None:
+        """Persist classifications in db (a Database) from now on."""
+        self.db = db
+
+    def _remember(self, key: str, result: tuple[bool, float]) -> None:
+        with self._lock:
+            self._entries[key] = result
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def get(
+        self, title: str, abstract: str, desired_category: str, model: str
+    ) -> Optional[tuple[bool, float]]:
+        """Return the cached classification of a paper, or None on a miss."""
+        key = classification_key(title, abstract, desired_category, model)
+        with self._lock:
+            result = self._entries.get(key)
+            if result is not None:
+                self._entries.move_to_end(key)
+                self.memory_hits += 1
+                return result
+        result = self.db.get_classification(key) if self.db is not None else None
+        with self._lock:
+            if result is None:
+                self.misses += 1
+                return None
+            self.db_hits += 1
+        self._remember(key, result)
+        return result
+
+    def put(
+        self,
+        title: str,
+        abstract: str,
+        desired_category: str,
+        model: str,
+        belongs: bool,
+        confidence: float
+    ) -> None:
+        """Cache the classification of a paper."""
+        key = classification_key(title, abstract, desired_category, model)
+        self._remember(key, (belongs, confidence))
+        if self.db is not None:
+            self.db.save_classification(
+                key, category_hash(desired_category), model, title, belongs, confidence
+            )
+
+    def log_summary(self) -> None:
+        logger.info(
+            "Classification cache: %d memory hits, %d database hits, %d misses",
+            self.memory_hits, self.db_hits, self.misses
+        )
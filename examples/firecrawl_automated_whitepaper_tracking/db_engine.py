@@ -0,0 +1,242 @@
+__doc__ = """Pooler-aware SQLAlchemy engine factory with connection pool metrics.
+
+Supabase can be reached directly or through its Supavisor pooler, and each path needs
+different client-side pooling:
+
+- direct: a connection to the database itself. A regular QueuePool with pre-ping.
+- transaction: the transaction pooler on port 6543, as used by the GitHub workflow. The
+  pooler hands out a server connection per transaction, so holding client-side connections
+  is pointless and session state (including server-side prepared statements) does not
+  survive between transactions. Uses NullPool and disables prepared statements.
+- session: the session pooler on port 5432 of the pooler host. Each client connection pins
+  a server connection, so the client pool is kept small and recycled regularly.
+- local: a SQLite file or in-memory database (sqlite:///papers.db or sqlite://) for tests
+  and benchmarks without network. An in-memory database lives in a single pooled
+  connection that threads take turns on, since every new connection would open an empty
+  database.
+
+The mode is detected from the connection string unless set explicitly or through the
+DB_POOL_MODE environment variable, which does not apply to SQLite URLs.
+"""
+
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Optional
+from urllib.parse import urlparse
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.pool import NullPool, QueuePool
+
+from latency_stats import percentile
+from logging_config import setup_base_logging
+
+logger = setup_base_logging(
+    logger_name="db_engine",
+    log_file="db_engine.log"
+)
+
+POOL_MODE_DIRECT = "direct"
+POOL_MODE_TRANSACTION = "transaction"
+POOL_MODE_SESSION = "session"
+POOL_MODE_LOCAL = "local"
+POOL_MODES = (POOL_MODE_DIRECT, POOL_MODE_TRANSACTION, POOL_MODE_SESSION, POOL_MODE_LOCAL)
+
+TRANSACTION_POOLER_PORT = 6543
+POOLER_HOST_SUFFIX = ".pooler.supabase.com"
+# Direct connections: SQLAlchemy's defaults, sized for the AsyncDatabase thread pool
+DIRECT_POOL_SIZE = 5
+DIRECT_MAX_OVERFLOW = 10
+# Session pooler connections each pin a server connection, so stay well below its limit
+SESSION_POOL_SIZE = 3
+SESSION_MAX_OVERFLOW = 2
+SESSION_POOL_RECYCLE_SECONDS = 300
+POOL_TIMEOUT_SECONDS = 30
+
+
+@dataclass
+class PoolMetrics:
+    """Connection pool counters of one engine, updated from pool events."""
+    mode: str
+    connects: int = 0
+    checkouts: int = 0
+    checkins: int = 0
+    invalidations: int = 0
+    peak_checked_out: int = 0
+    peak_overflow: int = 0
+    checkout_latencies: list[float] = field(default_factory=list)
+    engine: Optional[Engine] = field(default=None, repr=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    @property
+    def pool(self):
+        """The engine's current pool, which is replaced when the engine is disposed."""
+        return self.engine.pool if self.engine is not None else None
+
+    @property
+    def pool_size(self) -> int:
+        """Configured number of pooled connections, 0 for NullPool."""
+        return self.pool.size() if isinstance(self.pool, QueuePool) else 0
+
+    @property
+    def connection_limit(self) -> Optional[int]:
+        """Most connections the pool opens at once, None if it sets no limit (NullPool)."""
+        if not isinstance(self.pool, QueuePool) or self.pool._max_overflow < 0:
+            return None
+        return self.pool.size() + self.pool._max_overflow
+
+    @property
+    def checked_out(self) -> int:
+        if isinstance(self.pool, QueuePool):
+            return self.pool.checkedout()
+        return self.checkouts - self.checkins
+
+    @property
+    def overflow(self) -> int:
+        """Connections currently open beyond pool_size."""
+        return max(0, self.pool.overflow()) if isinstance(self.pool, QueuePool) else 0
+
+    @property
+    def checkout_latency_p50(self) -> float:
+        return percentile(self.checkout_latencies, 50)
+
+    @property
+    def checkout_latency_p95(self) -> float:
+        return percentile(self.checkout_latencies, 95)
+
+    def record_checkout(self, latency: float) -> None:
+        with self._lock:
+            self.checkouts += 1
+            self.checkout_latencies.append(latency)
+            self.peak_checked_out = max(self.peak_checked_out, self.checked_out)
+            self.peak_overflow = max(self.peak_overflow, self.overflow)
+
+    def log_summary(self) -> None:
+        logger.info(
+            "Pool (%s): size %d, %d connects, %d checkouts, peak %d checked out, "
+            "peak overflow %d, %d invalidations, checkout latency p50 %.3fs / p95 %.3fs",
+            self.mode, self.pool_size, self.connects, self.checkouts, self.peak_checked_out,
+            self.peak_overflow, self.invalidations, self.checkout_latency_p50,
+            self.checkout_latency_p95
+        )
+
+
+def is_local_database(connection_string: str) -> bool:
+    """Whether a connection string points at a local SQLite database."""
+    return connection_string.startswith("sqlite")
+
+
+def detect_pool_mode(connection_string: str) -> str:
+    """
+    Infer the pooling mode from a connection string.
+
+    Args:
+        connection_string (str): SQLAlchemy or libpq connection URL
+
+    Returns:
+        str: POOL_MODE_LOCAL for SQLite, POOL_MODE_TRANSACTION for port 6543,
+            POOL_MODE_SESSION for other ports of a Supabase pooler host,
+            POOL_MODE_DIRECT otherwise
+    """
+    if is_local_database(connection_string):
+        return POOL_MODE_LOCAL
+    parsed = urlparse(connection_string)
+    if parsed.port == TRANSACTION_POOLER_PORT:
+        return POOL_MODE_TRANSACTION
+    if (parsed.hostname or "").endswith(POOLER_HOST_SUFFIX):
+        return POOL_MODE_SESSION
+    return POOL_MODE_DIRECT
+
+
+def _timed_pool_class(base: type, metrics: PoolMetrics) -> type:
+    """Subclass a pool class so that every checkout records its latency."""
+    def connect(self):
+        started = time.perf_counter()
+        connection = base.connect(self)
+        metrics.record_checkout(time.perf_counter() - started)
+        return connection
+    return type(f"Timed{base.__name__}", (base,), {"connect": connect})
+
+
+def create_database_engine(
+    connection_string: str,
+    mode: Optional[str] = None
+) -> tuple[Engine, PoolMetrics]:
+    """
+    Create an engine with pooling suited to how the database is reached.
+
+    Args:
+        connection_string (str): SQLAlchemy connection URL
+        mode (Optional[str]): One of POOL_MODES. Defaults to POOL_MODE_LOCAL for SQLite,
+            otherwise to DB_POOL_MODE or the mode detected from the connection string
+
+    Returns:
+        tuple[Engine, PoolMetrics]: The engine and the metrics of its connection pool
+
+    Raises:
+        ValueError: If mode is not a known pool mode
+    """
+    if mode is None:
+        mode = detect_pool_mode(connection_string)
+        if mode != POOL_MODE_LOCAL:
+            mode = os.getenv("DB_POOL_MODE") or mode
+    if mode not in POOL_MODES:
+        raise ValueError(f"Unknown pool mode {mode!r}, expected one of {POOL_MODES}")
+    metrics = PoolMetrics(mode)
+
+    if mode == POOL_MODE_TRANSACTION:
+        # Every checkout opens a fresh connection, which the pooler maps onto a pooled
+        # server connection. psycopg2 never prepares statements server-side; the option
+        # keeps that guarantee if the engine is switched to a driver that does.
+        options = {
+            "poolclass": _timed_pool_class(NullPool, metrics),
+            "connect_args": {"prepare_threshold": None}
+            if connection_string.startswith("postgresql+psycopg:") else {},
+        }
+    elif mode == POOL_MODE_LOCAL:
+        # Connections are handed between the threads of AsyncDatabase
+        options = {
+            "poolclass": _timed_pool_class(QueuePool, metrics),
+            "connect_args": {"check_same_thread": False},
+            "pool_timeout": POOL_TIMEOUT_SECONDS,
+        }
+        if make_url(connection_string).database in (None, "", ":memory:"):
+            options["pool_size"] = 1
+            options["max_overflow"] = 0
+    elif mode == POOL_MODE_SESSION:
+        options = {
+            "poolclass": _timed_pool_class(QueuePool, metrics),
+            "pool_size": SESSION_POOL_SIZE,
+            "max_overflow": SESSION_MAX_OVERFLOW,
+            "pool_recycle": SESSION_POOL_RECYCLE_SECONDS,
+            "pool_timeout": POOL_TIMEOUT_SECONDS,
+            "pool_pre_ping": True,
+        }
+    else:
+        options = {
+            "poolclass": _timed_pool_class(QueuePool, metrics),
+            "pool_size": DIRECT_POOL_SIZE,
+            "max_overflow": DIRECT_MAX_OVERFLOW,
+            "pool_timeout": POOL_TIMEOUT_SECONDS,
+            "pool_pre_ping": True,  # Pre-ping helps keep connections alive
+        }
+
+    logger.info("Creating %s engine", mode)
+    engine = create_engine(connection_string, **options)
+    metrics.engine = engine
+
+    @event.listens_for(engine, "connect")
+    def on_connect(dbapi_connection, connection_record):
+        metrics.connects += 1
+
+    @event.listens_for(engine, "checkin")
+    def on_checkin(dbapi_connection, connection_record):
+        metrics.checkins += 1
+
+    @event.listens_for(engine, "invalidate")
+    def on_invalidate(dbapi_connection, connection_record, exception):
+        metrics.invalidations += 1
+
+    return engine, metrics
@@ -0,0 +1,286 @@
+__doc__ = """Incremental change-data-capture export of papers to pluggable sinks.
+
+Instead of dumping the whole papers table every time, each export only emits the papers
+whose last_updated moved past the sink's watermark since its previous export, in batches
+of (last_updated, url) keyset order. The watermark is checkpointed in export_checkpoints
+after every batch the sink accepted, so an interrupted export resumes where it stopped.
+
+Delivery is at-least-once: a batch written just before a crash is sent again on resume.
+The Notion sink updates existing pages by URL, so repeats are harmless there; the file
+sinks append, so readers should keep the last record per URL.
+
+Papers updated within the last EXPORT_SAFETY_LAG_SECONDS are left for the next export,
+which gives transactions that stamped last_updated before committing time to commit, so
+the watermark does not move past a change that is not visible yet.
+
+Usage:
+    python exporter.py --sink file --path papers.jsonl
+    python exporter.py --sink notion
+"""
+
+import argparse
+import csv
+import json
+import os
+import time
+from abc import ABC, abstractmethod
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Optional
+
+import requests
+from dotenv import load_dotenv
+
+from logging_config import setup_base_logging
+from supabase_db import Database, ExportWatermark
+
+logger = setup_base_logging(
+    logger_name="exporter",
+    log_file="exporter.log"
+)
+
+EXPORT_BATCH_SIZE = 200
+EXPORT_SAFETY_LAG_SECONDS = 60
+# Columns of the papers table handed to sinks
+EXPORTED_COLUMNS = (
+    "url", "title", "authors", "abstract", "pdf_url", "arxiv_url", "github_url",
+    "publication_date", "submission_date", "upvotes", "comments", "notification_sent",
+    "extraction_success", "last_updated"
+)
+
+FILE_FORMAT_JSONL = "jsonl"
+FILE_FORMAT_CSV = "csv"
+FILE_FORMATS = (FILE_FORMAT_JSONL, FILE_FORMAT_CSV)
+
+NOTION_API_URL = "https://api.notion.com/v1"
+NOTION_VERSION = "2022-06-28"
+# Notion allows an average of three requests per second per integration
+NOTION_REQUESTS_PER_SECOND = 3
+NOTION_MAX_ATTEMPTS = 5
+NOTION_TEXT_LIMIT = 2000
+NOTION_TIMEOUT_SECONDS = 30
+
+
+def _json_value(value):
+    """Make a column value JSON serializable."""
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+
+class ExportSink(ABC):
+    """Destination of exported papers.
+
+    Subclasses implement write. The name identifies the sink's checkpoint, so it must stay
+    the same between exports to the same destination.
+    """
+    name = "sink"
+
+    @abstractmethod
+    def write(self, rows: list[dict]) -> None:
+        """Deliver a batch of papers. Raise to stop the export before it is checkpointed."""
+
+    def close(self) -> None:
+        """Release the resources of the sink."""
+
+    def __enter__(self) -> "ExportSink":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+class FileSink(ExportSink):
+    """Appends exported papers to a local JSONL or CSV file."""
+
+    def __init__(self, path: str, file_format: Optional[str] = None):
+        self.path = Path(path).resolve()
+        self.file_format = file_format or (
+            FILE_FORMAT_CSV if self.path.suffix == ".csv" else FILE_FORMAT_JSONL
+        )
+        if self.file_format not in FILE_FORMATS:
+            raise ValueError(f"Unknown file format {self.file_format!r}, expected one of {FILE_FORMATS}")
+        self.name = f"file:{self.path}"
+
+    def write(self, rows: list[dict]) -> None:
+        write_header = not self.path.exists() or self.path.stat().st_size == 0
+        with open(self.path, "a", encoding="utf-8", newline="") as file:
+            if self.file_format == FILE_FORMAT_JSONL:
+                for row in rows:
+                    file.write(json.dumps({k: _json_value(v) for k, v in row.items()}) + "\n")
+                return
+            writer = csv.DictWriter(file, fieldnames=list(rows[0]))
+            if write_header:
+                writer.writeheader()
+            for row in rows:
+                writer.writerow({
+                    k: json.dumps(v) if isinstance(v, list) else _json_value(v)
+                    for k, v in row.items()
+                })
+
+
+class NotionSink(ExportSink):
+    """Creates or updates one page per paper in a Notion database.
+
+    The database needs these properties: Title (title), URL (url), Authors (rich text),
+    Abstract (rich text), PDF, arXiv and GitHub (url), Published and Submitted (date),
+    Upvotes and Comments (number). Requests are spaced to stay within Notion's rate limit,
+    and throttled requests are retried after the delay Notion asks for.
+    """
+
+    def __init__(
+        self,
+        token: Optional[str] = None,
+        database_id: Optional[str] = None,
+        requests_per_second: float = NOTION_REQUESTS_PER_SECOND
+    ):
+        self.token = token or os.getenv("NOTION_TOKEN")
+        self.database_id = database_id or os.getenv("NOTION_DATABASE_ID")
+        if not self.token or not self.database_id:
+            raise ValueError("NOTION_TOKEN and NOTION_DATABASE_ID must be set")
+        self.name = f"notion:{self.database_id}"
+        self.min_interval = 1.0 / requests_per_second
+        self._last_request = 0.0
+        self._page_ids: dict[str, str] = {}
+        self.session = requests.Session()
+        self.session.headers.update({
+            "Authorization": f"Bearer {self.token}",
+            "Notion-Version": NOTION_VERSION,
+            "Content-Type": "application/json",
+        })
+
+    def close(self) -> None:
+        self.session.close()
+
+    def _request(self, method: str, path: str, payload: dict) -> dict:
+        """Send a rate-limited request, retrying throttled and transient failures."""
+        for attempt in range(1, NOTION_MAX_ATTEMPTS + 1):
+            wait = self._last_request + self.min_interval - time.monotonic()
+            if wait > 0:
+                time.sleep(wait)
+            self._last_request = time.monotonic()
+            response = self.session.request(
+                method, f"{NOTION_API_URL}{path}", json=payload, timeout=NOTION_TIMEOUT_SECONDS
+            )
+            if response.status_code == 429 or response.status_code >= 500:
+                if attempt == NOTION_MAX_ATTEMPTS:
+                    break
+                delay = float(response.headers.get("Retry-After", 2 ** attempt))
+                logger.warning(
+                    "Notion returned %d, retrying in %.1fs", response.status_code, delay
+                )
+                time.sleep(delay)
+                continue
+            break
+        response.raise_for_status()
+        return response.json()
+
+    def _find_page(self, url: str) -> Optional[str]:
+        """Return the ID of the page of a paper, or None if it has none yet."""
+        if url not in self._page_ids:
+            result = self._request("POST", f"/databases/{self.database_id}/query", {
+                "filter": {"property": "URL", "url": {"equals": url}},
+                "page_size": 1,
+            })
+            if not result["results"]:
+                return None
+            self._page_ids[url] = result["results"][0]["id"]
+        return self._page_ids[url]
+
+    @staticmethod
+    def page_properties(row: dict) -> dict:
+        """Notion page properties of an exported paper."""
+        def rich_text(value):
+            return {"rich_text": [{"text": {"content": (value or "")[:NOTION_TEXT_LIMIT]}}]}
+
+        def day(value):
+            return {"date": {"start": value.date().isoformat()} if value else None}
+
+        return {
+            "Title": {"title": [{"text": {"content": (row["title"] or row["url"])[:NOTION_TEXT_LIMIT]}}]},
+            "URL": {"url": row["url"]},
+            "Authors": rich_text(", ".join(row["authors"] or [])),
+            "Abstract": rich_text(row["abstract"]),
+            "PDF": {"url": row["pdf_url"] or None},
+            "arXiv": {"url": row["arxiv_url"] or None},
+            "GitHub": {"url": row["github_url"] or None},
+            "Published": day(row["publication_date"]),
+            "Submitted": day(row["submission_date"]),
+            "Upvotes": {"number": row["upvotes"]},
+            "Comments": {"number": row["comments"]},
+        }
+
+    def write(self, rows: list[dict]) -> None:
+        for row in rows:
+            if not row["extraction_success"]:
+                continue  # nothing worth a page until the extraction succeeds
+            properties = self.page_properties(row)
+            page_id = self._find_page(row["url"])
+            if page_id:
+                self._request("PATCH", f"/pages/{page_id}", {"properties": properties})
+            else:
+                page = self._request("POST", "/pages", {
+                    "parent": {"database_id": self.database_id},
+                    "properties": properties,
+                })
+                self._page_ids[row["url"]] = page["id"]
+
+
+def export_changes(
+    db: Database,
+    sink: ExportSink,
+    batch_size: int = EXPORT_BATCH_SIZE,
+    safety_lag_seconds: float = EXPORT_SAFETY_LAG_SECONDS,
+    max_batches: Optional[int] = None
+) -> int:
+    """
+    Export the papers changed since the sink's last export.
+
+    Args:
+        db (Database): Database to export from
+        sink (ExportSink): Destination of the changed papers
+        batch_size (int): Papers per batch, and per checkpoint
+        safety_lag_seconds (float): Papers updated more recently are left for the next export
+        max_batches (Optional[int]): Stop after this many batches, to export in slices
+
+    Returns:
+        int: Number of papers exported
+    """
+    watermark = db.get_export_checkpoint(sink.name)
+    until = datetime.now() - timedelta(seconds=safety_lag_seconds)
+    logger.info(
+        "Exporting to %s changes since %s",
+        sink.name, watermark.last_updated if watermark else "the beginning"
+    )
+    exported = batches = 0
+    while max_batches is None or batches < max_batches:
+        rows = db.get_changed_papers(watermark, until, batch_size, EXPORTED_COLUMNS)
+        if not rows:
+            break
+        sink.write([row._asdict() for row in rows])
+        watermark = ExportWatermark(rows[-1].last_updated, rows[-1].url)
+        db.save_export_checkpoint(sink.name, watermark, len(rows))
+        exported += len(rows)
+        batches += 1
+        if len(rows) < batch_size:
+            break
+    logger.info("Exported %d changed papers to %s in %d batches", exported, sink.name, batches)
+    return exported
+
+
+if __name__ == "__main__":
+    load_dotenv()
+    parser = argparse.ArgumentParser(description='Export changed papers to a sink.')
+    parser.add_argument('--sink', choices=('file', 'notion'), default='file',
+                       help='Where to export to (default: file)')
+    parser.add_argument('--path', default='papers.jsonl',
+                       help='File of the file sink, CSV if it ends in .csv, else JSONL')
+    parser.add_argument('--batch-size', type=int, default=EXPORT_BATCH_SIZE,
+                       help='Papers exported and checkpointed per batch')
+    parser.add_argument('--max-batches', type=int,
+                       help='Stop after this many batches (default: until caught up)')
+    args = parser.parse_args()
+
+    database = Database(os.getenv("POSTGRES_URL"))
+    with (NotionSink() if args.sink == 'notion' else FileSink(args.path)) as export_sink:
+        export_changes(database, export_sink, args.batch_size, max_batches=args.max_batches)
@@ -0,0 +1,297 @@
+__doc__ = """Content-addressed on-disk cache for Firecrawl responses and paper pages.
+
+Responses are stored as one JSON file per request, keyed by the scraped URL, a hash of the
+extraction schema and the remaining request options. Besides scrape and extract responses,
+firecrawl_crawl_extract records its discovery requests (crawl, map and links-only scrape)
+and the paper page HTML it parses locally, so a recorded run can be replayed in full. Entries expire after a TTL and the
+cache is kept under a size limit by evicting the least recently used files. The size and
+recency of the entries are tracked in memory, so the directory is only listed once per
+process rather than on every write, and the async methods do their disk I/O in worker
+threads so that the event loop is never blocked on it. In replay mode
+the cache never touches the network, which allows the pipeline to be run and benchmarked
+offline from previously recorded responses.
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, Iterable, Optional
+
+from logging_config import setup_base_logging
+
+logger = setup_base_logging(
+    logger_name="firecrawl_cache",
+    log_file="firecrawl_cache.log"
+)
+
+# Cache modes
+MODE_OFF = "off"  # always call Firecrawl, never read or write the cache
+MODE_READ_WRITE = "readwrite"  # serve fresh entries, record everything else
+MODE_REPLAY = "replay"  # serve recorded entries only, never call Firecrawl
+CACHE_MODES = (MODE_OFF, MODE_READ_WRITE, MODE_REPLAY)
+
+DEFAULT_CACHE_DIR = Path(__file__).parent.parent / "cache" / "firecrawl"
+DEFAULT_TTL_HOURS = 24
+DEFAULT_MAX_MB = 200
+
+
+class CacheMissError(LookupError):
+    """Raised in replay mode when a request has no recorded response."""
+
+
+def _canonical_json(value: Any) -> str:
+    return json.dumps(value, sort_keys=True, separators=(",", ":"), default=str)
+
+
+def cache_key(url: str, params: Optional[Dict[str, Any]] = None) -> str:
+    """
+    Build the content address of a Firecrawl scrape request.
+
+    Args:
+        url (str): The scraped URL
+        params (Optional[Dict[str, Any]]): The scrape parameters, including any extract schema
+
+    Returns:
+        str: Hex SHA-256 digest of the URL, the schema hash and the remaining options
+    """
+    options = dict(params or {})
+    extract = dict(options.pop("extract", None) or {})
+    schema = extract.pop("schema", None)
+    schema_hash = hashlib.sha256(_canonical_json(schema).encode("utf-8")).hexdigest()
+    options["extract"] = extract
+    payload = "\n".join([url, schema_hash, _canonical_json(options)])
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class FirecrawlCache:
+    """On-disk cache with TTL expiry and size-bounded LRU eviction."""
+
+    def __init__(
+        self,
+        cache_dir: Path = DEFAULT_CACHE_DIR,
+        mode: str = MODE_READ_WRITE,
+        ttl_seconds: float = DEFAULT_TTL_HOURS * 3600,
+        max_bytes: int = DEFAULT_MAX_MB * 1024 * 1024
+    ):
+        if mode not in CACHE_MODES:
+            raise ValueError(f"Unknown cache mode {mode!r}, expected one of {CACHE_MODES}")
+        self.cache_dir = Path(cache_dir)
+        self.mode = mode
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        # Entry sizes keyed by cache key, least recently used first, loaded on first use
+        self._entries: Optional["OrderedDict[str, int]"] = None
+        self._total_bytes = 0
+        if mode != MODE_OFF:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    @classmethod
+    def from_env(cls) -> "FirecrawlCache":
+        """Create a cache configured by the FIRECRAWL_CACHE_* environment variables."""
+        return cls(
+            cache_dir=Path(os.getenv("FIRECRAWL_CACHE_DIR", str(DEFAULT_CACHE_DIR))),
+            mode=os.getenv("FIRECRAWL_CACHE_MODE", MODE_READ_WRITE),
+            ttl_seconds=float(os.getenv("FIRECRAWL_CACHE_TTL_HOURS", DEFAULT_TTL_HOURS)) * 3600,
+            max_bytes=int(float(os.getenv("FIRECRAWL_CACHE_MAX_MB", DEFAULT_MAX_MB)) * 1024 * 1024)
+        )
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.json"
+
+    def get(self, key: str, ttl_seconds: Optional[float] = None) -> Optional[Any]:
+        """Return the cached response for key, or None if it is missing or expired.
+
+        Replay mode ignores the TTL, since recorded responses are all there is.
+        """
+        if self.mode == MODE_OFF:
+            return None
+        path = self._path(key)
+        try:
+            with open(path, encoding="utf-8") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        ttl = self.ttl_seconds if ttl_seconds is None else ttl_seconds
+        if self.mode != MODE_REPLAY and time.time() - entry["stored_at"] > ttl:
+            logger.debug("Cache entry %s expired", key)
+            return None
+        # Reads refresh the modification time, which is what a later process orders its
+        # index by, and move the entry to the recent end of this process's index
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        with self._lock:
+            if self._entries is not None and key in self._entries:
+                self._entries.move_to_end(key)
+        return entry["response"]
+
+    def put(self, key: str, response: Any) -> None:
+        """Store a response and evict least recently used entries beyond max_bytes."""
+        if self.mode != MODE_READ_WRITE:
+            return
+        path = self._path(key)
+        # Whole seconds, so entries of equal responses have equal sizes (a float timestamp
+        # varies in length) and the byte budget evicts them predictably
+        data = json.dumps({"stored_at": int(time.time()), "response": response}).encode("utf-8")
+        tmp_path = path.with_suffix(f".{threading.get_ident()}.tmp")
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+        with self._lock:
+            self._load_entries()
+            self._total_bytes += len(data) - self._entries.pop(key, 0)
+            self._entries[key] = len(data)
+            self._evict()
+
+    def _load_entries(self) -> None:
+        """Index the entries on disk by modification time, once per cache object."""
+        if self._entries is not None:
+            return
+        entries = []
+        for path in self.cache_dir.glob("*.json"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, path.stem, stat.st_size))
+        entries.sort()
+        self._entries = OrderedDict((key, size) for _, key, size in entries)
+        self._total_bytes = sum(self._entries.values())
+
+    def _evict(self) -> None:
+        """Remove least recently used entries until the cache fits max_bytes.
+
+        Must be called with the lock held and the index loaded.
+        """
+        while self._total_bytes > self.max_bytes and self._entries:
+            key, size = self._entries.popitem(last=False)
+            self._total_bytes -= size
+            try:
+                self._path(key).unlink()
+                logger.debug("Evicted cache entry %s", key)
+            except OSError:
+                pass
+
+    def _lookup(self, url: str, params: Optional[Dict[str, Any]], ttl_seconds: Optional[float]):
+        """Return (key, cached response or None), counting hits and misses."""
+        key = cache_key(url, params)
+        response = self.get(key, ttl_seconds)
+        with self._lock:
+            if response is not None:
+                self.hits += 1
+            else:
+                self.misses += 1
+        if response is not None:
+            logger.info("Cache hit for %s", url)
+            return key, response
+        if self.mode == MODE_REPLAY:
+            raise CacheMissError(f"No recorded Firecrawl response for {url}")
+        return key, None
+
+    def fetch(
+        self,
+        url: str,
+        params: Optional[Dict[str, Any]],
+        fetch: Callable[[], Any],
+        ttl_seconds: Optional[float] = None
+    ) -> Any:
+        """Return the cached response of a request, calling fetch on a miss.
+
+        Raises:
+            CacheMissError: In replay mode, if the request was never recorded
+        """
+        if self.mode == MODE_OFF:
+            return fetch()
+        key, response = self._lookup(url, params, ttl_seconds)
+        if response is None:
+            response = fetch()
+            self.put(key, response)
+        return response
+
+    async def afetch(
+        self,
+        url: str,
+        params: Optional[Dict[str, Any]],
+        fetch: Callable[[], Awaitable[Any]],
+        ttl_seconds: Optional[float] = None
+    ) -> Any:
+        """Async variant of fetch, awaiting fetch() on a miss."""
+        if self.mode == MODE_OFF:
+            return await fetch()
+        key, response = await asyncio.to_thread(self._lookup, url, params, ttl_seconds)
+        if response is None:
+            response = await fetch()
+            await asyncio.to_thread(self.put, key, response)
+        return response
+
+    def scrape_url(
+        self,
+        app: Any,
+        url: str,
+        params: Optional[Dict[str, Any]] = None,
+        ttl_seconds: Optional[float] = None
+    ) -> Any:
+        """Cached equivalent of FirecrawlApp.scrape_url."""
+        return self.fetch(url, params, lambda: app.scrape_url(url, params), ttl_seconds)
+
+    async def ascrape_url(
+        self,
+        client: Any,
+        url: str,
+        params: Optional[Dict[str, Any]] = None,
+        ttl_seconds: Optional[float] = None
+    ) -> Any:
+        """Cached equivalent of AsyncFirecrawlClient.scrape_url."""
+        return await self.afetch(url, params, lambda: client.scrape_url(url, params), ttl_seconds)
+
+    async def abatch_scrape_urls(
+        self,
+        client: Any,
+        urls: Iterable[str],
+        params: Optional[Dict[str, Any]] = None,
+        ttl_seconds: Optional[float] = None
+    ) -> Dict[str, Any]:
+        """Cached equivalent of AsyncFirecrawlClient.batch_scrape_urls.
+
+        Only URLs without a fresh entry are submitted, in a single batch job, and each
+        result is stored under the same key as a single scrape of that URL. In replay
+        mode unrecorded URLs are left out of the result instead of raising.
+        """
+        urls = list(urls)
+        if self.mode == MODE_OFF:
+            return await client.batch_scrape_urls(urls, params)
+
+        def lookup_all():
+            responses = {}
+            keys = {}
+            for url in urls:
+                try:
+                    key, response = self._lookup(url, params, ttl_seconds)
+                except CacheMissError as e:
+                    logger.warning("%s", e)
+                    continue
+                if response is None:
+                    keys[url] = key
+                else:
+                    responses[url] = response
+            return responses, keys
+
+        def put_all(fetched):
+            for url, response in fetched.items():
+                self.put(keys[url], response)
+
+        responses, keys = await asyncio.to_thread(lookup_all)
+        if keys:
+            fetched = await client.batch_scrape_urls(list(keys), params)
+            await asyncio.to_thread(put_all, fetched)
+            responses.update(fetched)
+        return responses
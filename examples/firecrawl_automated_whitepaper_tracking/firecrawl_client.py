@@ -0,0 +1,231 @@
+__doc__ = """Pooled asynchronous client for the Firecrawl v1 REST API.
+
+firecrawl-py only ships a synchronous client that opens a new connection per request and has
+to be pushed through a thread pool from async code. This client keeps one aiohttp session with
+keep-alive connection pooling per event loop and is shared by URL discovery and extraction.
+"""
+
+import asyncio
+import json
+import os
+from typing import Any, Dict, Iterable, Optional
+
+import aiohttp
+
+from logging_config import setup_base_logging
+
+logger = setup_base_logging(
+    logger_name="firecrawl_client",
+    log_file="firecrawl_client.log"
+)
+
+DEFAULT_API_URL = "https://api.firecrawl.dev"
+DEFAULT_MAX_CONNECTIONS = 10
+DEFAULT_TIMEOUT_SECONDS = 60
+KEEPALIVE_TIMEOUT_SECONDS = 30
+# Rate limiting and transient gateway errors are retried with exponential backoff, or after
+# the delay the API asks for in a Retry-After header
+RETRIES = 3
+BACKOFF_FACTOR = 0.5
+RETRY_STATUSES = (429, 502, 503, 504)
+BATCH_POLL_INTERVAL_SECONDS = 2
+# Overall limit on waiting for a batch scrape job, from submission to completion
+BATCH_TIMEOUT_SECONDS = 600
+# Batch scrape job states reported by Firecrawl while the job is still running
+BATCH_PENDING_STATES = ('active', 'paused', 'pending', 'queued', 'waiting', 'scraping')
+
+
+class FirecrawlAPIError(Exception):
+    """Raised when the Firecrawl API reports an unsuccessful request."""
+
+
+def _retry_after(response: aiohttp.ClientResponse) -> Optional[float]:
+    """Delay in seconds requested by a Retry-After header, if it holds a number."""
+    try:
+        return max(0.0, float(response.headers["Retry-After"]))
+    except (KeyError, ValueError):
+        return None
+
+
+class AsyncFirecrawlClient:
+    """Async Firecrawl client sharing one pooled session across all requests.
+
+    The session is created lazily for the running event loop, so one client can be created
+    up front and injected into the pipeline. Use it as an async context manager, or call
+    close() when done.
+    """
+
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        api_url: Optional[str] = None,
+        max_connections: int = DEFAULT_MAX_CONNECTIONS,
+        timeout_seconds: float = DEFAULT_TIMEOUT_SECONDS
+    ):
+        self.api_key = api_key or os.getenv("FIRECRAWL_API_KEY")
+        if not self.api_key:
+            raise ValueError("FIRECRAWL_API_KEY environment variable not set")
+        self.api_url = (api_url or os.getenv("FIRECRAWL_API_URL", DEFAULT_API_URL)).rstrip("/")
+        self.max_connections = max_connections
+        self.timeout_seconds = timeout_seconds
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    async def __aenter__(self) -> "AsyncFirecrawlClient":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        """The pooled session of the running event loop."""
+        loop = asyncio.get_running_loop()
+        if self._session is None or self._session.closed or self._loop is not loop:
+            self._session = aiohttp.ClientSession(
+                headers={"Authorization": f"Bearer {self.api_key}"},
+                timeout=aiohttp.ClientTimeout(total=self.timeout_seconds),
+                connector=aiohttp.TCPConnector(
+                    limit=self.max_connections,
+                    keepalive_timeout=KEEPALIVE_TIMEOUT_SECONDS
+                )
+            )
+            self._loop = loop
+            logger.debug("Opened Firecrawl session with %d connections", self.max_connections)
+        return self._session
+
+    async def close(self) -> None:
+        """Close the pooled session."""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+        self._loop = None
+
+    async def request_json(
+        self,
+        method: str,
+        url: str,
+        json_data: Optional[Dict[str, Any]] = None,
+        stats: Optional[Any] = None
+    ) -> Dict[str, Any]:
+        """
+        Call a Firecrawl API endpoint and decode its JSON response.
+
+        Args:
+            method (str): HTTP method
+            url (str): API path such as /v1/scrape, or an absolute URL (e.g. a ``next`` page)
+            json_data (Optional[Dict[str, Any]]): Request body
+            stats (Optional[Any]): Object with ``requests`` and ``bytes_transferred``
+                counters to update, such as DiscoveryStats
+
+        Returns:
+            Dict[str, Any]: The decoded response body
+
+        Raises:
+            aiohttp.ClientResponseError: If the request fails with an HTTP error status, or
+                with a retryable status (see RETRY_STATUSES) on every attempt
+        """
+        if url.startswith("/"):
+            url = f"{self.api_url}{url}"
+        for attempt in range(RETRIES):
+            async with self.session.request(method, url, json=json_data) as response:
+                body = await response.read()
+                if stats is not None:
+                    stats.requests += 1
+                    stats.bytes_transferred += len(body)
+                if response.status in RETRY_STATUSES and attempt < RETRIES - 1:
+                    delay = _retry_after(response) or BACKOFF_FACTOR * (2 ** attempt)
+                    logger.warning(
+                        "Firecrawl returned %d for %s, retrying in %.2fs",
+                        response.status, url, delay
+                    )
+                    await asyncio.sleep(delay)
+                    continue
+                response.raise_for_status()
+                return json.loads(body)
+
+    async def scrape_url(self, url: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Async equivalent of FirecrawlApp.scrape_url, returning the scraped data."""
+        response = await self.request_json("POST", "/v1/scrape", {"url": url, **(params or {})})
+        if response.get("success") and "data" in response:
+            return response["data"]
+        raise FirecrawlAPIError(f"Failed to scrape URL. Error: {response.get('error', response)}")
+
+    async def batch_scrape_urls(
+        self,
+        urls: Iterable[str],
+        params: Optional[Dict[str, Any]] = None,
+        poll_interval: float = BATCH_POLL_INTERVAL_SECONDS,
+        stats: Optional[Any] = None,
+        timeout: Optional[float] = BATCH_TIMEOUT_SECONDS
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Async equivalent of FirecrawlApp.batch_scrape_urls, mapping results back to URLs.
+
+        Submits one batch scrape job for all URLs, polls it until it completes and follows
+        the ``next`` pages of the result.
+
+        Args:
+            urls (Iterable[str]): URLs to scrape with the same parameters
+            params (Optional[Dict[str, Any]]): Scrape parameters shared by all URLs
+            poll_interval (float): Seconds between status checks
+            stats (Optional[Any]): Counters to update, as in request_json
+            timeout (Optional[float]): Seconds to wait for the job to complete, None to
+                wait indefinitely
+
+        Returns:
+            Dict[str, Dict[str, Any]]: Scraped data of each URL that succeeded. URLs that
+                failed or are missing from the result are left out.
+
+        Raises:
+            FirecrawlAPIError: If the job cannot be started, fails as a whole or does not
+                complete within the timeout
+        """
+        urls = list(urls)
+        loop = asyncio.get_running_loop()
+        deadline = None if timeout is None else loop.time() + timeout
+        response = await self.request_json(
+            "POST", "/v1/batch/scrape", {"urls": urls, **(params or {})}, stats
+        )
+        if not response.get("success") or "id" not in response:
+            raise FirecrawlAPIError(
+                f"Failed to start batch scrape job. Error: {response.get('error', response)}"
+            )
+        status_url = f"/v1/batch/scrape/{response['id']}"
+
+        while True:
+            status = await self.request_json("GET", status_url, stats=stats)
+            if status.get("status") not in BATCH_PENDING_STATES:
+                break
+            if deadline is not None and loop.time() + poll_interval > deadline:
+                raise FirecrawlAPIError(
+                    f"Batch scrape job {response['id']} did not complete within {timeout}s. "
+                    f"Status: {status.get('status')}"
+                )
+            await asyncio.sleep(poll_interval)
+        if status.get("status") != "completed":
+            raise FirecrawlAPIError(
+                f"Batch scrape job failed or was stopped. Status: {status.get('status')}"
+            )
+
+        entries = list(status.get("data") or [])
+        while status.get("next"):
+            status = await self.request_json("GET", status["next"], stats=stats)
+            entries.extend(status.get("data") or [])
+
+        requested = {url.rstrip("/"): url for url in urls}
+        results = {}
+        for entry in entries:
+            metadata = entry.get("metadata") or {}
+            source_url = metadata.get("sourceURL") or metadata.get("url") or ""
+            url = requested.get(source_url.rstrip("/"))
+            if url is None:
+                logger.warning("Ignoring batch scrape result for unrequested URL %s", source_url)
+            elif (metadata.get("statusCode") or 200) >= 400:
+                logger.warning(
+                    "Batch scrape of %s failed with status %s", url, metadata["statusCode"]
+                )
+            else:
+                results[url] = entry
+        logger.info("Batch scrape returned %d of %d URLs", len(results), len(urls))
+        return results
@@ -4,20 +4,36 @@ Handles paper metadata extraction and processing for the notification system.
 """
 
 import asyncio
+import hashlib
 import os
 import re
+from contextlib import suppress
+from dataclasses import dataclass
 from datetime import datetime
-from typing import Dict, Any
+from functools import lru_cache
+from typing import Dict, Any, AsyncIterator, Iterable, Optional, Union
 
 # Third-party imports
+import aiohttp
 import pytz
-import requests
 from sqlalchemy.exc import SQLAlchemyError
 from pydantic import BaseModel
-from firecrawl import FirecrawlApp
 from dotenv import load_dotenv
-from supabase_db import Database
-from semantic_filter import should_process
+from supabase_db import AsyncDatabase, Database, UrlPartition
+from firecrawl_cache import CacheMissError, FirecrawlCache
+from firecrawl_client import AsyncFirecrawlClient, FirecrawlAPIError
+from hf_paper_parser import parse_paper_html
+from scheduler import AdaptiveScheduler
+from pipeline import Pipeline, Stage
+from semantic_filter import (
+    AsyncSemanticFilter,
+    classification_cache,
+    classify_papers,
+    needs_classification,
+    prefilter,
+    token_usage
+)
+from classification_batch import collect_classification_batches, submit_classification_batch
 from discord_notifications import send_paper_notification
 from x_post import post_paper
 from logging_config import setup_crawler_logging
@@ -34,197 +50,1093 @@ if not os.getenv("POSTGRES_URL"):
 if not os.getenv("FIRECRAWL_API_KEY"):
     raise ValueError("FIRECRAWL_API_KEY environment variable not set")
 
-def extract_paper_urls(target_url: str) -> list:
+EXCLUDE_URL_PATTERN = re.compile(
+    r"^https://huggingface\.co/papers\?date="
+    r"\d{4}-(?:0[1-9]|1[0-2])-(?:0[1-9]|[12]\d|3[01])$"
+)
+CRAWL_PARAMS = {
+    'limit': 30,
+    'excludePaths': ['papers$'],
+    'includePaths': ['papers/*'],
+    'ignoreSitemap': True,
+    'scrapeOptions': {
+        'formats': ['markdown', 'links', 'html'],
+        'onlyMainContent': False,
+        'includeTags': ['a']
+    }
+}
+# Paper page links on the listing, e.g. https://huggingface.co/papers/2412.14161#community
+PAPER_URL_PATTERN = re.compile(r"^(https://huggingface\.co/papers/\d{4}\.\d{4,5})(?:[?#].*)?$")
+MAP_PARAMS = {
+    'ignoreSitemap': True,
+    'includeSubdomains': False
+}
+LINKS_SCRAPE_PARAMS = {
+    'formats': ['links'],
+    'onlyMainContent': False
+}
+# Discovery modes: a full crawl, a single map request or a links-only scrape of the listing
+DISCOVERY_CRAWL = "crawl"
+DISCOVERY_MAP = "map"
+DISCOVERY_LINKS = "links"
+DISCOVERY_MODES = (DISCOVERY_CRAWL, DISCOVERY_MAP, DISCOVERY_LINKS)
+# Crawl job states reported by Firecrawl while the job is still running
+CRAWL_PENDING_STATES = ('active', 'paused', 'pending', 'queued', 'waiting', 'scraping')
+CRAWL_POLL_INTERVAL_SECONDS = 2
+# Overall limit on waiting for a crawl job, from submission to completion
+CRAWL_TIMEOUT_SECONDS = 600
+PAGE_TIMEOUT_SECONDS = 30
+PAPER_PAGE_USER_AGENT = "firecrawl-automated-whitepaper-tracking/0.1"
+# Cache parameters of a paper page's HTML, which keep it apart from Firecrawl responses
+PAPER_PAGE_CACHE_PARAMS = {"source": "paper_page_html"}
+# Extraction modes: one LLM extract request per paper, or one batch scrape job for all
+# papers of a run that need the LLM fallback
+EXTRACTION_PER_URL = "per-url"
+EXTRACTION_BATCH = "batch"
+EXTRACTION_MODES = (EXTRACTION_PER_URL, EXTRACTION_BATCH)
+# Classification modes: one request per new paper during the run, or one Batch API job
+# whose results are collected, and notified, by collect_batch_classifications
+CLASSIFICATION_SYNC = "sync"
+CLASSIFICATION_BATCH = "batch"
+CLASSIFICATION_MODES = (CLASSIFICATION_SYNC, CLASSIFICATION_BATCH)
+# Worker count of each processing stage. Posting to X is rate limited, so it runs alone.
+PIPELINE_WORKERS = {
+    "persist": 2,
+    "classify": 4,
+    "notify": 2,
+    "post": 1
+}
+# Metrics change between runs, so refreshed metrics are only reused for a short while
+METRICS_CACHE_TTL_SECONDS = 3600
+
+# Cache for scrape/extract responses, configured through FIRECRAWL_CACHE_* variables
+firecrawl_cache = FirecrawlCache.from_env()
+
+def filter_source_urls(page: Dict[str, Any]) -> list[str]:
+    """
+    Return the paper source URLs of a single crawl result page.
+
+    Args:
+        page (Dict[str, Any]): One page of a Firecrawl crawl status response
+
+    Returns:
+        list[str]: Source URLs on the page, excluding daily papers URLs
+    """
+    extracted_urls = []
+    for entry in page.get("data") or []:
+        url = (entry.get("metadata") or {}).get("sourceURL")
+        if url and not EXCLUDE_URL_PATTERN.match(url):
+            extracted_urls.append(url)
+    return extracted_urls
+
+@dataclass
+class DiscoveryStats:
+    """Transfer and cost counters of one paper URL discovery run."""
+    mode: str
+    requests: int = 0
+    bytes_transferred: int = 0
+    credits_used: int = 0
+
+    def log_summary(self) -> None:
+        logger.info(
+            "Discovery mode %s: %d requests, %d bytes transferred, %d credits used",
+            self.mode, self.requests, self.bytes_transferred, self.credits_used
+        )
+
+async def _discovery_request(
+    client: AsyncFirecrawlClient,
+    method: str,
+    url: str,
+    json_data: Optional[Dict[str, Any]] = None,
+    stats: Optional[DiscoveryStats] = None
+) -> Dict[str, Any]:
+    """Make a discovery request through firecrawl_cache.
+
+    Listings change during the day, so responses are recorded but never served while
+    recording (a TTL of 0). In replay mode the recorded responses are served instead,
+    and a request that was never recorded raises CacheMissError.
+    """
+    return await firecrawl_cache.afetch(
+        url,
+        {"method": method, "body": json_data},
+        lambda: client.request_json(method, url, json_data, stats),
+        ttl_seconds=0
+    )
+
+async def _wait_for_crawl(
+    client: AsyncFirecrawlClient,
+    status_url: str,
+    stats: DiscoveryStats,
+    timeout: float = CRAWL_TIMEOUT_SECONDS
+) -> Dict[str, Any]:
+    """Poll a crawl job until it completes and return its first result page.
+
+    A job still running after timeout seconds is cancelled, so that it stops using
+    credits, and discovery fails.
+    """
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    while True:
+        status_data = await _discovery_request(client, "GET", status_url, stats=stats)
+        status = status_data.get("status")
+        if status == "completed":
+            return status_data
+        if status not in CRAWL_PENDING_STATES:
+            raise RuntimeError(f"Crawl job failed or was stopped. Status: {status}")
+        if loop.time() + CRAWL_POLL_INTERVAL_SECONDS > deadline:
+            with suppress(aiohttp.ClientError, asyncio.TimeoutError):
+                await client.request_json("DELETE", status_url, stats=stats)
+            raise RuntimeError(
+                f"Crawl job did not complete within {timeout}s and was cancelled. "
+                f"Status: {status}"
+            )
+        logger.debug("Crawl job status: %s", status)
+        await asyncio.sleep(CRAWL_POLL_INTERVAL_SECONDS)
+
+async def _iter_crawl_urls(
+    client: AsyncFirecrawlClient,
+    target_url: str,
+    stats: DiscoveryStats,
+    prefetch_pages: int
+) -> AsyncIterator[str]:
+    """Stream paper URLs from a full crawl, prefetching result pages in the background."""
+    pages: asyncio.Queue = asyncio.Queue(maxsize=prefetch_pages)
+
+    logger.info("Crawling URL with params: %s", CRAWL_PARAMS)
+    job = await _discovery_request(
+        client, "POST", "/v1/crawl", {"url": target_url, **CRAWL_PARAMS}, stats
+    )
+    status_url = f"/v1/crawl/{job['id']}"
+
+    async def fetch_pages():
+        try:
+            page = await _wait_for_crawl(client, status_url, stats)
+            stats.credits_used += page.get("creditsUsed") or page.get("total") or 0
+            while True:
+                await pages.put(filter_source_urls(page))
+                next_page_url = page.get("next")
+                if not next_page_url:
+                    break
+                logger.debug("Found next page: %s", next_page_url)
+                page = await _discovery_request(client, "GET", next_page_url, stats=stats)
+        except Exception as e:  # handed over to the consumer below
+            await pages.put(e)
+            return
+        await pages.put(None)
+
+    producer = asyncio.create_task(fetch_pages())
+    try:
+        while True:
+            page_urls = await pages.get()
+            if page_urls is None:
+                break
+            if isinstance(page_urls, Exception):
+                raise page_urls
+            logger.debug("Processing crawl page with %d paper URLs", len(page_urls))
+            for url in page_urls:
+                yield url
+    finally:
+        producer.cancel()
+        with suppress(asyncio.CancelledError):
+            await producer
+
+def filter_listing_links(links: Iterable[str]) -> list[str]:
+    """
+    Reduce the links found on a daily papers listing to unique paper page URLs.
+
+    Args:
+        links (Iterable[str]): Links returned by a map or links-only scrape
+
+    Returns:
+        list[str]: Paper page URLs without query strings or fragments, in listing order
+    """
+    paper_urls = {}
+    for link in links:
+        match = PAPER_URL_PATTERN.match(link)
+        if match:
+            paper_urls.setdefault(match.group(1), None)
+    return list(paper_urls)
+
+async def _discover_listing_urls(
+    client: AsyncFirecrawlClient,
+    target_url: str,
+    mode: str,
+    stats: DiscoveryStats
+) -> list[str]:
+    """Discover paper URLs with a single map or links-only scrape request."""
+    if mode == DISCOVERY_MAP:
+        response = await _discovery_request(
+            client, "POST", "/v1/map", {"url": target_url, **MAP_PARAMS}, stats
+        )
+        links = response.get("links") or []
+    else:
+        response = await _discovery_request(
+            client, "POST", "/v1/scrape", {"url": target_url, **LINKS_SCRAPE_PARAMS}, stats
+        )
+        links = (response.get("data") or {}).get("links") or []
+    stats.credits_used += response.get("creditsUsed", 1)
+    return filter_listing_links(links)
+
+async def iter_paper_urls(
+    target_url: str,
+    mode: str = DISCOVERY_LINKS,
+    stats: Optional[DiscoveryStats] = None,
+    prefetch_pages: int = 2,
+    client: Optional[AsyncFirecrawlClient] = None
+) -> AsyncIterator[str]:
+    """
+    Stream paper source URLs found on the given daily papers listing.
+
+    In ``crawl`` mode the listing is crawled and the crawl's result pages are followed
+    through their ``next`` links. A background task downloads up to ``prefetch_pages``
+    pages ahead of the consumer and keeps only the filtered URLs of each page, so callers
+    can start processing the first page while later ones are still downloading and memory
+    does not grow with the number of pages.
+
+    The lean ``links`` and ``map`` modes discover the papers with a single links-only scrape
+    of the listing or a single map request, which transfers and costs far less than a crawl
+    that also scrapes every paper page. If a lean mode fails or finds no papers, the crawl is
+    used as a fallback.
+
+    Args:
+        target_url (str): The URL to crawl for paper sources
+        mode (str): One of DISCOVERY_MODES
+        stats (Optional[DiscoveryStats]): Collects requests, bytes and credits of the run
+        prefetch_pages (int): Maximum number of parsed pages buffered ahead of the consumer
+        client (Optional[AsyncFirecrawlClient]): Shared Firecrawl client. A temporary one
+            is created if not given.
+
+    Yields:
+        str: Paper source URLs, excluding daily papers URLs
+    """
+    if mode not in DISCOVERY_MODES:
+        raise ValueError(f"Unknown discovery mode {mode!r}, expected one of {DISCOVERY_MODES}")
+    if client is None:
+        async with AsyncFirecrawlClient() as client:
+            async for url in iter_paper_urls(target_url, mode, stats, prefetch_pages, client):
+                yield url
+        return
+
+    logger.info("Starting URL extraction from: %s (mode: %s)", target_url, mode)
+    stats = stats or DiscoveryStats(mode)
+    url_count = 0
+
+    if mode != DISCOVERY_CRAWL:
+        try:
+            urls = await _discover_listing_urls(client, target_url, mode, stats)
+        except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as e:
+            logger.error("Discovery mode %s failed, falling back to crawl: %s", mode, e)
+            urls = []
+        if urls:
+            for url in urls:
+                url_count += 1
+                yield url
+            stats.log_summary()
+            logger.info("Extracted %d paper URLs", url_count)
+            return
+        logger.warning("Discovery mode %s found no papers, falling back to crawl", mode)
+        stats.mode = f"{mode}+{DISCOVERY_CRAWL}"
+
+    async for url in _iter_crawl_urls(client, target_url, stats, prefetch_pages):
+        url_count += 1
+        yield url
+    stats.log_summary()
+    logger.info("Extracted %d paper URLs", url_count)
+
+def extract_paper_urls(
+    target_url: str,
+    mode: str = DISCOVERY_LINKS,
+    stats: Optional[DiscoveryStats] = None
+) -> list:
     """
     Extract all paper source URLs from a given target URL using Firecrawl.
     
     Args:
         target_url (str): The URL to crawl for paper sources
+        mode (str): Discovery mode, one of DISCOVERY_MODES
+        stats (Optional[DiscoveryStats]): Collects requests, bytes and credits of the run
         
     Returns:
         list: A list of extracted source URLs, excluding daily papers URLs
     """
-    logger.info("Starting URL extraction from: %s", target_url)
-    exclude_url_pattern = (
-        r"^https://huggingface\.co/papers\?date="
-        r"\d{4}-(?:0[1-9]|1[0-2])-(?:0[1-9]|[12]\d|3[01])$"
-    )
-    def get_all_source_urls(json_data: Dict[str, Any]) -> list:
-        extracted_urls = []
-        logger.debug("Processing JSON data with %d entries", len(json_data.get('data', [])))
-        if "data" in json_data:
-            for entry in json_data["data"]:
-                if "metadata" in entry and "sourceURL" in entry["metadata"]:
-                    url = entry["metadata"]["sourceURL"]
-                    if not re.match(exclude_url_pattern, url):
-                        extracted_urls.append(url)
-        if "next" in json_data and json_data["next"]:
-            logger.debug("Found next page: %s", json_data['next'])
-            next_page_url = json_data["next"]
-            response = requests.get(next_page_url)  # noqa
-            if response.ok:
-                next_json_data = response.json()
-                extracted_urls.extend(get_all_source_urls(next_json_data))
-        return extracted_urls
-
-    load_dotenv()
-    api_key = os.getenv("FIRECRAWL_API_KEY")
-    app = FirecrawlApp(api_key=api_key)
-    params = {
-        'limit': 30,
-        'excludePaths': ['papers$'],
-        'includePaths': ['papers/*'],
-        'ignoreSitemap': True,
-        'scrapeOptions': {
-            'formats': ['markdown', 'links', 'html'],
-            'onlyMainContent': False,
-            'includeTags': ['a']
+    async def collect() -> list:
+        return [url async for url in iter_paper_urls(target_url, mode, stats)]
+
+    return asyncio.run(collect())
+
+class ExtractSchema(BaseModel):
+    """Schema for extracting paper details from Hugging Face papers."""
+    paper_title: str
+    number_of_upvotes: int
+    number_of_comments: int
+    view_pdf_url: str
+    view_arxiv_page_url: str
+    authors: str
+    abstract_body: str
+    # Publication date represents when the paper was originally published (e.g., on arXiv)
+    utc_publication_date_day: int
+    utc_publication_date_month: int
+    utc_publication_date_year: int
+    # Submission date represents when the paper was submitted/added to
+    # HuggingFace's daily papers page
+    utc_submission_date_day: int
+    utc_submission_date_month: int
+    utc_submission_date_year: int
+    github_repo_url: str
+
+class MetricsSchema(BaseModel):
+    """Schema for refreshing only the engagement metrics of a known paper."""
+    number_of_upvotes: int
+    number_of_comments: int
+
+# JSON schemas are generated once at import time instead of on every extraction
+EXTRACT_SCHEMA = ExtractSchema.model_json_schema()
+METRICS_SCHEMA = MetricsSchema.model_json_schema()
+
+@lru_cache(maxsize=None)
+def _extract_params(schema_name: str, fields: frozenset) -> Dict[str, Any]:
+    """
+    Build the scrape parameters of an LLM extract, restricted to the given fields.
+
+    The result is cached per field set and shared between calls, so it must not be
+    modified by callers.
+
+    Args:
+        schema_name (str): "extract" for ExtractSchema or "metrics" for MetricsSchema
+        fields (frozenset): Fields to extract
+
+    Returns:
+        Dict[str, Any]: Parameters for a Firecrawl scrape request
+    """
+    schema = dict(EXTRACT_SCHEMA if schema_name == "extract" else METRICS_SCHEMA)
+    schema["properties"] = {
+        name: value for name, value in schema["properties"].items() if name in fields
+    }
+    schema["required"] = [name for name in schema.get("required", []) if name in fields]
+    return {
+        'formats': ['extract'],
+        'extract': {
+            'schema': schema,
         }
     }
-    logger.info("Crawling URL with params: %s", params)
-    crawl_result = app.crawl_url(target_url, params=params)
-    urls = get_all_source_urls(crawl_result)
-    logger.info("Extracted %d paper URLs", len(urls))
-    return urls
-
-async def extract_paper_details(url: str) -> dict:
-    """Extract paper details from a given URL using FirecrawlApp.
+
+def _paper_page_session() -> aiohttp.ClientSession:
+    """Create a session for fetching Hugging Face paper pages for local parsing."""
+    return aiohttp.ClientSession(
+        headers={"User-Agent": PAPER_PAGE_USER_AGENT},
+        timeout=aiohttp.ClientTimeout(total=PAGE_TIMEOUT_SECONDS)
+    )
+
+async def _parse_paper_page(
+    session: aiohttp.ClientSession,
+    url: str,
+    ttl_seconds: Optional[float] = None
+) -> Dict[str, Any]:
+    """Fetch a paper page and parse what it can locally, returning {} if the fetch fails.
+
+    The HTML goes through firecrawl_cache under its own key, so replay mode parses the
+    recorded page. A page that was never recorded is left to the LLM extract fallback,
+    which is served from the cache as well.
+    """
+    async def fetch_html() -> str:
+        async with session.get(url) as response:
+            response.raise_for_status()
+            return await response.text()
+
+    try:
+        html = await firecrawl_cache.afetch(url, PAPER_PAGE_CACHE_PARAMS, fetch_html, ttl_seconds)
+    except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+        logger.warning("Could not fetch %s for local parsing: %s", url, e)
+        return {}
+    except CacheMissError:
+        logger.warning("No recorded page of %s to parse locally", url)
+        return {}
+    return parse_paper_html(html, url)
+
+async def _llm_extract(
+    client: AsyncFirecrawlClient,
+    url: str,
+    schema_name: str,
+    fields: list[str],
+    ttl_seconds: Optional[float] = None
+) -> Dict[str, Any]:
+    """Extract the given fields of a paper page with a Firecrawl LLM extract."""
+    params = _extract_params(schema_name, frozenset(fields))
+    data = await firecrawl_cache.ascrape_url(client, url, params, ttl_seconds)
+    logger.debug("Raw extraction data: %s", data['extract'])
+    return data['extract']
+
+async def extract_paper_details(
+    url: str,
+    html_session: Optional[aiohttp.ClientSession] = None,
+    client: Optional[AsyncFirecrawlClient] = None
+) -> dict:
+    """Extract paper details from a given URL.
     
     This async function handles the extraction of metadata from individual paper pages.
-    It uses the FirecrawlApp to scrape structured data according to the ExtractSchema.
-    The synchronous FirecrawlApp calls are run in a separate thread using asyncio.to_thread.
+    The page HTML is fetched and parsed locally first with hf_paper_parser. Only the
+    ExtractSchema fields the parser could not fill are extracted with a Firecrawl LLM
+    extract through the shared AsyncFirecrawlClient. Extract responses go through
+    firecrawl_cache, so reruns do not pay for the same extraction twice.
     
     Args:
         url (str): The URL of the paper to extract details from.
+        html_session (Optional[aiohttp.ClientSession]): Session for fetching paper pages.
+            A temporary one is created if not given.
+        client (Optional[AsyncFirecrawlClient]): Shared Firecrawl client. A temporary one
+            is created if not given.
         
     Returns:
         dict: Extracted paper details including title, upvotes, comments, and URLs.
     """
+    if html_session is None or client is None:
+        async with _paper_page_session() as session, AsyncFirecrawlClient() as new_client:
+            return await extract_paper_details(
+                url, html_session or session, client or new_client
+            )
+
     logger.info("Extracting paper details from: %s", url)
-    # Initialize the FirecrawlApp with your API key
-    app = FirecrawlApp(api_key=os.getenv("FIRECRAWL_API_KEY"))
-
-    class ExtractSchema(BaseModel):  # noqa
-        """Schema for extracting paper details from Hugging Face papers."""
-        paper_title: str
-        number_of_upvotes: int
-        number_of_comments: int
-        view_pdf_url: str
-        view_arxiv_page_url: str
-        authors: str
-        abstract_body: str
-        # Publication date represents when the paper was originally published (e.g., on arXiv)
-        utc_publication_date_day: int
-        utc_publication_date_month: int
-        utc_publication_date_year: int
-        # Submission date represents when the paper was submitted/added to
-        # HuggingFace's daily papers page
-        utc_submission_date_day: int
-        utc_submission_date_month: int
-        utc_submission_date_year: int
-        github_repo_url: str
-
-    # Run the synchronous scrape_url method in a separate thread
-    data = await asyncio.to_thread(
-        app.scrape_url,
-        url,
-        {
-            'formats': ['extract'],
-            'extract': {
-                'schema': ExtractSchema.model_json_schema(),
-            }
+    details = await _parse_paper_page(html_session, url)
+    missing = [field for field in ExtractSchema.model_fields if field not in details]
+    if not missing:
+        logger.info("Parsed all paper details locally for %s", url)
+        return details
+
+    logger.info("Falling back to LLM extract for %d fields of %s", len(missing), url)
+    extracted = await _llm_extract(client, url, "extract", missing)
+    # Locally parsed values take precedence over the LLM's
+    return {**extracted, **details}
+
+async def extract_paper_details_batch(
+    urls: list[str],
+    html_session: aiohttp.ClientSession,
+    client: AsyncFirecrawlClient
+) -> Dict[str, Union[dict, Exception]]:
+    """Extract the details of many papers, sharing batch scrape jobs for the LLM fallback.
+
+    All pages are parsed locally first, as in extract_paper_details. Papers missing the
+    same fields are then submitted together as one Firecrawl batch scrape job, which is
+    polled until it completes, instead of one extract request per paper.
+
+    Args:
+        urls (list[str]): The URLs of the papers to extract details from.
+        html_session (aiohttp.ClientSession): Session for fetching paper pages.
+        client (AsyncFirecrawlClient): Shared Firecrawl client.
+
+    Returns:
+        Dict[str, Union[dict, Exception]]: Details of each URL, or the exception that
+            made its extraction fail.
+    """
+    parsed = await asyncio.gather(*(_parse_paper_page(html_session, url) for url in urls))
+    results = {}
+    groups: Dict[frozenset, list[str]] = {}
+    for url, details in zip(urls, parsed):
+        missing = frozenset(field for field in ExtractSchema.model_fields if field not in details)
+        if missing:
+            groups.setdefault(missing, []).append(url)
+        else:
+            results[url] = details
+    logger.info("Parsed all paper details locally for %d of %d papers", len(results), len(urls))
+
+    parsed_by_url = dict(zip(urls, parsed))
+    for missing, group in groups.items():
+        logger.info("Batch extracting %d fields of %d papers", len(missing), len(group))
+        try:
+            scraped = await firecrawl_cache.abatch_scrape_urls(
+                client, group, _extract_params("extract", missing)
+            )
+        except Exception as e:
+            logger.error(f"Batch extraction of {len(group)} papers failed: {e}")
+            results.update((url, e) for url in group)
+            continue
+        for url in group:
+            data = scraped.get(url) or {}
+            if "extract" not in data:
+                results[url] = FirecrawlAPIError(f"No batch extraction result for {url}")
+                continue
+            # Locally parsed values take precedence over the LLM's
+            results[url] = {**data["extract"], **parsed_by_url[url]}
+    return results
+
+async def extract_paper_metrics(
+    url: str,
+    html_session: Optional[aiohttp.ClientSession] = None,
+    client: Optional[AsyncFirecrawlClient] = None
+) -> dict:
+    """Extract only the upvote and comment counts of a paper page.
+
+    Used to refresh papers that are already stored. The counts are parsed from the
+    page HTML, with a two-field LLM extract as the fallback.
+
+    Args:
+        url (str): The URL of the paper to refresh.
+        html_session (Optional[aiohttp.ClientSession]): Session for fetching paper pages.
+            A temporary one is created if not given.
+        client (Optional[AsyncFirecrawlClient]): Shared Firecrawl client. A temporary one
+            is created if not given.
+
+    Returns:
+        dict: number_of_upvotes and number_of_comments of the paper.
+    """
+    if html_session is None or client is None:
+        async with _paper_page_session() as session, AsyncFirecrawlClient() as new_client:
+            return await extract_paper_metrics(
+                url, html_session or session, client or new_client
+            )
+
+    logger.info("Refreshing paper metrics from: %s", url)
+    details = await _parse_paper_page(html_session, url, METRICS_CACHE_TTL_SECONDS)
+    metrics = {field: details[field] for field in MetricsSchema.model_fields if field in details}
+    if len(metrics) == len(MetricsSchema.model_fields):
+        return metrics
+    extracted = await _llm_extract(
+        client, url, "metrics", list(MetricsSchema.model_fields), METRICS_CACHE_TTL_SECONDS
+    )
+    return {**extracted, **metrics}
+
+async def refresh_paper_metrics(
+    urls: list[str],
+    db: AsyncDatabase,
+    html_session: aiohttp.ClientSession,
+    client: AsyncFirecrawlClient,
+    observations: Optional[list] = None
+) -> None:
+    """Refresh upvotes and comments of already stored papers.
+
+    Refreshed counts are also appended to observations as (url, upvotes, comments), for
+    the paper_metrics history.
+    """
+    metrics_list = await asyncio.gather(
+        *(extract_paper_metrics(url, html_session, client) for url in urls),
+        return_exceptions=True
+    )
+    for url, metrics in zip(urls, metrics_list):
+        if isinstance(metrics, Exception):
+            logger.error(f"Error refreshing metrics for {url}: {metrics}")
+            continue
+        await db.update_paper_metrics(
+            url, metrics["number_of_upvotes"], metrics["number_of_comments"]
+        )
+        if observations is not None:
+            observations.append(
+                (url, metrics["number_of_upvotes"], metrics["number_of_comments"])
+            )
+
+async def _iter_batches(
+    urls: Union[Iterable[str], AsyncIterator[str]], batch_size: int
+) -> AsyncIterator[list[str]]:
+    """Group a plain or asynchronous stream of URLs into lists of at most batch_size."""
+    batch = []
+    if hasattr(urls, "__aiter__"):
+        async for url in urls:
+            batch.append(url)
+            if len(batch) == batch_size:
+                yield batch
+                batch = []
+    else:
+        for url in urls:
+            batch.append(url)
+            if len(batch) == batch_size:
+                yield batch
+                batch = []
+    if batch:
+        yield batch
+
+async def process_paper_batch(
+    urls: Union[Iterable[str], AsyncIterator[str]],
+    db: Union[Database, AsyncDatabase],
+    batch_size: int = 5,
+    refresh_known_metrics: bool = False,
+    client: Optional[AsyncFirecrawlClient] = None,
+    scheduler: Optional[AdaptiveScheduler] = None,
+    pipeline_workers: Optional[Dict[str, int]] = None,
+    extraction_mode: str = EXTRACTION_PER_URL,
+    classifier: Optional[AsyncSemanticFilter] = None,
+    classification_mode: str = CLASSIFICATION_SYNC
+):
+    """Extract and process papers with an adaptive number of requests in flight.
+
+    ``urls`` may be a list or an async stream such as ``iter_paper_urls``. URLs are
+    looked up in the database in groups of batch_size so that only new papers and
+    failed extractions that are due for a retry go through the full extraction.
+    Papers that are already stored are skipped, or only get their metrics refreshed
+    if refresh_known_metrics is set.
+
+    Extractions run through an AdaptiveScheduler, which keeps a sliding window of
+    requests in flight (starting at batch_size) instead of waiting for fixed batches.
+    Pass a scheduler to configure its bounds or to read its stats after the run. Each
+    extracted paper then moves through the persist, classify, notify and post stages,
+    which are connected by bounded queues and have their own worker counts
+    (PIPELINE_WORKERS, overridable with pipeline_workers). All Firecrawl requests go
+    through the injected client, or through one client created for the run if none
+    is given. Likewise, a plain Database is wrapped in an AsyncDatabase for the run so
+    that no database call blocks the event loop, and papers are classified by the
+    injected AsyncSemanticFilter or by one created for the run. Classifications are
+    cached in semantic_filter.classification_cache, which keeps them in memory unless
+    the caller attached a database with classification_cache.use_database.
+
+    With extraction_mode set to EXTRACTION_BATCH, all candidates are collected first
+    and extracted with extract_paper_details_batch, which pays one batch scrape job
+    instead of one request per paper for the LLM fallback. New papers are then
+    classified several per OpenAI request with classify_papers. This saves request
+    overhead on busy days, at the cost of processing starting only once every paper is
+    extracted.
+
+    With classification_mode set to CLASSIFICATION_BATCH, new papers without a cached
+    classification are stored and submitted as one OpenAI Batch API job at half the
+    price, instead of being classified, notified and posted during the run. Their
+    notifications are sent once collect_batch_classifications finds the job finished.
+
+    Returns:
+        int: Number of papers whose extraction or processing failed
+    """
+    if extraction_mode not in EXTRACTION_MODES:
+        raise ValueError(f"Unknown extraction mode {extraction_mode!r}")
+    if classification_mode not in CLASSIFICATION_MODES:
+        raise ValueError(f"Unknown classification mode {classification_mode!r}")
+    if not getattr(db, "is_async", False):
+        async with AsyncDatabase(db) as async_db:
+            return await process_paper_batch(
+                urls, async_db, batch_size, refresh_known_metrics, client, scheduler,
+                pipeline_workers, extraction_mode, classifier, classification_mode
+            )
+    if client is None:
+        async with AsyncFirecrawlClient() as client:
+            return await process_paper_batch(
+                urls, db, batch_size, refresh_known_metrics, client, scheduler,
+                pipeline_workers, extraction_mode, classifier, classification_mode
+            )
+    if classifier is None:
+        async with AsyncSemanticFilter() as classifier:
+            return await process_paper_batch(
+                urls, db, batch_size, refresh_known_metrics, client, scheduler,
+                pipeline_workers, extraction_mode, classifier, classification_mode
+            )
+    scheduler = scheduler or AdaptiveScheduler(initial_concurrency=batch_size)
+    async with _paper_page_session() as html_session:
+        failed_count = await _process_papers(
+            urls, db, batch_size, refresh_known_metrics, html_session, client, scheduler,
+            pipeline_workers, extraction_mode, classifier, classification_mode
+        )
+    if extraction_mode == EXTRACTION_PER_URL:
+        scheduler.stats.log_summary()
+    classification_cache.log_summary()
+    prefilter.log_summary()
+    token_usage.log_summary()
+    return failed_count
+
+async def _extraction_candidates(
+    urls: Union[Iterable[str], AsyncIterator[str]],
+    db: AsyncDatabase,
+    batch_size: int,
+    refresh_known_metrics: bool,
+    html_session: aiohttp.ClientSession,
+    client: AsyncFirecrawlClient,
+    retry_urls: set,
+    observations: list
+) -> AsyncIterator[str]:
+    """Yield the URLs that need a full extraction, looked up in groups of batch_size.
+
+    URLs of failed extractions that are due for a retry are added to retry_urls, and
+    refreshed metrics of known papers to observations.
+    """
+    async for batch in _iter_batches(urls, batch_size):
+        try:
+            partition = await db.partition_urls(batch)
+        except SQLAlchemyError as e:
+            logger.error(f"Known URL lookup failed, extracting the whole batch: {e}")
+            partition = UrlPartition(list(batch), [], [], [], [])
+
+        if refresh_known_metrics and partition.known:
+            await refresh_paper_metrics(
+                partition.known, db, html_session, client, observations
+            )
+
+        retry_urls.update(partition.retry)
+        for url in partition.new + partition.retry:
+            yield url
+
+@dataclass
+class PaperJob:
+    """A paper travelling through the processing pipeline."""
+    url: str
+    details: Optional[Dict[str, Any]] = None
+    error: Optional[BaseException] = None
+    is_retry: bool = False
+    is_new_paper: bool = False
+
+    def paper_data(self) -> Dict[str, Any]:
+        """Build the record passed to Database.add_paper."""
+        paper_data = {
+            "url": self.url,
+            "extraction_success": self.error is None,
+            "extraction_error": str(self.error) if self.error is not None else None,
+            "last_extraction_attempt": datetime.now(),
+            "notification_sent": False
         }
+        if self.error is None:
+            paper_data.update(self.details)
+        return paper_data
+
+class PaperStages:
+    """Stage handlers of the persist → classify → notify → post pipeline.
+
+    Database calls go through the AsyncDatabase thread pool, classifications through the
+    run's AsyncSemanticFilter, and the synchronous X calls run in worker threads, so that
+    a slow call in one stage does not block the event loop for the others.
+    """
+
+    def __init__(
+        self,
+        db: AsyncDatabase,
+        classifier: Optional[AsyncSemanticFilter],
+        worker_id: Optional[str] = None,
+        defer_classification: bool = False
+    ):
+        self.db = db
+        self.classifier = classifier
+        # Lease owner of the papers when they were claimed by a retry worker
+        self.worker_id = worker_id
+        # New papers without a cached classification stop here, for a Batch API job
+        self.defer_classification = defer_classification
+        self.deferred_jobs = []
+        self.failed_count = 0
+        # (url, upvotes, comments) of every paper seen, for the paper_metrics history
+        self.metric_observations = []
+
+    async def _store_failure(self, job: PaperJob, error: BaseException) -> None:
+        """Record a failed paper and schedule its next retry with backoff."""
+        self.failed_count += 1
+        job.error = error
+        try:
+            await self.db.add_paper(job.paper_data())
+            await self.db.record_retry_failure(job.url, self.worker_id, str(error))
+        except SQLAlchemyError as e:
+            logger.error(f"Database error storing failed paper {job.url}: {e}")
+
+    async def persist(self, job: PaperJob) -> Optional[PaperJob]:
+        if job.error is not None:
+            logger.error(f"Error processing {job.url}: {job.error}")
+            await self._store_failure(job, job.error)
+            return None
+        try:
+            is_new_paper = await self.db.add_paper(job.paper_data())
+        except Exception as e:
+            logger.error(f"Error processing details for {job.url}: {e}")
+            await self._store_failure(job, e)
+            return None
+        # A retried paper was never classified, so it counts as new
+        job.is_new_paper = is_new_paper or job.is_retry
+        self.metric_observations.append((
+            job.url,
+            job.details.get("number_of_upvotes", 0),
+            job.details.get("number_of_comments", 0)
+        ))
+        return job
+
+    async def classify(self, job: PaperJob) -> Optional[PaperJob]:
+        try:
+            if (self.defer_classification and job.is_new_paper
+                    and await asyncio.to_thread(needs_classification, job.details)):
+                self.deferred_jobs.append(job)
+                return None
+            should_process_paper, confidence = await self.classifier.should_process(
+                job.details, job.is_new_paper
+            )
+        except Exception as e:
+            logger.error(f"Error processing details for {job.url}: {e}")
+            await self._store_failure(job, e)
+            return None
+        return job if should_process_paper else None
+
+    async def notify(self, job: PaperJob) -> PaperJob:
+        details = job.details
+        # Send Discord notification
+        notification_success = await send_paper_notification(
+            paper_title=details["paper_title"],
+            authors=details["authors"].split(", "),
+            abstract=details["abstract_body"],
+            upvotes=details["number_of_upvotes"],
+            comments=details["number_of_comments"],
+            url=job.url,
+            pdf_url=details["view_pdf_url"],
+            arxiv_url=details["view_arxiv_page_url"],
+            github_url=details["github_repo_url"]
+        )
+        if notification_success:
+            try:
+                await self.db.update_notification_status(job.url, True)
+            except SQLAlchemyError as e:
+                logger.error(f"Failed to update notification status for {job.url}: {e}")
+        return job
+
+    async def post(self, job: PaperJob) -> None:
+        details = job.details
+        # Post to X
+        try:
+            x_response = await asyncio.to_thread(
+                post_paper,
+                paper_title=details["paper_title"],
+                authors=details["authors"].split(", "),
+                url=job.url,
+                pdf_url=details["view_pdf_url"],
+                arxiv_url=details["view_arxiv_page_url"],
+                github_url=details["github_repo_url"]
+            )
+            if x_response and 'data' in x_response:
+                logger.info(f"Successfully posted paper to X: {job.url}")
+                # TODO: Update x_post_sent status in DB once column is added
+            else:
+                logger.error(f"Failed to post paper to X: {job.url}")
+        except Exception as e:
+            logger.error(f"Error posting to X for {job.url}: {e}")
+
+def build_paper_pipeline(
+    stages: PaperStages, workers: Optional[Dict[str, int]] = None
+) -> Pipeline:
+    """Build the persist → classify → notify → post pipeline.
+
+    Args:
+        stages (PaperStages): Stage handlers bound to the run's database
+        workers (Optional[Dict[str, int]]): Worker count per stage name, overriding
+            PIPELINE_WORKERS
+
+    Returns:
+        Pipeline: The pipeline, ready to run over extracted PaperJobs
+    """
+    workers = {**PIPELINE_WORKERS, **(workers or {})}
+    return Pipeline([
+        Stage("persist", stages.persist, workers["persist"]),
+        Stage("classify", stages.classify, workers["classify"]),
+        Stage("notify", stages.notify, workers["notify"]),
+        Stage("post", stages.post, workers["post"]),
+    ])
+
+async def _process_papers(
+    urls: Union[Iterable[str], AsyncIterator[str]],
+    db: AsyncDatabase,
+    batch_size: int,
+    refresh_known_metrics: bool,
+    html_session: aiohttp.ClientSession,
+    client: AsyncFirecrawlClient,
+    scheduler: AdaptiveScheduler,
+    pipeline_workers: Optional[Dict[str, int]],
+    extraction_mode: str,
+    classifier: AsyncSemanticFilter,
+    classification_mode: str
+) -> int:
+    """Extraction and processing of process_paper_batch, sharing the sessions of the run.
+
+    The adaptive scheduler, or a single batch extraction, is the extract stage. Its
+    results feed the downstream stages through bounded queues, so a slow X upload never
+    holds up extraction beyond the queues' capacity.
+    """
+    retry_urls = set()
+    stages = PaperStages(
+        db, classifier, defer_classification=classification_mode == CLASSIFICATION_BATCH
+    )
+    candidates = _extraction_candidates(
+        urls, db, batch_size, refresh_known_metrics, html_session, client, retry_urls,
+        stages.metric_observations
     )
-    logger.debug("Raw extraction data: %s", data['extract'])
-    return data['extract']
 
-async def process_paper_batch(urls: list[str], db: Database, batch_size: int = 5):
-    """Process papers in batches to avoid overwhelming resources"""
-    for i in range(0, len(urls), batch_size):
-        batch = urls[i:i + batch_size]
-        tasks = []
-        for url in batch:
-            tasks.append(extract_paper_details(url))
-        
-        details_list = await asyncio.gather(*tasks, return_exceptions=True)
-        
-        for url, details in zip(batch, details_list):
-            current_time = datetime.now()
-            paper_data = {
-                "url": url,
-                "extraction_success": True,
-                "extraction_error": None,
-                "last_extraction_attempt": current_time,
-                "notification_sent": False
-            }
-            
+    async def extract(url: str) -> dict:
+        return await extract_paper_details(url, html_session, client)
+
+    async def extracted_details() -> AsyncIterator[tuple[str, Any]]:
+        if extraction_mode == EXTRACTION_BATCH:
+            batch = [url async for url in candidates]
+            results = await extract_paper_details_batch(batch, html_session, client)
+            # New papers are classified several per request up front, which fills the
+            # cache that the classifier reads in the classify stage
+            if classification_mode == CLASSIFICATION_SYNC:
+                await asyncio.to_thread(classify_papers, [
+                    results[url] for url in batch
+                    if url not in retry_urls and not isinstance(results[url], Exception)
+                ])
+            for url in batch:
+                yield url, results[url]
+        else:
+            async for url, details in scheduler.run(candidates, extract):
+                yield url, details
+
+    async def extracted_jobs() -> AsyncIterator[PaperJob]:
+        async for url, details in extracted_details():
             if isinstance(details, Exception):
-                logger.error(f"Error processing {url}: {details}")
-                paper_data.update({
-                    "extraction_success": False,
-                    "extraction_error": str(details)
-                })
-                try:
-                    db.add_paper(paper_data)
-                except SQLAlchemyError as e:
-                    logger.error(f"Database error storing failed paper {url}: {e}")
-                continue
+                yield PaperJob(url, error=details, is_retry=url in retry_urls)
+            else:
+                yield PaperJob(url, details=details, is_retry=url in retry_urls)
 
-            try:
-                paper_data.update(details)
-                is_new_paper = db.add_paper(paper_data)
-                
-                # Use should_process from semantic_filter
-                should_process_paper, confidence = should_process(details, is_new_paper)
-                
-                if should_process_paper:
-                    # Send Discord notification
-                    notification_success = await send_paper_notification(
-                        paper_title=details["paper_title"],
-                        authors=details["authors"].split(", "),
-                        abstract=details["abstract_body"],
-                        upvotes=details["number_of_upvotes"],
-                        comments=details["number_of_comments"],
-                        url=url,
-                        pdf_url=details["view_pdf_url"],
-                        arxiv_url=details["view_arxiv_page_url"],
-                        github_url=details["github_repo_url"]
-                    )
-                    
-                    if notification_success:
-                        try:
-                            db.update_notification_status(url, True)
-                        except SQLAlchemyError as e:
-                            logger.error(f"Failed to update notification status for {url}: {e}")
-                    
-                    # Post to X
-                    try:
-                        x_response = post_paper(
-                            paper_title=details["paper_title"],
-                            authors=details["authors"].split(", "),
-                            url=url,
-                            pdf_url=details["view_pdf_url"],
-                            arxiv_url=details["view_arxiv_page_url"],
-                            github_url=details["github_repo_url"]
-                        )
-                        if x_response and 'data' in x_response:
-                            logger.info(f"Successfully posted paper to X: {url}")
-                            # TODO: Update x_post_sent status in DB once column is added
-                        else:
-                            logger.error(f"Failed to post paper to X: {url}")
-                    except Exception as e:
-                        logger.error(f"Error posting to X for {url}: {e}")
-                    
-            except Exception as e:
-                logger.error(f"Error processing details for {url}: {e}")
-                paper_data.update({
-                    "extraction_success": False,
-                    "extraction_error": str(e)
-                })
-                try:
-                    db.add_paper(paper_data)
-                except SQLAlchemyError as db_error:
-                    logger.error(f"Database error storing error state for {url}: {db_error}")
+    pipeline = build_paper_pipeline(stages, pipeline_workers)
+    await pipeline.run(extracted_jobs())
+    pipeline.log_summary()
+    if stages.deferred_jobs:
+        await _submit_deferred_classifications(stages)
+
+    # One COPY appends this run's engagement observations to the history
+    try:
+        await db.record_metrics(stages.metric_observations)
+    except SQLAlchemyError as e:
+        logger.error(f"Failed to record metric observations: {e}")
+    return stages.failed_count
+
+async def _finish_papers(stages: PaperStages, jobs: list[PaperJob]) -> None:
+    """Classify, notify and post papers outside the pipeline, one after another."""
+    for job in jobs:
+        job = await stages.classify(job)
+        if job is not None:
+            await stages.post(await stages.notify(job))
+
+async def _submit_deferred_classifications(stages: PaperStages) -> None:
+    """Submit the papers deferred by the classify stage as one Batch API job.
+
+    If the submission fails, the papers are classified and notified right away instead,
+    since later runs treat them as known and would never notify them.
+    """
+    jobs = stages.deferred_jobs
+    try:
+        batch_id = await asyncio.to_thread(
+            submit_classification_batch,
+            stages.db.db,
+            [(job.details["paper_title"], job.details["abstract_body"], job.url) for job in jobs]
+        )
+        logger.info(f"Deferred classification of {len(jobs)} papers to batch {batch_id}")
+    except Exception as e:
+        logger.error(f"Submitting {len(jobs)} papers for batch classification failed: {e}")
+        stages.defer_classification = False
+        await _finish_papers(stages, jobs)
+
+def _stored_paper_details(paper) -> Dict[str, Any]:
+    """Paper details, as extracted, of a stored paper."""
+    return {
+        "paper_title": paper.title,
+        "authors": ", ".join(paper.authors or []),
+        "abstract_body": paper.abstract,
+        "number_of_upvotes": paper.upvotes,
+        "number_of_comments": paper.comments,
+        "view_pdf_url": paper.pdf_url,
+        "view_arxiv_page_url": paper.arxiv_url,
+        "github_repo_url": paper.github_url,
+    }
+
+async def collect_batch_classifications(
+    db: AsyncDatabase,
+    classifier: Optional[AsyncSemanticFilter] = None,
+    openai_client=None
+) -> int:
+    """Collect finished classification jobs and notify the papers they found relevant.
+
+    Papers submitted by process_paper_batch in CLASSIFICATION_BATCH mode that belong to
+    the category are notified and posted, unless a notification was sent already. Papers
+    whose job or request failed are classified synchronously instead.
+
+    Args:
+        db (AsyncDatabase): Database holding the jobs and papers
+        classifier (Optional[AsyncSemanticFilter]): Classifier for papers without a batch
+            result. A temporary one is created if not provided.
+        openai_client: OpenAI client for the Batch API, semantic_filter's by default
+
+    Returns:
+        int: Number of papers notified or classified
+    """
+    if classifier is None:
+        async with AsyncSemanticFilter() as classifier:
+            return await collect_batch_classifications(db, classifier, openai_client)
+    collection = await asyncio.to_thread(collect_classification_batches, db.db, openai_client)
+    papers = {
+        paper.url: paper
+        for paper in await db.get_papers(collection.relevant_urls + collection.unclassified_urls)
+    }
+    stages = PaperStages(db, classifier)
+    relevant = [
+        PaperJob(url, details=_stored_paper_details(papers[url]))
+        for url in collection.relevant_urls
+        if url in papers and not papers[url].notification_sent
+    ]
+    for job in relevant:
+        await stages.post(await stages.notify(job))
+    unclassified = [
+        PaperJob(url, details=_stored_paper_details(papers[url]), is_new_paper=True)
+        for url in collection.unclassified_urls
+        if url in papers and not papers[url].notification_sent
+    ]
+    await _finish_papers(stages, unclassified)
+    return len(relevant) + len(unclassified)
+
+async def process_claimed_retries(
+    urls: list[str],
+    db: AsyncDatabase,
+    worker_id: str,
+    client: AsyncFirecrawlClient,
+    scheduler: Optional[AdaptiveScheduler] = None,
+    pipeline_workers: Optional[Dict[str, int]] = None,
+    classifier: Optional[AsyncSemanticFilter] = None
+) -> int:
+    """Re-extract failed papers leased to a retry worker and process the successes.
+
+    Papers that fail again, in extraction or in a later stage, get their next retry
+    scheduled with exponential backoff, which also releases their lease. Successful
+    extractions go through the persist, classify, notify and post stages as new papers,
+    and storing them ends their lease.
+
+    Args:
+        urls (list[str]): URLs claimed with Database.claim_failed_extractions
+        db (AsyncDatabase): Database holding the leases
+        worker_id (str): Identifier the papers were claimed with
+        client (AsyncFirecrawlClient): Shared Firecrawl client
+        scheduler (Optional[AdaptiveScheduler]): Scheduler for the extractions
+        pipeline_workers (Optional[Dict[str, int]]): Worker count overrides per stage
+        classifier (Optional[AsyncSemanticFilter]): Shared classifier. A temporary one
+            is created if not provided.
+
+    Returns:
+        int: Number of papers that failed again
+    """
+    if classifier is None:
+        async with AsyncSemanticFilter() as classifier:
+            return await process_claimed_retries(
+                urls, db, worker_id, client, scheduler, pipeline_workers, classifier
+            )
+    scheduler = scheduler or AdaptiveScheduler(initial_concurrency=len(urls) or 1)
+    stages = PaperStages(db, classifier, worker_id)
+
+    async with _paper_page_session() as html_session:
+        async def extract(url: str) -> dict:
+            return await extract_paper_details(url, html_session, client)
+
+        async def extracted_jobs() -> AsyncIterator[PaperJob]:
+            async for url, details in scheduler.run(urls, extract):
+                if isinstance(details, Exception):
+                    logger.error(f"Retry of {url} failed: {details}")
+                    stages.failed_count += 1
+                    await db.record_retry_failure(url, worker_id, str(details))
+                else:
+                    yield PaperJob(url, details=details, is_retry=True)
+
+        pipeline = build_paper_pipeline(stages, pipeline_workers)
+        await pipeline.run(extracted_jobs())
+    pipeline.log_summary()
+
+    try:
+        await db.record_metrics(stages.metric_observations)
+    except SQLAlchemyError as e:
+        logger.error(f"Failed to record metric observations: {e}")
+    return stages.failed_count
+
+def listing_fingerprint(urls: Iterable[str]) -> str:
+    """
+    Fingerprint the set of paper URLs found on a daily papers listing.
+
+    The hash ignores order and duplicates, so two crawls of an unchanged listing
+    produce the same fingerprint.
+
+    Args:
+        urls (Iterable[str]): Paper URLs found on the listing
+
+    Returns:
+        str: Hex SHA-256 digest of the sorted, de-duplicated URLs
+    """
+    return hashlib.sha256("\n".join(sorted(set(urls))).encode("utf-8")).hexdigest()
 
 def get_todays_papers_url() -> str:
     """
@@ -240,12 +1152,6 @@ def get_todays_papers_url() -> str:
 # TODO: create a streamlit ui to set environment variables and desired categories for the semantic filter
 # TODO: make the extract_paper_details function async so details are extracted in parallel
 # TODO: make all functions async to avoid redudant code
-# TODO: for each url extracted by the crawler it should be verified if it exists already in 
-# the database before passing it to the extract_paper_details function
-# TODO: update the extract_paper_details function to process new papers only if the number of
-# found papers for the specific date is greater than the number of papers already found for that date
-# within the database. so this will need a new specific database table to store the number of papers
-# found for each date.
 # TODO: implement an improve error handling system for the extract_paper_details function which will
 # add papers that failed to be processed to the database but include a column to indicate that the
 # paper was not processed successfully, so that a retry can be performed when cron jobs are re-run.
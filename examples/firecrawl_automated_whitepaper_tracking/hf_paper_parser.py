@@ -0,0 +1,158 @@
+__doc__ = """Deterministic parser for Hugging Face paper pages.
+
+Fills the ExtractSchema fields from the HTML of a paper page without an LLM. The page embeds
+the paper record as JSON in the ``data-props`` attribute of its hydration elements, which gives
+title, authors, abstract, dates and upvotes. Links and headings of the rendered page are used
+as fallbacks. Fields that cannot be found are left out, so callers can fall back to an LLM
+extract for just those fields.
+"""
+
+import json
+import re
+from datetime import datetime
+from html.parser import HTMLParser
+from typing import Any, Dict, Optional
+
+ARXIV_ABS_PATTERN = re.compile(r"^https?://arxiv\.org/abs/([^?#]+)")
+ARXIV_PDF_PATTERN = re.compile(r"^https?://arxiv\.org/pdf/([^?#]+)")
+GITHUB_REPO_PATTERN = re.compile(r"^https?://github\.com/[\w.-]+/[\w.-]+/?$")
+PAPER_ID_PATTERN = re.compile(r"/papers/(\d{4}\.\d{4,5})")
+
+
+class _PaperPageParser(HTMLParser):
+    """Collects the parts of a paper page that carry ExtractSchema fields."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.props: list[Any] = []
+        self.links: list[str] = []
+        self.meta: Dict[str, str] = {}
+        self.h1_parts: list[str] = []
+        self._in_h1 = False
+
+    def handle_starttag(self, tag, attrs):
+        attributes = dict(attrs)
+        if "data-props" in attributes:
+            try:
+                self.props.append(json.loads(attributes["data-props"] or "null"))
+            except ValueError:
+                pass
+        if tag == "a" and attributes.get("href"):
+            self.links.append(attributes["href"])
+        elif tag == "meta":
+            key = attributes.get("property") or attributes.get("name")
+            if key and attributes.get("content"):
+                self.meta[key] = attributes["content"]
+        elif tag == "h1" and not self.h1_parts:
+            self._in_h1 = True
+
+    def handle_endtag(self, tag):
+        if tag == "h1":
+            self._in_h1 = False
+
+    def handle_data(self, data):
+        if self._in_h1:
+            self.h1_parts.append(data)
+
+
+def _find_key(value: Any, key: str) -> Optional[Any]:
+    """Depth-first search for the first occurrence of key in nested JSON."""
+    if isinstance(value, dict):
+        if key in value:
+            return value[key]
+        children = value.values()
+    elif isinstance(value, list):
+        children = value
+    else:
+        return None
+    for child in children:
+        found = _find_key(child, key)
+        if found is not None:
+            return found
+    return None
+
+
+def _find_paper(props: list[Any]) -> Optional[Dict[str, Any]]:
+    """Return the embedded paper record, recognised by its id, title and summary."""
+    for value in props:
+        paper = _find_key(value, "paper")
+        if isinstance(paper, dict) and {"id", "title", "summary"} <= paper.keys():
+            return paper
+    return None
+
+
+def _set_date(details: Dict[str, Any], prefix: str, timestamp: Optional[str]) -> None:
+    if not timestamp:
+        return
+    try:
+        date = datetime.fromisoformat(timestamp.replace("Z", "+00:00"))
+    except ValueError:
+        return
+    details[f"{prefix}_day"] = date.day
+    details[f"{prefix}_month"] = date.month
+    details[f"{prefix}_year"] = date.year
+
+
+def parse_paper_html(html: str, url: str) -> Dict[str, Any]:
+    """
+    Parse ExtractSchema fields from the HTML of a Hugging Face paper page.
+
+    Args:
+        html (str): HTML of the paper page
+        url (str): URL of the paper page, used to derive the arXiv id
+
+    Returns:
+        Dict[str, Any]: The fields that could be parsed, keyed like ExtractSchema
+    """
+    parser = _PaperPageParser()
+    parser.feed(html)
+    parser.close()
+
+    details: Dict[str, Any] = {}
+    paper = _find_paper(parser.props) or {}
+
+    title = paper.get("title") or " ".join("".join(parser.h1_parts).split())
+    if title:
+        details["paper_title"] = title.strip()
+    if isinstance(paper.get("summary"), str):
+        details["abstract_body"] = paper["summary"].strip()
+
+    author_names = [
+        author.get("name") for author in paper.get("authors") or []
+        if isinstance(author, dict) and author.get("name")
+    ]
+    if author_names:
+        details["authors"] = ", ".join(author_names)
+
+    if isinstance(paper.get("upvotes"), int):
+        details["number_of_upvotes"] = paper["upvotes"]
+    comments = _find_key(parser.props, "numComments")
+    if isinstance(comments, int):
+        details["number_of_comments"] = comments
+
+    _set_date(details, "utc_publication_date", paper.get("publishedAt"))
+    _set_date(details, "utc_submission_date", paper.get("submittedOnDailyAt"))
+
+    for link in parser.links:
+        if "view_arxiv_page_url" not in details and ARXIV_ABS_PATTERN.match(link):
+            details["view_arxiv_page_url"] = link
+        elif "view_pdf_url" not in details and ARXIV_PDF_PATTERN.match(link):
+            details["view_pdf_url"] = link
+    id_match = PAPER_ID_PATTERN.search(url)
+    paper_id = paper.get("id") or (id_match.group(1) if id_match else None)
+    if paper_id:
+        details.setdefault("view_arxiv_page_url", f"https://arxiv.org/abs/{paper_id}")
+        details.setdefault("view_pdf_url", f"https://arxiv.org/pdf/{paper_id}")
+
+    github_url = paper.get("githubRepo") or next(
+        (link for link in parser.links
+         if GITHUB_REPO_PATTERN.match(link) and "github.com/huggingface/" not in link),
+        None
+    )
+    if github_url:
+        details["github_repo_url"] = github_url
+    elif paper:
+        # The page was parsed, it just has no repository
+        details["github_repo_url"] = ""
+
+    return details
@@ -8,6 +8,7 @@ import os
 import sys
 import argparse
 import asyncio
+import aiohttp
 import requests
 from typing import Optional
 from sqlalchemy.exc import SQLAlchemyError
@@ -18,59 +19,62 @@ sys.path.insert(0, project_root)
 
 # Now we can import our modules
 from examples.firecrawl_automated_whitepaper_tracking.firecrawl_crawl_extract import (
-    extract_paper_urls,
+    iter_paper_urls,
+    listing_fingerprint,
+    CLASSIFICATION_BATCH,
+    CLASSIFICATION_MODES,
+    CLASSIFICATION_SYNC,
+    classification_cache,
+    collect_batch_classifications,
+    DISCOVERY_LINKS,
+    DISCOVERY_MODES,
+    EXTRACTION_MODES,
+    EXTRACTION_PER_URL,
     process_paper_batch,
     get_todays_papers_url
 )
-from examples.firecrawl_automated_whitepaper_tracking.supabase_db import Database
+from examples.firecrawl_automated_whitepaper_tracking.firecrawl_client import AsyncFirecrawlClient
+from examples.firecrawl_automated_whitepaper_tracking.supabase_db import AsyncDatabase, Database
 from examples.firecrawl_automated_whitepaper_tracking.logging_config import setup_crawler_logging
 
 # Initialize logger
 logger = setup_crawler_logging()
 
-def verify_database_connection(db: Database) -> tuple[bool, str]:
-    """Test database connection and return status."""
-    logger.debug("Verifying database connection...")
-    try:
-        db.get_all_papers()
-        return True, "Database connection successful"
-    except SQLAlchemyError as e:
-        logger.error("Database connection failed: %s", str(e))
-        return False, f"Database connection failed: {str(e)}"
-
-def verify_database_version(db: Database) -> tuple[bool, str]:
-    """Verify database schema version matches required version."""
-    logger.debug("Verifying database schema version...")
-    try:
-        session = db.session_factory()
-        db._check_schema_version()
-        session.close()
-        return True, f"Database schema version verified"
-    except RuntimeError as e:
-        logger.error("Database version check failed: %s", str(e))
-        return False, str(e)
-
 def perform_startup_checks(db: Database) -> None:
-    """Perform all startup checks before proceeding."""
-    # Database connection check
-    connection_ok, connection_msg = verify_database_connection(db)
-    logger.info(connection_msg)
-    if not connection_ok:
-        raise RuntimeError(connection_msg)
-
-    # Database version check
-    version_ok, version_msg = verify_database_version(db)
-    logger.info(version_msg)
-    if not version_ok:
-        raise RuntimeError(version_msg)
-
-def run_paper_tracker(url: Optional[str] = None, date: Optional[str] = None) -> None:
+    """Check the result of the database startup probe before proceeding.
+
+    Database already proved connectivity and verified (or migrated) the schema version
+    while initializing, so this does not query the database again.
+    """
+    if db.schema_version != Database.CURRENT_SCHEMA_VERSION:
+        message = (
+            f"Database schema version {db.schema_version} does not match required "
+            f"version {Database.CURRENT_SCHEMA_VERSION}"
+        )
+        logger.error(message)
+        raise RuntimeError(message)
+    logger.info(
+        "Database ready in %.3fs (schema version %d)", db.startup_seconds, db.schema_version
+    )
+
+def run_paper_tracker(
+    url: Optional[str] = None,
+    date: Optional[str] = None,
+    refresh_metrics: bool = False,
+    discovery_mode: str = DISCOVERY_LINKS,
+    extraction_mode: str = EXTRACTION_PER_URL,
+    classification_mode: str = CLASSIFICATION_SYNC
+) -> None:
     """
     Main function to run the paper tracking process.
     
     Args:
         url (Optional[str]): Full URL to crawl (e.g., https://huggingface.co/papers?date=2024-12-19)
         date (Optional[str]): Date in YYYY-MM-DD format (e.g., 2024-12-19)
+        refresh_metrics (bool): Refresh upvotes and comments of papers already in the database
+        discovery_mode (str): How paper URLs are discovered: crawl, map or links
+        extraction_mode (str): How papers are extracted: per-url or batch
+        classification_mode (str): How new papers are classified: sync or batch
     """
     # Initialize database first
     db = Database(os.getenv("POSTGRES_URL"))
@@ -78,6 +82,7 @@ def run_paper_tracker(url: Optional[str] = None, date: Optional[str] = None) ->
     
     # Perform startup checks before proceeding
     perform_startup_checks(db)
+    classification_cache.use_database(db)
     
     # Determine which URL to use
     if url:
@@ -90,14 +95,81 @@ def run_paper_tracker(url: Optional[str] = None, date: Optional[str] = None) ->
         papers_url = get_todays_papers_url()
         logger.info("Using today's papers URL: %s", papers_url)
     
-    urls = extract_paper_urls(papers_url)
-    logger.info("Found %d papers to process", len(urls))
-    
     try:
-        asyncio.run(process_paper_batch(urls, db))
-    except (SQLAlchemyError, requests.RequestException, ValueError) as e:
+        asyncio.run(track_listing(
+            papers_url, db, discovery_mode, refresh_metrics, extraction_mode,
+            classification_mode
+        ))
+    except (SQLAlchemyError, requests.RequestException, aiohttp.ClientError, ValueError) as e:
         logger.error("Critical error in main process: %s", str(e), exc_info=True)
         raise
+    finally:
+        db.pool_metrics.log_summary()
+
+async def track_listing(
+    papers_url: str,
+    db: Database,
+    discovery_mode: str = DISCOVERY_LINKS,
+    refresh_metrics: bool = False,
+    extraction_mode: str = EXTRACTION_PER_URL,
+    classification_mode: str = CLASSIFICATION_SYNC
+) -> None:
+    """
+    Discover and process the papers of one listing.
+
+    Paper URLs are streamed from discovery into process_paper_batch, so extraction starts
+    while later crawl pages are still downloading. Papers that are already stored are
+    skipped there, which is all a rerun over an unchanged listing costs after the listing
+    fetch. The fingerprint of the complete URL set is recorded in the ledger at the end.
+
+    One Firecrawl client, and with it one connection pool, is shared by discovery and
+    extraction for the whole run. In batch classification mode, the relevant papers of
+    classification jobs submitted by earlier runs are notified first.
+
+    Args:
+        papers_url (str): Daily papers listing URL
+        db (Database): Database to store papers in
+        discovery_mode (str): How paper URLs are discovered: crawl, map or links
+        refresh_metrics (bool): Refresh upvotes and comments of papers already in the database
+        extraction_mode (str): How papers are extracted: per-url or batch
+        classification_mode (str): How new papers are classified: sync or batch
+    """
+    async with AsyncDatabase(db) as async_db:
+        if classification_mode == CLASSIFICATION_BATCH:
+            await collect_batch_classifications(async_db)
+        previous_fingerprint = await async_db.get_listing_fingerprint(papers_url)
+        urls = []
+
+        async with AsyncFirecrawlClient() as client:
+            async def discovered_urls():
+                # Streamed into process_paper_batch, and kept for the listing fingerprint
+                async for url in iter_paper_urls(papers_url, discovery_mode, client=client):
+                    urls.append(url)
+                    yield url
+
+            failed_count = await process_paper_batch(
+                discovered_urls(), async_db, refresh_known_metrics=refresh_metrics,
+                client=client, extraction_mode=extraction_mode,
+                classification_mode=classification_mode
+            )
+        logger.info("Found %d papers on the listing", len(urls))
+
+        fingerprint = listing_fingerprint(urls)
+        if fingerprint == previous_fingerprint:
+            logger.info("Listing %s unchanged since last run", papers_url)
+            return
+
+        # Only a listing without failed papers goes into the ledger, so that papers that
+        # failed in this run, or earlier ones that are deferred to a later retry, are
+        # picked up again by the next run
+        pending_count = await async_db.count_failed_extractions(urls)
+        if failed_count == 0 and pending_count == 0:
+            await async_db.record_listing(papers_url, len(set(urls)), fingerprint)
+        else:
+            logger.info(
+                "%d papers failed, %d stored as failed, listing left out of the ledger",
+                failed_count, pending_count
+            )
 
 if __name__ == "__main__":
     # Set up argument parser
@@ -106,9 +178,29 @@ if __name__ == "__main__":
                        help='Full URL to crawl (e.g., https://huggingface.co/papers?date=2024-12-19)')
     parser.add_argument('--date', type=str, 
                        help='Date in YYYY-MM-DD format (e.g., 2024-12-19)')
+    parser.add_argument('--refresh-metrics', action='store_true',
+                       help='Refresh upvotes and comments of papers already in the database')
+    parser.add_argument('--discovery', choices=DISCOVERY_MODES, default=DISCOVERY_LINKS,
+                       help='How paper URLs are discovered: a links-only scrape of the listing '
+                            '(default), a map request, or a full crawl')
+    parser.add_argument('--extraction', choices=EXTRACTION_MODES, default=EXTRACTION_PER_URL,
+                       help='How papers are extracted: one request per paper (default), or one '
+                            'batch scrape job for all papers of the run')
+    parser.add_argument('--classification', choices=CLASSIFICATION_MODES,
+                       default=CLASSIFICATION_SYNC,
+                       help='How new papers are classified: one request per paper during the '
+                            'run (default), or one OpenAI Batch API job at half the price, '
+                            'notified when a later run collects it')
     
     args = parser.parse_args()
-    run_paper_tracker(url=args.url, date=args.date)
+    run_paper_tracker(
+        url=args.url,
+        date=args.date,
+        refresh_metrics=args.refresh_metrics,
+        discovery_mode=args.discovery,
+        extraction_mode=args.extraction,
+        classification_mode=args.classification
+    )
 
 # TODO: Include a Bluesky API call to publish the paper's posts to Bluesky. This will require a new
 # llm flow to generate the post content and a new function to send the post to Bluesky.
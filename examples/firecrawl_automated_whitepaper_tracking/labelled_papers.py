@@ -0,0 +1,229 @@
+__doc__ = """Papers labelled as belonging to DESIRED_CATEGORY or not.
+
+The same cases are used to calibrate the lexical prefilter (python prefilter.py) and to check
+the LLM classifier (tests/test_semantic_filter.py). Besides obvious agent and off-topic papers
+they include hard cases, such as LLM papers without agentic behaviour and agent papers worded
+unlike the category definition.
+
+Only the first six abstracts (FULL_ABSTRACT_PAPERS) are quoted in full. The other 36 are
+abridged or paraphrased from their arXiv abstracts, so they are shorter than real listing
+abstracts and partly written for this set. The shipped prefilter threshold was fitted to this
+mix, so recalibrate it on real abstracts, such as stored papers, before relying on its recall.
+"""
+
+# (title, abstract, belongs to the "AI Agents" category)
+LABELLED_PAPERS = [
+    (
+        "PaliGemma 2: A Family of Versatile VLMs for Transfer",
+        """PaliGemma 2 is an upgrade of the PaliGemma open Vision-Language Model (VLM) based on the Gemma 2 family of language models. We combine the SigLIP-So400m vision encoder that was also used by PaliGemma with the whole range of Gemma 2 models, from the 2B one all the way up to the 27B model. We train these models at three resolutions (224px, 448px, and 896px) in multiple stages to equip them with broad knowledge for transfer via fine-tuning. The resulting family of base models covering different model sizes and resolutions allows us to investigate factors impacting transfer performance (such as learning rate) and to analyze the interplay between the type of task, model size, and resolution. We further increase the number and breadth of transfer tasks beyond the scope of PaliGemma including different OCR-related tasks such as table structure recognition, molecular structure recognition, music score recognition, as well as long fine-grained captioning and radiography report generation, on which PaliGemma 2 obtains state-of-the-art results.""",
+        False
+    ),
+    (
+        "From Generation to Judgment: Opportunities and Challenges of LLM-as-a-judge",
+        """Assessment and evaluation have long been critical challenges in artificial intelligence (AI) and natural language processing (NLP). However, traditional methods, whether matching-based or embedding-based, often fall short of judging subtle attributes and delivering satisfactory results. Recent advancements in Large Language Models (LLMs) inspire the "LLM-as-a-judge" paradigm, where LLMs are leveraged to perform scoring, ranking, or selection across various tasks and applications. This paper provides a comprehensive survey of LLM-based judgment and assessment, offering an in-depth overview to advance this emerging field. We begin by giving detailed definitions from both input and output perspectives. Then we introduce a comprehensive taxonomy to explore LLM-as-a-judge from three dimensions: what to judge, how to judge and where to judge. Finally, we compile benchmarks for evaluating LLM-as-a-judge and highlight key challenges and promising directions, aiming to provide valuable insights and inspire future research in this promising research area. Paper list and more resources about LLM-as-a-judge can be found at https://github.com/llm-as-a-judge/Awesome-LLM-as-a-judge and https://llm-as-a-judge.github.io.""",
+        False
+    ),
+    (
+        "Evaluation Agent: Efficient and Promptable Evaluation Framework for Visual Generative Models",
+        """Recent advancements in visual generative models have enabled high-quality image and video generation, opening diverse applications. However, evaluating these models often demands sampling hundreds or thousands of images or videos, making the process computationally expensive, especially for diffusion-based models with inherently slow sampling. Moreover, existing evaluation methods rely on rigid pipelines that overlook specific user needs and provide numerical results without clear explanations. In contrast, humans can quickly form impressions of a model's capabilities by observing only a few samples. To mimic this, we propose the Evaluation Agent framework, which employs human-like strategies for efficient, dynamic, multi-round evaluations using only a few samples per round, while offering detailed, user-tailored analyses. It offers four key advantages: 1) efficiency, 2) promptable evaluation tailored to diverse user needs, 3) explainability beyond single numerical scores, and 4) scalability across various models and tools. Experiments show that Evaluation Agent reduces evaluation time to 10% of traditional methods while delivering comparable results. The Evaluation Agent framework is fully open-sourced to advance research in visual generative models and their efficient evaluation.""",
+        True
+    ),
+    (
+        "TheAgentCompany: Benchmarking LLM Agents on Consequential Real World Tasks",
+        """We interact with computers on an everyday basis, be it in everyday life or work, and many aspects of work can be done entirely with access to a computer and the Internet. At the same time, thanks to improvements in large language models (LLMs), there has also been a rapid development in AI agents that interact with and affect change in their surrounding environments. But how performant are AI agents at helping to accelerate or even autonomously perform work-related tasks? The answer to this question has important implications for both industry looking to adopt AI into their workflows, and for economic policy to understand the effects that adoption of AI may have on the labor market. To measure the progress of these LLM agents' performance on performing real-world professional tasks, in this paper, we introduce TheAgentCompany, an extensible benchmark for evaluating AI agents that interact with the world in similar ways to those of a digital worker: by browsing the Web, writing code, running programs, and communicating with other coworkers. We build a self-contained environment with internal web sites and data that mimics a small software company environment, and create a variety of tasks that may be performed by workers in such a company. We test baseline agents powered by both closed API-based and open-weights language models (LMs), and find that with the most competitive agent, 24% of the tasks can be completed autonomously. This paints a nuanced picture on task automation with LM agents -- in a setting simulating a real workplace, a good portion of simpler tasks could be solved autonomously, but more difficult long-horizon tasks are still beyond the reach of current systems.""",
+        True
+    ),
+    (
+        "GUI Agents: A Survey",
+        """Graphical User Interface (GUI) agents, powered by Large Foundation Models, have emerged as a transformative approach to automating human-computer interaction. These agents autonomously interact with digital systems or software applications via GUIs, emulating human actions such as clicking, typing, and navigating visual elements across diverse platforms. Motivated by the growing interest and fundamental importance of GUI agents, we provide a comprehensive survey that categorizes their benchmarks, evaluation metrics, architectures, and training methods. We propose a unified framework that delineates their perception, reasoning, planning, and acting capabilities. Furthermore, we identify important open challenges and discuss key future directions. Finally, this work serves as a basis for practitioners and researchers to gain an intuitive understanding of current progress, techniques, benchmarks, and critical open problems that remain to be addressed.""",
+        True
+    ),
+    (
+        "Aguvis: Unified Pure Vision Agents for Autonomous GUI Interaction",
+        """Graphical User Interfaces (GUIs) are critical to human-computer interaction, yet automating GUI tasks remains challenging due to the complexity and variability of visual environments. Existing approaches often rely on textual representations of GUIs, which introduce limitations in generalization, efficiency, and scalability. In this paper, we introduce Aguvis, a unified pure vision-based framework for autonomous GUI agents that operates across various platforms. Our approach leverages image-based observations, and grounding instructions in natural language to visual elements, and employs a consistent action space to ensure cross-platform generalization. To address the limitations of previous work, we integrate explicit planning and reasoning within the model, enhancing its ability to autonomously navigate and interact with complex digital environments. We construct a large-scale dataset of GUI agent trajectories, incorporating multimodal reasoning and grounding, and employ a two-stage training pipeline that first focuses on general GUI grounding, followed by planning and reasoning. Through comprehensive experiments, we demonstrate that Aguvis surpasses previous state-of-the-art methods in both offline and real-world online scenarios, achieving, to our knowledge, the first fully autonomous pure vision GUI agent capable of performing tasks independently without collaboration with external closed-source models. We open-sourced all datasets, models, and training recipes to facilitate future research at https://aguvis-project.github.io/.""",
+        True
+    ),
+    (
+        'ReAct: Synergizing Reasoning and Acting in Language Models',
+        """While large language models have demonstrated impressive capabilities in language understanding and interactive decision making, their abilities for reasoning and acting have primarily been studied as separate topics. We explore the use of LLMs to generate both reasoning traces and task-specific actions in an interleaved manner, allowing the model to induce, track and update action plans and handle exceptions, while actions let it interface with external sources such as knowledge bases or environments. On question answering, fact verification and interactive decision making benchmarks such as ALFWorld and WebShop, ReAct overcomes hallucination and outperforms imitation and reinforcement learning methods.""",
+        True
+    ),
+    (
+        'Toolformer: Language Models Can Teach Themselves to Use Tools',
+        """Language models struggle with basic functionality such as arithmetic or factual lookup, where simpler models excel. We show that LMs can teach themselves to use external tools via simple APIs. Toolformer is trained to decide which APIs to call, when to call them, what arguments to pass, and how to best incorporate the results into future token prediction, in a self-supervised way requiring only a handful of demonstrations per API. It incorporates a calculator, a question answering system, a search engine, a translation system and a calendar.""",
+        True
+    ),
+    (
+        'SWE-agent: Agent-Computer Interfaces Enable Automated Software Engineering',
+        """Language model agents are increasingly being used to automate complicated tasks in digital environments. We investigate how interface design affects the performance of language model agents and introduce SWE-agent, a system that lets LM agents autonomously use computers to solve software engineering tasks. Its custom agent-computer interface improves the agent's ability to create and edit code files, navigate entire repositories and execute tests and other programs, resolving 12.5% of issues on SWE-bench.""",
+        True
+    ),
+    (
+        'WebArena: A Realistic Web Environment for Building Autonomous Agents',
+        """With advances in generative AI, there is now potential for autonomous agents to manage daily tasks via natural language commands. We build a highly realistic and reproducible environment for language-guided agents with fully functional websites from e-commerce, social forums, collaborative software development and content management, and a benchmark of tasks focused on evaluating functional correctness. Our best GPT-4-based agent achieves an end-to-end task success rate of only 14.41%, significantly lower than human performance.""",
+        True
+    ),
+    (
+        'Voyager: An Open-Ended Embodied Agent with Large Language Models',
+        """We introduce Voyager, the first LLM-powered embodied lifelong learning agent in Minecraft that continuously explores the world, acquires diverse skills and makes novel discoveries without human intervention. It consists of an automatic curriculum that maximizes exploration, an ever-growing skill library of executable code for storing and retrieving complex behaviors, and an iterative prompting mechanism that incorporates environment feedback, execution errors and self-verification for program improvement.""",
+        True
+    ),
+    (
+        'Reflexion: Language Agents with Verbal Reinforcement Learning',
+        """Large language models are increasingly used to interact with external environments as goal-driven agents, but it remains challenging for them to quickly and efficiently learn from trial and error. We propose Reflexion, a framework that reinforces language agents through linguistic feedback instead of weight updates. Reflexion agents verbally reflect on task feedback signals and keep their reflective text in an episodic memory buffer to induce better decision making in subsequent trials, improving on sequential decision making, coding and language reasoning tasks.""",
+        True
+    ),
+    (
+        'Generative Agents: Interactive Simulacra of Human Behavior',
+        """Believable proxies of human behavior can empower interactive applications. We introduce generative agents, computational software agents that simulate believable human behavior: they wake up, cook breakfast, form opinions, notice each other and initiate conversations. Our architecture extends a large language model to store a complete record of the agent's experiences in natural language, synthesize those memories into higher-level reflections, and retrieve them dynamically to plan behavior in an interactive sandbox environment.""",
+        True
+    ),
+    (
+        'AutoGen: Enabling Next-Gen LLM Applications via Multi-Agent Conversation',
+        """AutoGen is an open-source framework that allows developers to build LLM applications via multiple agents that can converse with each other to accomplish tasks. AutoGen agents are customizable, conversable, and can operate in various modes that employ combinations of LLMs, human inputs and tools. Developers can flexibly define agent interaction behaviors, and we demonstrate applications in mathematics, coding, question answering, operations research, online decision-making and entertainment.""",
+        True
+    ),
+    (
+        'MetaGPT: Meta Programming for A Multi-Agent Collaborative Framework',
+        """Remarkable progress has been made on automated problem solving through societies of agents based on large language models. MetaGPT encodes Standardized Operating Procedures into prompt sequences for more streamlined workflows, allowing agents with human-like domain expertise to verify intermediate results and reduce errors. It uses an assembly line paradigm to assign diverse roles to various agents, efficiently breaking down complex tasks into subtasks for many agents working together on collaborative software engineering benchmarks.""",
+        True
+    ),
+    (
+        'OSWorld: Benchmarking Multimodal Agents for Open-Ended Tasks in Real Computer Environments',
+        """Autonomous agents that accomplish complex computer tasks with minimal human interventions have the potential to transform human-computer interaction. We introduce OSWorld, a scalable, real computer environment for multimodal agents that supports task setup, execution-based evaluation and interactive learning across operating systems, with 369 tasks involving real web and desktop apps, file I/O and workflows spanning multiple applications. While humans accomplish over 72% of the tasks, the best model achieves only 12% success, struggling with GUI grounding and operational knowledge.""",
+        True
+    ),
+    (
+        'Mind2Web: Towards a Generalist Agent for the Web',
+        """We introduce Mind2Web, the first dataset for developing and evaluating generalist agents for the web that can follow language instructions to complete complex tasks on any website. It contains over 2,000 open-ended tasks collected from 137 websites spanning 31 domains, with crowdsourced action sequences. We explore using large language models for building generalist web agents, where the raw HTML of real-world websites is filtered by a small language model to improve effectiveness and efficiency.""",
+        True
+    ),
+    (
+        'AgentBench: Evaluating LLMs as Agents',
+        """Large language models are becoming increasingly smart and autonomous, targeting real-world pragmatic missions beyond traditional NLP tasks. We present AgentBench, a multi-dimensional benchmark of eight distinct environments to assess the reasoning and decision-making abilities of LLMs as agents in multi-turn open-ended generation settings. Testing 27 API-based and open-source LLMs, we find a significant disparity between top commercial models and open-source competitors, with poor long-term reasoning, decision-making and instruction following as the main obstacles.""",
+        True
+    ),
+    (
+        'ToolLLM: Facilitating Large Language Models to Master 16000+ Real-world APIs',
+        """Open-source large language models remain significantly limited in tool-use capabilities, that is, using external tools (APIs) to fulfill human instructions. We introduce ToolLLM, a general tool-use framework encompassing data construction, model training and evaluation. We construct ToolBench, an instruction-tuning dataset for tool use with 16,464 real-world RESTful APIs, and develop a depth-first search based decision tree algorithm that lets the model evaluate multiple reasoning traces and expand the search space when calling APIs.""",
+        True
+    ),
+    (
+        'Executable Code Actions Elicit Better LLM Agents',
+        """Large language model agents are typically prompted to produce actions by generating JSON or text in a pre-defined format, which is limited by constrained action space and restricted flexibility. We propose CodeAct, which uses executable Python code to consolidate LLM agents' actions into a unified action space. Integrated with a Python interpreter, CodeAct can execute code actions and dynamically revise prior actions or emit new actions upon new observations through multi-turn interactions.""",
+        True
+    ),
+    (
+        'The Rise and Potential of Large Language Model Based Agents: A Survey',
+        """For a long time, humanity has pursued artificial intelligence equivalent to or surpassing the human level, with AI agents considered a promising vehicle. We present a comprehensive survey of LLM-based agents, tracing the concept of agents from its philosophical origins to AI, and present a general framework of brain, perception and action components. We explore extensive applications of LLM-based agents in single-agent scenarios, multi-agent scenarios and human-agent cooperation, and agent societies.""",
+        True
+    ),
+    (
+        'WebVoyager: Building an End-to-End Web Agent with Large Multimodal Models',
+        """The rapid advancement of large language models has led to a new era of autonomous applications in real-world scenarios. Existing web agents typically only handle one input modality and are evaluated in simplified web simulators. We introduce WebVoyager, a web agent powered by a large multimodal model that completes user instructions end-to-end by interacting with real-world websites using screenshots and textual content, and an automatic evaluation protocol for open-ended web agents.""",
+        True
+    ),
+    (
+        'Llama 2: Open Foundation and Fine-Tuned Chat Models',
+        """We develop and release Llama 2, a collection of pretrained and fine-tuned large language models ranging in scale from 7 billion to 70 billion parameters. Our fine-tuned LLMs, called Llama 2-Chat, are optimized for dialogue use cases and outperform open-source chat models on most benchmarks we tested. We provide a detailed description of our approach to fine-tuning and safety improvements in order to enable the community to build on our work and contribute to the responsible development of LLMs.""",
+        False
+    ),
+    (
+        'Direct Preference Optimization: Your Language Model is Secretly a Reward Model',
+        """Existing methods for gaining steerability of unsupervised language models collect human labels of the relative quality of model generations and fine-tune the model to align with these preferences, often with reinforcement learning from human feedback. We introduce a new parameterization of the reward model that enables extraction of the corresponding optimal policy in closed form, solving the standard RLHF problem with only a simple classification loss. DPO is stable, performant and computationally lightweight, eliminating the need for sampling from the LM during fine-tuning.""",
+        False
+    ),
+    (
+        'LoRA: Low-Rank Adaptation of Large Language Models',
+        """As we pre-train larger models, full fine-tuning, which retrains all model parameters, becomes less feasible. We propose Low-Rank Adaptation, which freezes the pre-trained model weights and injects trainable rank decomposition matrices into each layer of the Transformer architecture, greatly reducing the number of trainable parameters for downstream tasks. LoRA performs on-par or better than fine-tuning in model quality on RoBERTa, DeBERTa, GPT-2 and GPT-3, with no additional inference latency.""",
+        False
+    ),
+    (
+        'FlashAttention: Fast and Memory-Efficient Exact Attention with IO-Awareness',
+        """Transformers are slow and memory-hungry on long sequences, since the time and memory complexity of self-attention are quadratic in sequence length. We argue that a missing principle is making attention algorithms IO-aware, accounting for reads and writes between levels of GPU memory. We propose FlashAttention, an IO-aware exact attention algorithm that uses tiling to reduce the number of memory reads and writes between GPU high bandwidth memory and on-chip SRAM, yielding faster training of Transformers and longer context.""",
+        False
+    ),
+    (
+        'Mamba: Linear-Time Sequence Modeling with Selective State Spaces',
+        """Foundation models are almost universally based on the Transformer architecture and its attention module. We identify that a key weakness of subquadratic-time architectures is their inability to perform content-based reasoning, and let the state space model parameters be functions of the input. We integrate these selective SSMs into a simplified end-to-end neural network architecture without attention or even MLP blocks, which enjoys fast inference and linear scaling in sequence length across language, audio and genomics.""",
+        False
+    ),
+    (
+        'Segment Anything',
+        """We introduce the Segment Anything project: a new task, model, and dataset for image segmentation. Using our efficient model in a data collection loop, we built the largest segmentation dataset to date, with over 1 billion masks on 11M licensed and privacy respecting images. The model is designed and trained to be promptable, so it can transfer zero-shot to new image distributions and tasks, and its zero-shot performance is often competitive with prior fully supervised results.""",
+        False
+    ),
+    (
+        '3D Gaussian Splatting for Real-Time Radiance Field Rendering',
+        """Radiance Field methods have recently revolutionized novel-view synthesis of scenes captured with multiple photos or videos, but achieving high visual quality requires neural networks that are costly to train and render. We represent the scene with 3D Gaussians that preserve desirable properties of continuous volumetric radiance fields, perform interleaved optimization and density control of the Gaussians, and develop a fast visibility-aware rendering algorithm that supports anisotropic splatting for real-time rendering at 1080p resolution.""",
+        False
+    ),
+    (
+        'Scaling Rectified Flow Transformers for High-Resolution Image Synthesis',
+        """Diffusion models create data from noise by inverting the forward paths of data towards noise and have emerged as a powerful generative modeling technique for high-dimensional, perceptual data such as images and videos. We improve noise sampling techniques for training rectified flow models by biasing them towards perceptually relevant scales, and present a novel transformer-based architecture for text-to-image generation that uses separate weights for the two modalities and enables a bidirectional flow of information between image and text tokens.""",
+        False
+    ),
+    (
+        'Robust Speech Recognition via Large-Scale Weak Supervision',
+        """We study the capabilities of speech processing systems trained simply to predict large amounts of transcripts of audio on the internet. When scaled to 680,000 hours of multilingual and multitask supervision, the resulting models generalize well to standard benchmarks and are often competitive with prior fully supervised results in a zero-shot transfer setting without the need for any fine-tuning. When compared to humans, the models approach their accuracy and robustness. We are releasing models and inference code.""",
+        False
+    ),
+    (
+        'QLoRA: Efficient Finetuning of Quantized LLMs',
+        """We present QLoRA, an efficient finetuning approach that reduces memory usage enough to finetune a 65B parameter model on a single 48GB GPU while preserving full 16-bit finetuning task performance. QLoRA backpropagates gradients through a frozen, 4-bit quantized pretrained language model into Low Rank Adapters. It introduces 4-bit NormalFloat, double quantization and paged optimizers, and our best model family, Guanaco, reaches 99.3% of the performance level of ChatGPT on the Vicuna benchmark.""",
+        False
+    ),
+    (
+        'Lost in the Middle: How Language Models Use Long Contexts',
+        """While recent language models have the ability to take long contexts as input, relatively little is known about how well they use longer context. We analyze the performance of language models on two tasks that require identifying relevant information in their input contexts: multi-document question answering and key-value retrieval. We find that performance can degrade significantly when changing the position of relevant information, and is often highest when it occurs at the beginning or end of the input context.""",
+        False
+    ),
+    (
+        'Retrieval-Augmented Generation for Knowledge-Intensive NLP Tasks',
+        """Large pre-trained language models store factual knowledge in their parameters, but their ability to access and precisely manipulate knowledge is still limited. We explore a general-purpose fine-tuning recipe for retrieval-augmented generation models which combine pre-trained parametric and non-parametric memory for language generation, where the non-parametric memory is a dense vector index of Wikipedia accessed with a pre-trained neural retriever. RAG models set the state of the art on three open domain question answering tasks.""",
+        False
+    ),
+    (
+        'Judging LLM-as-a-Judge with MT-Bench and Chatbot Arena',
+        """Evaluating large language model based chat assistants is challenging due to their broad capabilities and the inadequacy of existing benchmarks in measuring human preferences. We explore using strong LLMs as judges to evaluate these models on more open-ended questions, examining the usage and limitations of LLM-as-a-judge, including position, verbosity and self-enhancement biases. We verify the agreement between LLM judges and human preferences with MT-bench, a multi-turn question set, and Chatbot Arena, a crowdsourced battle platform.""",
+        False
+    ),
+    (
+        'Self-Instruct: Aligning Language Models with Self-Generated Instructions',
+        """Large instruction-tuned language models depend heavily on human-written instruction data that is often limited in quantity, diversity and creativity. We introduce Self-Instruct, a framework for improving the instruction-following capabilities of pretrained language models by bootstrapping off their own generations. Our pipeline generates instructions, input and output samples from a language model, then filters invalid or similar ones before using them to finetune the original model, a 33% absolute improvement over vanilla GPT-3 on Super-NaturalInstructions.""",
+        False
+    ),
+    (
+        'Mixtral of Experts',
+        """We introduce Mixtral 8x7B, a Sparse Mixture of Experts language model with the same architecture as Mistral 7B, except that each layer is composed of 8 feedforward blocks. For every token, at each layer, a router network selects two experts to process the current state and combine their outputs, so each token has access to 47B parameters but only uses 13B active parameters during inference. Mixtral outperforms Llama 2 70B and GPT-3.5 across evaluated benchmarks, in particular mathematics, code generation and multilingual benchmarks.""",
+        False
+    ),
+    (
+        'DINOv2: Learning Robust Visual Features without Supervision',
+        """Recent breakthroughs in natural language processing for model pretraining on large quantities of data have opened the way for similar foundation models in computer vision. We show that existing self-supervised pretraining methods can produce all-purpose visual features that work across image distributions and tasks without finetuning if trained on enough curated data from diverse sources. We build an automatic pipeline to curate a diverse image dataset and train a ViT model with 1B parameters, distilled into smaller models.""",
+        False
+    ),
+    (
+        'Stable Video Diffusion: Scaling Latent Video Diffusion Models to Large Datasets',
+        """We present Stable Video Diffusion, a latent video diffusion model for high-resolution, state-of-the-art text-to-video and image-to-video generation. We identify and evaluate three stages for successful training of video LDMs: text-to-image pretraining, video pretraining and high-quality video finetuning, and present a systematic curation process for training a strong base model including captioning and filtering strategies. The model provides a powerful motion representation for downstream tasks such as image-to-video generation and multi-view synthesis.""",
+        False
+    ),
+    (
+        'GPTQ: Accurate Post-Training Quantization for Generative Pre-trained Transformers',
+        """Generative Pre-trained Transformer models stand out through breakthrough performance across complex language modelling tasks, but also through their extremely high computational and storage costs. We propose GPTQ, a new one-shot weight quantization method based on approximate second-order information that is both highly accurate and highly efficient. GPTQ can quantize GPT models with 175 billion parameters in approximately four GPU hours, reducing the bitwidth down to 3 or 4 bits per weight with negligible accuracy degradation.""",
+        False
+    ),
+    (
+        "Let's Verify Step by Step",
+        """In recent years, large language models have greatly improved in their ability to perform complex multi-step reasoning, yet even state-of-the-art models still regularly produce logical mistakes. We compare outcome supervision, which provides feedback for a final result, and process supervision, which provides feedback for each intermediate reasoning step, for training reliable reward models. Process supervision significantly outperforms outcome supervision on the challenging MATH dataset, and we release PRM800K, a dataset of 800,000 step-level human feedback labels.""",
+        False
+    ),
+    (
+        'Efficient Memory Management for Large Language Model Serving with PagedAttention',
+        """High throughput serving of large language models requires batching sufficiently many requests at a time, but existing systems struggle because the key-value cache memory for each request is huge and grows and shrinks dynamically. We propose PagedAttention, an attention algorithm inspired by virtual memory and paging techniques in operating systems, and build vLLM, an LLM serving system that achieves near-zero waste in KV cache memory and flexible sharing of KV cache within and across requests, improving throughput by 2-4x.""",
+        False
+    ),
+]
+
+# The papers whose abstracts are quoted in full, which the live classifier test runs on
+FULL_ABSTRACT_PAPERS = LABELLED_PAPERS[:6]
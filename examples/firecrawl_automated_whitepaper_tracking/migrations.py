@@ -0,0 +1,268 @@
+__doc__ = """Versioned schema migrations for the papers database.
+
+Each migration moves the schema_version table one version forward. Indexes are built with
+CREATE INDEX CONCURRENTLY, which does not block writes to the table while it runs, so
+migrations can be applied while other runs are using the database. Because concurrent
+index builds cannot run inside a transaction, migrations run in autocommit mode under a
+Postgres advisory lock that keeps two runs from migrating at the same time.
+
+Migrations are applied automatically by Database when the stored version is older than
+Database.CURRENT_SCHEMA_VERSION, or manually with:
+    python migrations.py --url postgresql://...:5432/postgres
+
+Advisory locks belong to a server session, which the Supabase transaction pooler (port
+6543) does not keep between statements: the lock and the unlock can reach different server
+connections, leaking the lock on one of them. Migrations therefore refuse to run through
+the transaction pooler. Apply them manually over a direct or session pooler connection,
+after which runs through the transaction pooler start normally again.
+"""
+
+import argparse
+from dataclasses import dataclass
+from typing import Optional
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection, Engine
+
+from db_engine import POOL_MODE_TRANSACTION, detect_pool_mode
+from logging_config import setup_base_logging
+
+logger = setup_base_logging(
+    logger_name="migrations",
+    log_file="migrations.log"
+)
+
+# Oldest schema version the migrations below can upgrade from. Version 2 is the schema
+# created by Base.metadata.create_all before migrations existed.
+BASELINE_VERSION = 2
+# Arbitrary application-wide key of the advisory lock held while migrating
+MIGRATION_LOCK_KEY = 0x70617065  # "pape"
+
+
+@dataclass(frozen=True)
+class ConcurrentIndex:
+    """An index built without blocking writes to its table."""
+    name: str
+    table: str
+    definition: str
+
+    @property
+    def create_statement(self) -> str:
+        return (
+            f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {self.name} "
+            f"ON {self.table} {self.definition}"
+        )
+
+
+@dataclass(frozen=True)
+class Migration:
+    """Statements that upgrade the schema to a version."""
+    version: int
+    description: str
+    statements: tuple[str, ...] = ()
+    indexes: tuple[ConcurrentIndex, ...] = ()
+
+
+MIGRATIONS = (
+    Migration(
+        version=3,
+        description="Index failed extractions by attempt time and papers by submission date",
+        indexes=(
+            # Partial index covering the retry lookup of get_failed_extractions and
+            # partition_urls, small because only failed rows are in it
+            ConcurrentIndex(
+                "ix_papers_failed_by_attempt", "papers",
+                "(last_extraction_attempt) INCLUDE (url) WHERE extraction_success = false"
+            ),
+            # Composite index for listing papers by submission date with index-only scans
+            ConcurrentIndex(
+                "ix_papers_submission_date", "papers", "(submission_date, url)"
+            ),
+        ),
+    ),
+    Migration(
+        version=4,
+        description="Add the append-only paper_metrics history",
+        statements=(
+            "CREATE TABLE IF NOT EXISTS paper_metrics ("
+            " id BIGSERIAL PRIMARY KEY,"
+            " url VARCHAR NOT NULL,"
+            " observed_at TIMESTAMP WITHOUT TIME ZONE NOT NULL,"
+            " upvotes INTEGER NOT NULL,"
+            " comments INTEGER NOT NULL"
+            ")",
+        ),
+        indexes=(
+            ConcurrentIndex(
+                "ix_paper_metrics_url_observed_at", "paper_metrics", "(url, observed_at)"
+            ),
+        ),
+    ),
+    Migration(
+        version=5,
+        description="Add retry backoff and lease columns for retry workers",
+        statements=(
+            "ALTER TABLE papers ADD COLUMN IF NOT EXISTS retry_count INTEGER NOT NULL DEFAULT 0",
+            "ALTER TABLE papers ADD COLUMN IF NOT EXISTS next_retry_at TIMESTAMP WITHOUT TIME ZONE",
+            "ALTER TABLE papers ADD COLUMN IF NOT EXISTS lease_owner VARCHAR",
+            "ALTER TABLE papers ADD COLUMN IF NOT EXISTS lease_expires_at TIMESTAMP WITHOUT TIME ZONE",
+        ),
+        indexes=(
+            # Due failed extractions, in the order retry workers claim them
+            ConcurrentIndex(
+                "ix_papers_retry_due", "papers",
+                "(next_retry_at) WHERE extraction_success = false"
+            ),
+        ),
+    ),
+    Migration(
+        version=6,
+        description="Add export checkpoints and index papers by change time",
+        statements=(
+            "CREATE TABLE IF NOT EXISTS export_checkpoints ("
+            " sink_name VARCHAR PRIMARY KEY,"
+            " last_updated TIMESTAMP WITHOUT TIME ZONE NOT NULL,"
+            " last_url VARCHAR NOT NULL,"
+            " exported_count BIGINT NOT NULL,"
+            " updated_at TIMESTAMP WITHOUT TIME ZONE"
+            ")",
+        ),
+        indexes=(
+            # Keyset order of the incremental export
+            ConcurrentIndex(
+                "ix_papers_last_updated", "papers", "(last_updated, url)"
+            ),
+        ),
+    ),
+    Migration(
+        version=7,
+        description="Add the classification cache",
+        statements=(
+            "CREATE TABLE IF NOT EXISTS paper_classifications ("
+            " cache_key VARCHAR(64) PRIMARY KEY,"
+            " category_hash VARCHAR(64) NOT NULL,"
+            " model VARCHAR NOT NULL,"
+            " title VARCHAR,"
+            " belongs_to_category BOOLEAN NOT NULL,"
+            " confidence FLOAT NOT NULL,"
+            " created_at TIMESTAMP WITHOUT TIME ZONE"
+            ")",
+        ),
+    ),
+    Migration(
+        version=8,
+        description="Track classification jobs submitted to the OpenAI Batch API",
+        statements=(
+            "CREATE TABLE IF NOT EXISTS classification_batches ("
+            " batch_id VARCHAR PRIMARY KEY,"
+            " model VARCHAR NOT NULL,"
+            " category_hash VARCHAR(64) NOT NULL,"
+            " requests TEXT NOT NULL,"
+            " status VARCHAR NOT NULL,"
+            " submitted_at TIMESTAMP WITHOUT TIME ZONE,"
+            " collected_at TIMESTAMP WITHOUT TIME ZONE"
+            ")",
+        ),
+    ),
+)
+
+
+def pending_migrations(db_version: int, target_version: int) -> list[Migration]:
+    """
+    Return the migrations that upgrade db_version to target_version, in order.
+
+    Raises:
+        RuntimeError: If db_version is older than the baseline or a version has no migration
+    """
+    if db_version < BASELINE_VERSION:
+        raise RuntimeError(
+            f"Schema version {db_version} predates migrations, recreate the database"
+        )
+    by_version = {migration.version: migration for migration in MIGRATIONS}
+    missing = [v for v in range(db_version + 1, target_version + 1) if v not in by_version]
+    if missing:
+        raise RuntimeError(f"No migration defined for schema versions {missing}")
+    return [by_version[v] for v in range(db_version + 1, target_version + 1)]
+
+
+def _current_version(connection: Connection) -> int:
+    return connection.execute(text(
+        "SELECT COALESCE(MAX(version), 0) FROM schema_version"
+    )).scalar()
+
+
+def _build_index(connection: Connection, index: ConcurrentIndex) -> None:
+    """Build an index concurrently, replacing an invalid one left by an interrupted build."""
+    valid = connection.execute(text(
+        "SELECT i.indisvalid FROM pg_index i "
+        "JOIN pg_class c ON c.oid = i.indexrelid WHERE c.relname = :name"
+    ), {"name": index.name}).scalar()
+    if valid is False:
+        logger.warning("Dropping invalid index %s left by an interrupted build", index.name)
+        connection.execute(text(f"DROP INDEX CONCURRENTLY IF EXISTS {index.name}"))
+    logger.info("Building index %s", index.name)
+    connection.execute(text(index.create_statement))
+
+
+def run_migrations(engine: Engine, target_version: int, pool_mode: Optional[str] = None) -> int:
+    """
+    Apply all pending migrations up to target_version.
+
+    Args:
+        engine (Engine): Engine of the papers database
+        target_version (int): Schema version to migrate to
+        pool_mode (Optional[str]): Pool mode of the engine (see db_engine), detected from
+            its URL if not given
+
+    Returns:
+        int: The schema version after migrating
+
+    Raises:
+        RuntimeError: If the engine connects through the transaction pooler, where the
+            advisory lock cannot be held reliably
+    """
+    if (pool_mode or detect_pool_mode(str(engine.url))) == POOL_MODE_TRANSACTION:
+        raise RuntimeError(
+            f"The schema needs migrating to version {target_version}, which cannot be done "
+            "through the transaction pooler (port 6543). Run python migrations.py --url "
+            "with a direct or session pooler connection string (port 5432) first."
+        )
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as connection:
+        connection.execute(text("SELECT pg_advisory_lock(:key)"), {"key": MIGRATION_LOCK_KEY})
+        try:
+            # Another run may have migrated while this one waited for the lock
+            db_version = _current_version(connection)
+            for migration in pending_migrations(db_version, target_version):
+                logger.info(
+                    "Migrating schema to version %d: %s",
+                    migration.version, migration.description
+                )
+                for statement in migration.statements:
+                    connection.execute(text(statement))
+                for index in migration.indexes:
+                    _build_index(connection, index)
+                connection.execute(text(
+                    "INSERT INTO schema_version (version) VALUES (:version)"
+                ), {"version": migration.version})
+                db_version = migration.version
+            return db_version
+        finally:
+            connection.execute(
+                text("SELECT pg_advisory_unlock(:key)"), {"key": MIGRATION_LOCK_KEY}
+            )
+
+
+if __name__ == "__main__":
+    import os
+    from dotenv import load_dotenv
+    from supabase_db import Database
+
+    load_dotenv()
+    parser = argparse.ArgumentParser(description='Apply pending schema migrations.')
+    parser.add_argument('--url', default=os.getenv("POSTGRES_URL"),
+                       help='Direct or session pooler connection string (default: '
+                            'POSTGRES_URL)')
+    args = parser.parse_args()
+    # Database applies pending migrations while checking the schema version
+    db = Database(args.url)
+    logger.info("Schema is at version %d", Database.CURRENT_SCHEMA_VERSION)
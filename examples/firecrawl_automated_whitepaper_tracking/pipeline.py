@@ -0,0 +1,162 @@
+__doc__ = """Staged asyncio pipeline connected by bounded queues.
+
+Each stage has its own pool of workers reading from a bounded input queue. A stage handler
+returns the item to hand to the next stage, or None to drop it. When a queue is full, the
+stage feeding it waits, so backpressure propagates upstream instead of letting items pile up
+in memory, while fast stages keep working independently of slow ones.
+"""
+
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import Any, AsyncIterable, Awaitable, Callable, Optional
+
+from logging_config import setup_base_logging
+
+logger = setup_base_logging(
+    logger_name="pipeline",
+    log_file="pipeline.log"
+)
+
+# Tells a worker that its stage has no more input
+_DONE = object()
+
+
+@dataclass
+class StageStats:
+    """Throughput and queue depth counters of one pipeline stage."""
+    name: str
+    workers: int
+    queue_size: int
+    processed: int = 0
+    forwarded: int = 0
+    dropped: int = 0
+    failed: int = 0
+    busy_seconds: float = 0.0
+    max_queue_depth: int = 0
+    queue_depth_total: int = 0
+    queue_depth_samples: int = 0
+    elapsed_seconds: float = 0.0
+
+    @property
+    def throughput(self) -> float:
+        """Items handled per second of pipeline wall time."""
+        handled = self.processed + self.failed
+        return handled / self.elapsed_seconds if self.elapsed_seconds else 0.0
+
+    @property
+    def average_queue_depth(self) -> float:
+        if not self.queue_depth_samples:
+            return 0.0
+        return self.queue_depth_total / self.queue_depth_samples
+
+    def log_summary(self) -> None:
+        logger.info(
+            "Stage %s (%d workers): %d processed, %d forwarded, %d dropped, %d failed, "
+            "%.2f items/s, busy %.2fs, queue depth avg %.1f / max %d of %d",
+            self.name, self.workers, self.processed, self.forwarded, self.dropped,
+            self.failed, self.throughput, self.busy_seconds, self.average_queue_depth,
+            self.max_queue_depth, self.queue_size
+        )
+
+
+class Stage:
+    """A named pipeline step with its own worker count and bounded input queue."""
+
+    def __init__(
+        self,
+        name: str,
+        handler: Callable[[Any], Awaitable[Optional[Any]]],
+        workers: int = 1,
+        queue_size: Optional[int] = None
+    ):
+        if workers < 1:
+            raise ValueError("A stage needs at least one worker")
+        self.name = name
+        self.handler = handler
+        self.workers = workers
+        self.queue_size = queue_size or 2 * workers
+        self.stats = StageStats(name, workers, self.queue_size)
+
+
+class Pipeline:
+    """Runs items from a source through a sequence of stages."""
+
+    def __init__(self, stages: list[Stage]):
+        if not stages:
+            raise ValueError("A pipeline needs at least one stage")
+        self.stages = stages
+
+    @property
+    def stats(self) -> list[StageStats]:
+        return [stage.stats for stage in self.stages]
+
+    def log_summary(self) -> None:
+        for stage in self.stages:
+            stage.stats.log_summary()
+
+    async def run(self, source: AsyncIterable[Any]) -> None:
+        """
+        Feed every item of source through all stages and wait until the pipeline drains.
+
+        Exceptions raised by a handler are logged and counted against its stage, and the
+        item is dropped. An exception raised by the source cancels the pipeline.
+
+        Args:
+            source: Asynchronous iterable of items for the first stage
+        """
+        queues = [asyncio.Queue(maxsize=stage.queue_size) for stage in self.stages]
+        started = time.monotonic()
+
+        async def put(index: int, item: Any) -> None:
+            await queues[index].put(item)
+            stats = self.stages[index].stats
+            depth = queues[index].qsize()
+            stats.max_queue_depth = max(stats.max_queue_depth, depth)
+            stats.queue_depth_total += depth
+            stats.queue_depth_samples += 1
+
+        async def feed() -> None:
+            async for item in source:
+                await put(0, item)
+            for _ in range(self.stages[0].workers):
+                await queues[0].put(_DONE)
+
+        async def work(index: int) -> None:
+            stage = self.stages[index]
+            is_last = index == len(self.stages) - 1
+            while True:
+                item = await queues[index].get()
+                if item is _DONE:
+                    return
+                handler_started = time.monotonic()
+                try:
+                    result = await stage.handler(item)
+                except Exception as e:  # one bad item must not stop the stage
+                    stage.stats.failed += 1
+                    logger.error("Stage %s failed on item: %s", stage.name, e, exc_info=True)
+                    continue
+                finally:
+                    stage.stats.busy_seconds += time.monotonic() - handler_started
+                stage.stats.processed += 1
+                if result is None:
+                    stage.stats.dropped += 1
+                elif not is_last:
+                    stage.stats.forwarded += 1
+                    await put(index + 1, result)
+
+        async def run_stage(index: int) -> None:
+            stage = self.stages[index]
+            await asyncio.gather(*(work(index) for _ in range(stage.workers)))
+            stage.stats.elapsed_seconds = time.monotonic() - started
+            if index + 1 < len(self.stages):
+                for _ in range(self.stages[index + 1].workers):
+                    await queues[index + 1].put(_DONE)
+
+        tasks = [asyncio.create_task(feed())]
+        tasks += [asyncio.create_task(run_stage(index)) for index in range(len(self.stages))]
+        try:
+            await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
@@ -0,0 +1,210 @@
+__doc__ = """Local lexical prefilter in front of the LLM classifier.
+
+Most papers on the daily listing are plainly unrelated to DESIRED_CATEGORY, yet classifying
+each one costs an OpenAI request. The prefilter scores the title and abstract of a paper by
+TF-IDF cosine similarity to the category definition and to exemplar papers of the category
+(CATEGORY_EXEMPLARS), and papers scoring below the threshold are rejected without a request.
+
+The threshold is calibrated on labelled papers: the highest score that keeps the allowed
+share of relevant papers is scaled down by PREFILTER_MARGIN, so that only papers far below
+every relevant one are skipped. Run this module to calibrate against the papers of
+labelled_papers.py and to see the recall lost against the calls saved. Editing
+DESIRED_CATEGORY or CATEGORY_EXEMPLARS changes the scores, so recalibrate and set
+PREFILTER_THRESHOLD afterwards.
+
+Usage:
+    python prefilter.py --max-recall-loss 0
+"""
+
+import argparse
+import math
+import re
+import threading
+from collections import Counter
+from typing import Iterable, NamedTuple
+
+from logging_config import setup_base_logging
+
+logger = setup_base_logging(
+    logger_name="prefilter",
+    log_file="prefilter.log"
+)
+
+# Calibrated for the shipped DESIRED_CATEGORY and CATEGORY_EXEMPLARS on labelled_papers.py
+# with python prefilter.py. 0 disables the prefilter.
+DEFAULT_PREFILTER_THRESHOLD = 0.099
+# Share of the calibrated score that a paper must reach to be sent to the classifier
+PREFILTER_MARGIN = 0.75
+
+_WORD_PATTERN = re.compile(r"[a-z][a-z0-9\-]+")
+# Paragraphs and bullet points of a category definition, the documents IDF is computed over
+_SECTION_PATTERN = re.compile(r"\n\s*\n|\n\s*•")
+_STOP_WORDS = frozenset("""
+    the and for with are that this from its our their which these those can such not than
+    into via using based also more most both each only any all how what where when who whom
+    been has have had does was were will would should could may might one two three
+""".split())
+
+
+def tokenize(text: str) -> list[str]:
+    """Lowercased content words of a text, with a plural "s" stripped."""
+    tokens = []
+    for word in _WORD_PATTERN.findall(text.lower()):
+        if len(word) < 3 or word in _STOP_WORDS:
+            continue
+        if word.endswith("s") and not word.endswith("ss") and len(word) > 3:
+            word = word[:-1]
+        tokens.append(word)
+    return tokens
+
+
+class CalibrationPoint(NamedTuple):
+    """Effect of a prefilter threshold on a labelled set."""
+    threshold: float
+    recall_loss: float
+    calls_saved: float
+
+
+class LexicalPrefilter:
+    """TF-IDF similarity between papers and a category definition.
+
+    IDF weights are computed over the sections of the definition and the exemplars, so
+    words that recur throughout the definition weigh less than the distinctive ones.
+    Thread-safe, since the sync filter runs in worker threads.
+    """
+
+    def __init__(
+        self,
+        desired_category: str,
+        exemplars: Iterable[str] = (),
+        threshold: float = DEFAULT_PREFILTER_THRESHOLD
+    ):
+        exemplars = list(exemplars)
+        documents = [
+            section for section in _SECTION_PATTERN.split(desired_category) if section.strip()
+        ] + exemplars
+        document_frequency = Counter(word for doc in documents for word in set(tokenize(doc)))
+        count = len(documents)
+        self._idf = {
+            word: math.log((1 + count) / (1 + frequency)) + 1
+            for word, frequency in document_frequency.items()
+        }
+        self._unknown_idf = math.log(1 + count) + 1
+        self._exemplars = [self._vector(text) for text in [desired_category, *exemplars]]
+        self.threshold = threshold
+        self._lock = threading.Lock()
+        self.passed = 0
+        self.skipped = 0
+
+    def _vector(self, text: str) -> dict[str, float]:
+        counts = Counter(tokenize(text))
+        vector = {
+            word: (1 + math.log(n)) * self._idf.get(word, self._unknown_idf)
+            for word, n in counts.items()
+        }
+        norm = math.sqrt(sum(weight * weight for weight in vector.values())) or 1.0
+        return {word: weight / norm for word, weight in vector.items()}
+
+    def score(self, paper_title: str, paper_abstract: str) -> float:
+        """Highest cosine similarity of a paper to the definition or an exemplar."""
+        vector = self._vector(f"{paper_title}\n{paper_abstract}")
+        return max(
+            sum(weight * exemplar.get(word, 0.0) for word, weight in vector.items())
+            for exemplar in self._exemplars
+        )
+
+    def passes(self, paper_title: str, paper_abstract: str) -> bool:
+        """Whether a paper reaches the threshold, without counting it in the summary."""
+        return self.threshold <= 0 or self.score(paper_title, paper_abstract) >= self.threshold
+
+    def should_classify(self, paper_title: str, paper_abstract: str) -> bool:
+        """Whether a paper scores high enough to be sent to the LLM classifier."""
+        if self.threshold <= 0:
+            return True
+        score = self.score(paper_title, paper_abstract)
+        passed = score >= self.threshold
+        with self._lock:
+            if passed:
+                self.passed += 1
+            else:
+                self.skipped += 1
+        if not passed:
+            logger.info("Prefilter skipped '%s' (score %.3f)", paper_title, score)
+        return passed
+
+    def log_summary(self) -> None:
+        logger.info(
+            "Prefilter: %d papers sent to the classifier, %d skipped (threshold %.3f)",
+            self.passed, self.skipped, self.threshold
+        )
+
+
+def evaluate_threshold(
+    scored: list[tuple[float, bool]], threshold: float
+) -> CalibrationPoint:
+    """Recall loss and share of calls saved by a threshold on (score, relevant) pairs."""
+    relevant = [score for score, label in scored if label]
+    lost = sum(score < threshold for score in relevant)
+    saved = sum(score < threshold for score, _ in scored)
+    return CalibrationPoint(
+        threshold,
+        lost / len(relevant) if relevant else 0.0,
+        saved / len(scored) if scored else 0.0
+    )
+
+
+def calibrate(
+    prefilter: LexicalPrefilter,
+    labelled: Iterable[tuple[str, str, bool]],
+    max_recall_loss: float = 0.0,
+    margin: float = PREFILTER_MARGIN
+) -> tuple[CalibrationPoint, list[CalibrationPoint]]:
+    """
+    Choose a threshold from labelled papers.
+
+    Args:
+        prefilter (LexicalPrefilter): Prefilter to score the papers with
+        labelled (Iterable[tuple[str, str, bool]]): (title, abstract, relevant) per paper
+        max_recall_loss (float): Share of relevant papers the threshold may reject
+        margin (float): Factor applied to the highest threshold within max_recall_loss
+
+    Returns:
+        tuple[CalibrationPoint, list[CalibrationPoint]]: The calibrated threshold, and the
+            trade-off at every labelled score for reporting
+    """
+    scored = [
+        (prefilter.score(title, abstract), relevant) for title, abstract, relevant in labelled
+    ]
+    curve = [evaluate_threshold(scored, score) for score, _ in sorted(scored)]
+    within = [point.threshold for point in curve if point.recall_loss <= max_recall_loss]
+    best = max(within, default=0.0)
+    return evaluate_threshold(scored, best * margin), curve
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Calibrate the lexical prefilter.')
+    parser.add_argument('--max-recall-loss', type=float, default=0.0,
+                       help='Share of relevant labelled papers the prefilter may reject')
+    parser.add_argument('--margin', type=float, default=PREFILTER_MARGIN,
+                       help='Factor applied to the calibrated score (default: %(default)s)')
+    args = parser.parse_args()
+
+    from category_prompt import CATEGORY_EXEMPLARS, DESIRED_CATEGORY
+    from labelled_papers import LABELLED_PAPERS
+
+    calibrated, trade_off = calibrate(
+        LexicalPrefilter(DESIRED_CATEGORY, CATEGORY_EXEMPLARS),
+        LABELLED_PAPERS,
+        args.max_recall_loss,
+        args.margin
+    )
+    for point in trade_off:
+        logger.info(
+            "Threshold %.3f: %.0f%% recall lost, %.0f%% calls saved",
+            point.threshold, point.recall_loss * 100, point.calls_saved * 100
+        )
+    logger.info(
+        "Calibrated PREFILTER_THRESHOLD=%.3f: %.0f%% recall lost, %.0f%% of %d calls saved",
+        calibrated.threshold, calibrated.recall_loss * 100, calibrated.calls_saved * 100,
+        len(LABELLED_PAPERS)
+    )
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Entry point module for draining the backlog of failed extractions.
+
+Each worker repeatedly leases a batch of failed papers that are due for a retry, re-runs
+the extraction for exactly those papers and processes the ones that succeed. Leases are
+claimed with FOR UPDATE SKIP LOCKED, so any number of workers (on one machine or many)
+can run side by side without paying for the same extraction twice.
+"""
+
+import argparse
+import asyncio
+import os
+import socket
+import sys
+import uuid
+from typing import Optional
+
+from dotenv import load_dotenv
+
+# Add project root to Python path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "../.."))
+sys.path.insert(0, project_root)
+
+from examples.firecrawl_automated_whitepaper_tracking.firecrawl_crawl_extract import (
+    AsyncSemanticFilter,
+    classification_cache,
+    prefilter,
+    process_claimed_retries,
+    token_usage
+)
+from examples.firecrawl_automated_whitepaper_tracking.firecrawl_client import AsyncFirecrawlClient
+from examples.firecrawl_automated_whitepaper_tracking.supabase_db import AsyncDatabase, Database
+from examples.firecrawl_automated_whitepaper_tracking.logging_config import setup_base_logging
+
+logger = setup_base_logging(
+    logger_name="retry_worker",
+    log_file="retry_worker.log"
+)
+
+DEFAULT_BATCH_SIZE = 5
+DEFAULT_LEASE_SECONDS = 600
+
+
+def default_worker_id() -> str:
+    """Identifier unique to this worker process."""
+    return f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:8]}"
+
+
+async def run_retry_worker(
+    db: Database,
+    worker_id: Optional[str] = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    lease_seconds: int = DEFAULT_LEASE_SECONDS,
+    max_batches: Optional[int] = None
+) -> tuple[int, int]:
+    """
+    Lease and retry failed extractions until none are due.
+
+    Args:
+        db (Database): Database holding the failed extractions
+        worker_id (Optional[str]): Identifier the leases are taken under
+        batch_size (int): Papers leased per batch
+        lease_seconds (int): Lease duration, which should cover extracting one batch
+        max_batches (Optional[int]): Stop after this many batches
+
+    Returns:
+        tuple[int, int]: Number of papers retried and number that failed again
+    """
+    worker_id = worker_id or default_worker_id()
+    classification_cache.use_database(db)
+    retried = failed = batches = 0
+    async with AsyncDatabase(db) as async_db, AsyncFirecrawlClient() as client, \
+            AsyncSemanticFilter() as classifier:
+        while max_batches is None or batches < max_batches:
+            urls = await async_db.claim_failed_extractions(worker_id, batch_size, lease_seconds)
+            if not urls:
+                break
+            failed += await process_claimed_retries(
+                urls, async_db, worker_id, client, classifier=classifier
+            )
+            retried += len(urls)
+            batches += 1
+    logger.info("Worker %s retried %d papers, %d failed again", worker_id, retried, failed)
+    classification_cache.log_summary()
+    prefilter.log_summary()
+    token_usage.log_summary()
+    return retried, failed
+
+
+if __name__ == "__main__":
+    load_dotenv()
+    parser = argparse.ArgumentParser(description='Retry failed paper extractions.')
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE,
+                       help='Failed papers leased per batch')
+    parser.add_argument('--lease-seconds', type=int, default=DEFAULT_LEASE_SECONDS,
+                       help='How long a leased batch is reserved for this worker')
+    parser.add_argument('--max-batches', type=int,
+                       help='Stop after this many batches (default: until none are due)')
+    args = parser.parse_args()
+
+    asyncio.run(run_retry_worker(
+        Database(os.getenv("POSTGRES_URL")),
+        batch_size=args.batch_size,
+        lease_seconds=args.lease_seconds,
+        max_batches=args.max_batches
+    ))
@@ -0,0 +1,191 @@
+__doc__ = """Adaptive sliding-window scheduler for concurrent paper extraction.
+
+Instead of cutting the work into fixed batches, the scheduler keeps a window of N requests in
+flight at all times and starts the next one as soon as any request finishes. N adapts AIMD
+style: it grows additively (by about one per window of successful requests) and halves on
+throttling (HTTP 429), timeouts and latency spikes, always staying within configured bounds.
+"""
+
+import asyncio
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterable, AsyncIterator, Awaitable, Callable, Dict, Iterable, Union
+
+import aiohttp
+
+from latency_stats import percentile
+from logging_config import setup_base_logging
+
+logger = setup_base_logging(
+    logger_name="scheduler",
+    log_file="scheduler.log"
+)
+
+
+@dataclass
+class SchedulerStats:
+    """Per-run statistics of an AdaptiveScheduler."""
+    peak_concurrency: int = 0
+    completed: int = 0
+    failed: int = 0
+    congestion_events: int = 0
+    queue_waits: list[float] = field(default_factory=list)
+    latencies: Dict[Any, float] = field(default_factory=dict)
+
+    @property
+    def latency_p50(self) -> float:
+        return percentile(list(self.latencies.values()), 50)
+
+    @property
+    def latency_p95(self) -> float:
+        return percentile(list(self.latencies.values()), 95)
+
+    @property
+    def queue_wait_p95(self) -> float:
+        return percentile(self.queue_waits, 95)
+
+    def log_summary(self) -> None:
+        logger.info(
+            "Scheduler run: %d completed, %d failed, %d congestion events, peak concurrency %d, "
+            "queue wait p95 %.2fs, latency p50 %.2fs / p95 %.2fs",
+            self.completed, self.failed, self.congestion_events, self.peak_concurrency,
+            self.queue_wait_p95, self.latency_p50, self.latency_p95
+        )
+
+
+def is_congestion_error(error: BaseException) -> bool:
+    """Whether an error signals that the remote side is overloaded."""
+    if isinstance(error, aiohttp.ClientResponseError):
+        return error.status == 429
+    return isinstance(error, (asyncio.TimeoutError, TimeoutError))
+
+
+class AdaptiveScheduler:
+    """Runs an async worker over a stream of items with an AIMD-controlled window."""
+
+    def __init__(
+        self,
+        min_concurrency: int = 1,
+        max_concurrency: int = 10,
+        initial_concurrency: int = 5,
+        latency_spike_factor: float = 3.0
+    ):
+        if not 1 <= min_concurrency <= max_concurrency:
+            raise ValueError("Concurrency bounds must satisfy 1 <= min <= max")
+        self.min_concurrency = min_concurrency
+        self.max_concurrency = max_concurrency
+        self.latency_spike_factor = latency_spike_factor
+        self._window = float(min(max(initial_concurrency, min_concurrency), max_concurrency))
+        self._latency_average = None
+        self._latency_samples = 0
+        self.stats = SchedulerStats()
+
+    @property
+    def concurrency(self) -> int:
+        """Current number of requests allowed in flight."""
+        return int(self._window)
+
+    def _record(self, result: Any, latency: float) -> None:
+        """Adjust the window after a request finished."""
+        if isinstance(result, BaseException):
+            self.stats.failed += 1
+            if is_congestion_error(result):
+                self._decrease(type(result).__name__)
+            return
+
+        self.stats.completed += 1
+        spike = (
+            self._latency_samples >= 3
+            and latency > self.latency_spike_factor * self._latency_average
+        )
+        self._latency_samples += 1
+        if self._latency_average is None:
+            self._latency_average = latency
+        else:
+            self._latency_average = 0.8 * self._latency_average + 0.2 * latency
+        if spike:
+            self._decrease(f"latency spike of {latency:.2f}s")
+        else:
+            # Additive increase: one more slot per window of successful requests
+            self._window = min(self.max_concurrency, self._window + 1 / self._window)
+
+    def _decrease(self, reason: str) -> None:
+        """Multiplicative decrease of the window."""
+        self.stats.congestion_events += 1
+        self._window = max(self.min_concurrency, self._window / 2)
+        logger.warning("Halving concurrency to %d after %s", self.concurrency, reason)
+
+    async def run(
+        self,
+        items: Union[Iterable[Any], AsyncIterable[Any]],
+        worker: Callable[[Any], Awaitable[Any]]
+    ) -> AsyncIterator[tuple[Any, Any]]:
+        """
+        Run worker over items, yielding (item, result) pairs in completion order.
+
+        Items from an async source are queued as they arrive. Exceptions raised by the worker
+        are yielded as results rather than raised.
+
+        Args:
+            items: Plain or asynchronous iterable of work items
+            worker: Coroutine function processing a single item
+
+        Yields:
+            tuple[Any, Any]: The item and its result or exception
+        """
+        events: asyncio.Queue = asyncio.Queue()
+        pending: deque = deque()
+        tasks: set = set()
+
+        async def read_source():
+            try:
+                if hasattr(items, "__aiter__"):
+                    async for item in items:
+                        events.put_nowait(("item", item, time.monotonic()))
+                else:
+                    for item in items:
+                        events.put_nowait(("item", item, time.monotonic()))
+            except Exception as e:  # re-raised by the dispatch loop
+                events.put_nowait(("error", e, None))
+            events.put_nowait(("end", None, None))
+
+        async def run_one(item, started):
+            try:
+                result = await worker(item)
+            except Exception as e:  # yielded to the caller
+                result = e
+            events.put_nowait(("done", (item, time.monotonic() - started), result))
+
+        reader = asyncio.create_task(read_source())
+        source_done = False
+        in_flight = 0
+        try:
+            while not (source_done and not pending and in_flight == 0):
+                kind, payload, value = await events.get()
+                if kind == "item":
+                    pending.append((payload, value))
+                elif kind == "end":
+                    source_done = True
+                elif kind == "error":
+                    raise payload
+                else:
+                    in_flight -= 1
+                    item, latency = payload
+                    self.stats.latencies[item] = latency
+                    self._record(value, latency)
+                    yield item, value
+
+                while pending and in_flight < self.concurrency:
+                    item, arrived = pending.popleft()
+                    started = time.monotonic()
+                    self.stats.queue_waits.append(started - arrived)
+                    task = asyncio.create_task(run_one(item, started))
+                    tasks.add(task)
+                    task.add_done_callback(tasks.discard)
+                    in_flight += 1
+                    self.stats.peak_concurrency = max(self.stats.peak_concurrency, in_flight)
+        finally:
+            reader.cancel()
+            for task in list(tasks):
+                task.cancel()
@@ -1,7 +1,11 @@
 __doc__ = """Module for semantic filtering of research papers using OpenAI's API."""
 
+import asyncio
 import os
 import json
+import threading
+from dataclasses import dataclass, field
+from typing import Optional
 
 from json import JSONDecodeError
 from pydantic import BaseModel, ValidationError
@@ -9,7 +13,9 @@ from dotenv import load_dotenv
 
 import openai
 from logging_config import setup_semantic_filter_logging, log_function_call
-from category_prompt import DESIRED_CATEGORY
+from category_prompt import CATEGORY_EXEMPLARS, DESIRED_CATEGORY
+from classification_cache import ClassificationCache
+from prefilter import DEFAULT_PREFILTER_THRESHOLD, LexicalPrefilter
 
 # Load environment variables
 load_dotenv()
@@ -23,6 +29,94 @@ logger.info("Using OpenAI version: %s", openai.__version__)
 
 client = openai.OpenAI()
 
+CLASSIFIER_MODEL = "gpt-4o-mini"
+CLASSIFIER_TEMPERATURE = 0.7
+# Papers are processed when they belong to the category with a higher confidence
+CONFIDENCE_THRESHOLD = 0.8
+# AsyncSemanticFilter: requests in flight, per-request timeout and retries of the client
+CLASSIFIER_MAX_CONCURRENCY = 4
+CLASSIFIER_TIMEOUT_SECONDS = 30
+CLASSIFIER_MAX_RETRIES = 2
+# Papers classified per request by classify_papers. The desired category, the longest part
+# of the prompt, is sent once per request instead of once per paper.
+CLASSIFICATION_BATCH_SIZE = 8
+# CLASSIFIER_MODEL prices in USD per million tokens, for the cost in TokenUsage summaries.
+# Cached prompt tokens are billed at a discount.
+PROMPT_TOKEN_PRICE = 0.15
+CACHED_PROMPT_TOKEN_PRICE = 0.075
+COMPLETION_TOKEN_PRICE = 0.60
+
+# Shared by all classifications of the process. In memory only until an entry point
+# (the tracker, the retry worker or the collect command) attaches its database with
+# classification_cache.use_database.
+classification_cache = ClassificationCache()
+
+# Rejects papers far from DESIRED_CATEGORY before they cost a request. Recalibrate with
+# python prefilter.py after editing the category; PREFILTER_THRESHOLD=0 disables it.
+prefilter = LexicalPrefilter(
+    DESIRED_CATEGORY,
+    CATEGORY_EXEMPLARS,
+    threshold=float(os.getenv("PREFILTER_THRESHOLD", DEFAULT_PREFILTER_THRESHOLD))
+)
+
+@dataclass
+class TokenUsage:
+    """
+    Token counters of the classification requests of the process.
+
+    The prompts put the instructions and the desired category first, so that OpenAI can
+    serve this prefix from its prompt cache (for prefixes of at least 1024 tokens) and
+    bill it as cached tokens. The summary reports how much of the prompt was cached and
+    what classifying a paper cost. Thread-safe, since the sync filter runs in worker threads.
+    """
+    requests: int = 0
+    papers: int = 0
+    prompt_tokens: int = 0
+    cached_tokens: int = 0
+    completion_tokens: int = 0
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+
+    def record(self, usage, papers: int = 1) -> None:
+        """Add the usage of a chat completion response that classified papers."""
+        details = getattr(usage, "prompt_tokens_details", None)
+        with self._lock:
+            self.requests += 1
+            self.papers += papers
+            if usage is None:
+                return
+            self.prompt_tokens += usage.prompt_tokens or 0
+            self.cached_tokens += getattr(details, "cached_tokens", None) or 0
+            self.completion_tokens += usage.completion_tokens or 0
+
+    @property
+    def cache_hit_rate(self) -> float:
+        """Share of prompt tokens served from the prompt cache."""
+        return self.cached_tokens / self.prompt_tokens if self.prompt_tokens else 0.0
+
+    @property
+    def cost(self) -> float:
+        """Cost in USD of the recorded requests."""
+        return (
+            (self.prompt_tokens - self.cached_tokens) * PROMPT_TOKEN_PRICE
+            + self.cached_tokens * CACHED_PROMPT_TOKEN_PRICE
+            + self.completion_tokens * COMPLETION_TOKEN_PRICE
+        ) / 1_000_000
+
+    @property
+    def cost_per_paper(self) -> float:
+        return self.cost / self.papers if self.papers else 0.0
+
+    def log_summary(self) -> None:
+        logger.info(
+            "Classification tokens: %d requests for %d papers, %d prompt tokens "
+            "(%.0f%% cached), %d completion tokens, $%.6f ($%.6f per paper)",
+            self.requests, self.papers, self.prompt_tokens, self.cache_hit_rate * 100,
+            self.completion_tokens, self.cost, self.cost_per_paper
+        )
+
+# Usage of every classification request of the process, logged in run summaries
+token_usage = TokenUsage()
+
 class CategoryMatch(BaseModel):
     """
     Pydantic model for paper category classification results.
@@ -32,6 +126,13 @@ class CategoryMatch(BaseModel):
     belongs_to_category: bool
     confidence: float
 
+def needs_classification(paper_details: dict) -> bool:
+    """Whether a new paper passes the prefilter but has no cached classification yet."""
+    title, abstract = paper_details["paper_title"], paper_details["abstract_body"]
+    return prefilter.passes(title, abstract) and classification_cache.get(
+        title, abstract, DESIRED_CATEGORY, CLASSIFIER_MODEL
+    ) is None
+
 @log_function_call
 def should_process(paper_details: dict, is_new_paper: bool) -> tuple[bool, float]:
     """
@@ -48,6 +149,10 @@ def should_process(paper_details: dict, is_new_paper: bool) -> tuple[bool, float
     """
     if not is_new_paper:
         return False, 0.0
+    if not prefilter.should_classify(
+        paper_details["paper_title"], paper_details["abstract_body"]
+    ):
+        return False, 0.0
 
     # Get semantic classification
     belongs, confidence = belongs_to_category(
@@ -57,19 +162,15 @@ def should_process(paper_details: dict, is_new_paper: bool) -> tuple[bool, float
     )
     
     # Only process if both belongs is True AND confidence is high enough
-    return belongs and confidence > 0.8, confidence
+    return belongs and confidence > CONFIDENCE_THRESHOLD, confidence
 
-@log_function_call
-def belongs_to_category(paper_title: str, paper_abstract: str, desired_category: str) -> tuple[bool, float]:
-    """
-    Determine if a paper belongs to a specific category using
-    an OpenAI model that supports structured JSON outputs.
-    
-    Returns:
-        tuple: (belongs_to_category: bool, confidence: float)
+def classification_messages(paper_title: str, paper_abstract: str, desired_category: str) -> list[dict]:
     """
-    logger.info("Analyzing paper: '%s' for category '%s'", paper_title, desired_category)
+    Chat messages classifying a single paper.
 
+    The system message, instructions followed by the desired category, is the same for
+    every paper and forms the cacheable prompt prefix. Only the user message varies.
+    """
     system_instructions = (
         "You are a research paper classifier. "
         "Given: a desired_category, a paper_title, and a paper_abstract, "
@@ -81,43 +182,281 @@ def belongs_to_category(paper_title: str, paper_abstract: str, desired_category:
     )
 
     user_prompt = (
-        f"desired_category: {desired_category}\n"
         f"paper_title: {paper_title}\n"
         f"paper_abstract: {paper_abstract}"
     )
+    return [
+        {
+            "role": "system",
+            "content": f"{system_instructions}\n\ndesired_category: {desired_category}"
+        },
+        {"role": "user", "content": user_prompt},
+    ]
 
+def parse_classification(message_content: Optional[str]) -> Optional[CategoryMatch]:
+    """Validate a single-paper response. Returns None if it is empty or malformed."""
+    message_content = (message_content or "").strip()
+    logger.debug("Raw message content: %s", message_content)
+    if not message_content:
+        logger.error("Empty response from model")
+        return None
     try:
-        response = client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[
-                {"role": "system", "content": system_instructions},
-                {"role": "user", "content": user_prompt},
-            ],
-            temperature=0.7
+        classification = CategoryMatch(**json.loads(message_content))
+    except (JSONDecodeError, TypeError, ValidationError) as e:
+        logger.error("Error parsing or validating classification result: %s", e)
+        return None
+    logger.info(
+        "Classification result: belongs=%s, confidence=%s",
+        classification.belongs_to_category,
+        classification.confidence
+    )
+    return classification
+
+@log_function_call
+def belongs_to_category(paper_title: str, paper_abstract: str, desired_category: str) -> tuple[bool, float]:
+    """
+    Determine if a paper belongs to a specific category using
+    an OpenAI model that supports structured JSON outputs.
+
+    Results are served from classification_cache when the same paper was classified
+    for the same category and model before. Unparseable responses are not cached.
+    
+    Returns:
+        tuple: (belongs_to_category: bool, confidence: float)
+    """
+    cached = classification_cache.get(
+        paper_title, paper_abstract, desired_category, CLASSIFIER_MODEL
+    )
+    if cached is not None:
+        logger.info("Cached classification of '%s': %s", paper_title, cached)
+        return cached
+
+    logger.info("Analyzing paper: '%s' for category '%s'", paper_title, desired_category)
+    response = client.chat.completions.create(
+        model=CLASSIFIER_MODEL,
+        messages=classification_messages(paper_title, paper_abstract, desired_category),
+        temperature=CLASSIFIER_TEMPERATURE
+    )
+    # Add detailed response logging
+    logger.debug("Full API response: %s", response)
+    token_usage.record(response.usage)
+
+    classification = parse_classification(response.choices[0].message.content)
+    if classification is None:
+        return False, 0.0
+    classification_cache.put(
+        paper_title, paper_abstract, desired_category, CLASSIFIER_MODEL,
+        classification.belongs_to_category, classification.confidence
+    )
+    return classification.belongs_to_category, classification.confidence
+
+class AsyncSemanticFilter:
+    """
+    Async counterpart of should_process and belongs_to_category for the pipeline.
+
+    All classifications of a run share one AsyncOpenAI client, whose connection pool keeps
+    connections to the API open between requests. Each request has a timeout, and a
+    semaphore bounds how many are in flight, so classification overlaps with extraction and
+    notification without blocking the event loop or flooding the API. Cache lookups, which
+    may hit the database, run in a worker thread.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = CLASSIFIER_MAX_CONCURRENCY,
+        timeout: float = CLASSIFIER_TIMEOUT_SECONDS,
+        openai_client: Optional[openai.AsyncOpenAI] = None
+    ):
+        self._owns_client = openai_client is None
+        self.client = openai_client or openai.AsyncOpenAI(
+            timeout=timeout, max_retries=CLASSIFIER_MAX_RETRIES
         )
-        # Add detailed response logging
-        logger.debug("Full API response: %s", response)
-        
-        message_content = response.choices[0].message.content.strip()
-        logger.debug("Raw message content: %s", message_content)
-        
-        if not message_content:
-            logger.error("Empty response from model")
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def __aenter__(self) -> "AsyncSemanticFilter":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    async def close(self) -> None:
+        """Close the connection pool of a client created by this filter."""
+        if self._owns_client:
+            await self.client.close()
+
+    async def should_process(self, paper_details: dict, is_new_paper: bool) -> tuple[bool, float]:
+        """Async should_process: whether a new paper is relevant, and the confidence."""
+        if not is_new_paper:
+            return False, 0.0
+        if not prefilter.should_classify(
+            paper_details["paper_title"], paper_details["abstract_body"]
+        ):
             return False, 0.0
-            
-        parsed_args = json.loads(message_content)
+        belongs, confidence = await self.belongs_to_category(
+            paper_details["paper_title"],
+            paper_details["abstract_body"],
+            DESIRED_CATEGORY
+        )
+        return belongs and confidence > CONFIDENCE_THRESHOLD, confidence
 
-        classification = CategoryMatch(**parsed_args)
-        logger.info(
-            "Classification result: belongs=%s, confidence=%s",
-            classification.belongs_to_category,
-            classification.confidence
+    async def belongs_to_category(
+        self, paper_title: str, paper_abstract: str, desired_category: str
+    ) -> tuple[bool, float]:
+        """
+        Async belongs_to_category, served from classification_cache when possible.
+
+        Raises:
+            openai.OpenAIError: If the request fails, including timeouts, after retries
+        """
+        cached = await asyncio.to_thread(
+            classification_cache.get,
+            paper_title, paper_abstract, desired_category, CLASSIFIER_MODEL
+        )
+        if cached is not None:
+            logger.info("Cached classification of '%s': %s", paper_title, cached)
+            return cached
+
+        async with self._semaphore:
+            logger.info("Analyzing paper: '%s' for category '%s'", paper_title, desired_category)
+            response = await self.client.chat.completions.create(
+                model=CLASSIFIER_MODEL,
+                messages=classification_messages(paper_title, paper_abstract, desired_category),
+                temperature=CLASSIFIER_TEMPERATURE
+            )
+        token_usage.record(response.usage)
+        classification = parse_classification(response.choices[0].message.content)
+        if classification is None:
+            return False, 0.0
+        await asyncio.to_thread(
+            classification_cache.put,
+            paper_title, paper_abstract, desired_category, CLASSIFIER_MODEL,
+            classification.belongs_to_category, classification.confidence
         )
         return classification.belongs_to_category, classification.confidence
 
-    except (JSONDecodeError, ValidationError) as e:
-        logger.error("Error parsing or validating classification result: %s", e)
-        return False, 0.0
+def build_batch_messages(papers: list[tuple[str, str]], desired_category: str) -> list[dict]:
+    """
+    Chat messages classifying several papers in one request.
+
+    Args:
+        papers (list[tuple[str, str]]): (title, abstract) of each paper
+        desired_category (str): Category definition, sent once for all papers
+
+    Returns:
+        list[dict]: System and user messages asking for one result per paper id. As in
+            classification_messages, the system message is the cacheable prefix.
+    """
+    system_instructions = (
+        "You are a research paper classifier. "
+        "Given: a desired_category and a numbered list of papers, each with an id, a "
+        "paper_title and a paper_abstract, determine for each paper if it belongs to the "
+        "desired_category. Output only a valid JSON object with the exact format: "
+        "{ \"classifications\": [ { \"id\": integer, \"belongs_to_category\": boolean, "
+        "\"confidence\": float } ] } with exactly one entry per paper id. "
+        "Where 'belongs_to_category' is True if the paper belongs to the specified "
+        "desired_category, otherwise False, and 'confidence' is a float between 0 and 1. "
+        "No additional keys or text."
+    )
+    paper_list = "\n\n".join(
+        f"id: {paper_id}\npaper_title: {title}\npaper_abstract: {abstract}"
+        for paper_id, (title, abstract) in enumerate(papers)
+    )
+    return [
+        {
+            "role": "system",
+            "content": f"{system_instructions}\n\ndesired_category: {desired_category}"
+        },
+        {"role": "user", "content": paper_list},
+    ]
+
+
+def parse_batch_classifications(message_content: str, paper_count: int) -> dict[int, CategoryMatch]:
+    """
+    Validate a multi-paper response paper by paper.
+
+    An entry that is malformed, has an unknown id or repeats an id is dropped on its own,
+    without discarding the rest of the response.
+
+    Returns:
+        dict[int, CategoryMatch]: Validated result per paper id
+    """
+    try:
+        entries = json.loads(message_content)["classifications"]
+    except (JSONDecodeError, KeyError, TypeError) as e:
+        logger.error("Error parsing batch classification result: %s", e)
+        return {}
+    results = {}
+    for entry in entries if isinstance(entries, list) else []:
+        try:
+            paper_id = int(entry["id"])
+            match = CategoryMatch.model_validate(entry)
+        except (KeyError, TypeError, ValueError, ValidationError) as e:
+            logger.warning("Dropping invalid classification entry %s: %s", entry, e)
+            continue
+        if 0 <= paper_id < paper_count and paper_id not in results:
+            results[paper_id] = match
+    return results
+
+
+def classify_papers(
+    papers_details: list[dict],
+    desired_category: str = DESIRED_CATEGORY,
+    batch_size: int = CLASSIFICATION_BATCH_SIZE
+) -> list[Optional[tuple[bool, float]]]:
+    """
+    Classify many papers with one request per batch_size papers.
+
+    Cached papers are not sent again, and results are added to classification_cache, so
+    should_process later serves these papers without a request of its own. Papers that
+    the prefilter rejects are not sent either, since should_process will skip them.
+
+    Args:
+        papers_details (list[dict]): Paper details with paper_title and abstract_body
+        desired_category (str): Category definition
+        batch_size (int): Papers per request
+
+    Returns:
+        list[Optional[tuple[bool, float]]]: (belongs_to_category, confidence) per paper,
+            None for papers the model returned no valid result for, whose request failed
+            or that the prefilter rejected
+    """
+    papers = [(d["paper_title"], d["abstract_body"]) for d in papers_details]
+    results = [
+        classification_cache.get(title, abstract, desired_category, CLASSIFIER_MODEL)
+        for title, abstract in papers
+    ]
+    pending = [
+        index for index, result in enumerate(results)
+        if result is None
+        and (desired_category != DESIRED_CATEGORY or prefilter.passes(*papers[index]))
+    ]
+    for start in range(0, len(pending), batch_size):
+        chunk = pending[start:start + batch_size]
+        chunk_papers = [papers[index] for index in chunk]
+        try:
+            response = client.chat.completions.create(
+                model=CLASSIFIER_MODEL,
+                messages=build_batch_messages(chunk_papers, desired_category),
+                response_format={"type": "json_object"},
+                temperature=CLASSIFIER_TEMPERATURE
+            )
+        except openai.OpenAIError as e:
+            logger.error("Batch classification of %d papers failed: %s", len(chunk), e)
+            continue
+        token_usage.record(response.usage, papers=len(chunk))
+        matches = parse_batch_classifications(
+            response.choices[0].message.content or "", len(chunk)
+        )
+        for paper_id, match in matches.items():
+            title, abstract = chunk_papers[paper_id]
+            classification_cache.put(
+                title, abstract, desired_category, CLASSIFIER_MODEL,
+                match.belongs_to_category, match.confidence
+            )
+            results[chunk[paper_id]] = (match.belongs_to_category, match.confidence)
+        logger.info("Classified %d of %d papers in one request", len(matches), len(chunk))
+    return results
+
 
 if __name__ == "__main__":
     logger.info("Starting semantic filter test")
@@ -135,9 +474,8 @@ if __name__ == "__main__":
 #  the flexibility of model switching
 # TODO: add examples to system prompt of abstract that are known to be 
 # in the category (agents)
-# TODO: store paper category relevance evaluations and confidence scores in the database 
-# to develop more accurate relevance response evaluations in the future 
-# using the OpenAI Evals platform.
+# TODO: use the relevance evaluations stored in paper_classifications to develop more
+# accurate relevance response evaluations using the OpenAI Evals platform.
 # TODO: implement error handling for OpenAI API credit exhaustion and send admin-only
 # notifications to Discord using discord_notifications.py's webhook. Research needed:
 # Discord webhook might not support role-based visibility (@admin mentions) directly - 
@@ -1,18 +1,60 @@
-__doc__ = """Module for interacting with the supabase database using SQLAlchemy."""
+__doc__ = """Module for interacting with the supabase database using SQLAlchemy.
 
+The same Database interface also runs on a local SQLite file or in-memory database
+(sqlite:///papers.db or sqlite://), so tests and benchmarks need no network. Postgres-only
+statements (COPY, xmax, FOR UPDATE SKIP LOCKED, interval arithmetic) have portable
+fallbacks there, and local databases are recreated rather than migrated.
+"""
+
+import asyncio
+import csv
+import io
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
+from functools import partial
+from typing import NamedTuple, Optional
 from sqlalchemy import (
-    create_engine, Column, String, Integer, DateTime, Text, ARRAY, text, Boolean
+    Column, String, Integer, BigInteger, DateTime, Float, Text, ARRAY, text, Boolean, case, Index,
+    bindparam, func, inspect, insert, literal, literal_column, null, or_, select, tuple_, update
 )
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.types import TypeDecorator
 from sqlalchemy.orm import sessionmaker, declarative_base
+from db_engine import create_database_engine, is_local_database
 from logging_config import setup_database_logging
-from sqlalchemy.exc import SQLAlchemyError
+from migrations import run_migrations
+from sqlalchemy.exc import ProgrammingError, SQLAlchemyError
 
 # Configure logging using centralized configuration
 logger = setup_database_logging()
 
 Base = declarative_base()
 
+
+class StringList(TypeDecorator):
+    """A list of strings, stored as a native ARRAY on Postgres and as JSON text elsewhere."""
+    impl = Text
+    cache_ok = True
+
+    def load_dialect_impl(self, dialect):
+        if dialect.name == "postgresql":
+            return dialect.type_descriptor(ARRAY(String))
+        return dialect.type_descriptor(Text())
+
+    def process_bind_param(self, value, dialect):
+        if value is None or dialect.name == "postgresql":
+            return value
+        return json.dumps(value)
+
+    def process_result_value(self, value, dialect):
+        if value is None or dialect.name == "postgresql":
+            return value
+        return json.loads(value)
+
+
 class Paper(Base):
     """SQLAlchemy model for storing research papers from the Hugging Face daily papers page.
     Each paper entry includes its URL, title, authors, abstract, associated URLs (PDF, arXiv, GitHub),
@@ -20,7 +62,7 @@ class Paper(Base):
     __tablename__ = "papers"
     url = Column(String, primary_key=True)
     title = Column(String, nullable=False)
-    authors = Column(ARRAY(String), nullable=False)
+    authors = Column(StringList, nullable=False)
     abstract = Column(Text, nullable=False)
     pdf_url = Column(String)
     arxiv_url = Column(String)
@@ -34,41 +76,335 @@ class Paper(Base):
     extraction_success = Column(Boolean, default=True)
     extraction_error = Column(Text, nullable=True)
     last_extraction_attempt = Column(DateTime, default=datetime.now)
+    # Retry scheduling of failed extractions, see Database.claim_failed_extractions
+    retry_count = Column(Integer, nullable=False, default=0, server_default=text("0"))
+    next_retry_at = Column(DateTime, nullable=True)
+    lease_owner = Column(String, nullable=True)
+    lease_expires_at = Column(DateTime, nullable=True)
+
+    # Built concurrently on existing databases by migrations 3, 5 and 6, see migrations.py
+    __table_args__ = (
+        Index(
+            "ix_papers_failed_by_attempt", "last_extraction_attempt",
+            postgresql_where=text("extraction_success = false"),
+            postgresql_include=["url"],
+            sqlite_where=text("extraction_success = 0")
+        ),
+        Index("ix_papers_submission_date", "submission_date", "url"),
+        Index(
+            "ix_papers_retry_due", "next_retry_at",
+            postgresql_where=text("extraction_success = false"),
+            sqlite_where=text("extraction_success = 0")
+        ),
+        # Keyset order of the incremental export, see exporter.py
+        Index("ix_papers_last_updated", "last_updated", "url"),
+    )
+
+
+class PaperMetric(Base):
+    """SQLAlchemy model for the append-only engagement history of papers.
+    Every run appends one observation of the upvotes and comments of each paper it sees,
+    so momentum can be computed from stored history without scraping again."""
+    __tablename__ = "paper_metrics"
+    # SQLite only autoincrements INTEGER primary keys
+    id = Column(BigInteger().with_variant(Integer, "sqlite"), primary_key=True, autoincrement=True)
+    url = Column(String, nullable=False)
+    observed_at = Column(DateTime, nullable=False, default=datetime.now)
+    upvotes = Column(Integer, nullable=False)
+    comments = Column(Integer, nullable=False)
+
+    # Built concurrently on existing databases by migration 4, see migrations.py
+    __table_args__ = (
+        Index("ix_paper_metrics_url_observed_at", "url", "observed_at"),
+    )
+
+
+class ListingSnapshot(Base):
+    """SQLAlchemy model for the per-date listing ledger.
+    Stores how many papers were found on a daily papers listing and a fingerprint of their
+    URLs, so a rerun can tell whether the listing changed since it was last processed."""
+    __tablename__ = "listing_ledger"
+    listing_url = Column(String, primary_key=True)
+    paper_count = Column(Integer, nullable=False)
+    url_set_hash = Column(String(64), nullable=False)
+    last_changed = Column(DateTime, default=datetime.now)
+    last_checked = Column(DateTime, default=datetime.now, onupdate=datetime.now)
+
+
+class ExportCheckpoint(Base):
+    """SQLAlchemy model for the progress of incremental exports, one row per sink.
+    The watermark is the (last_updated, url) of the last paper a sink received, so an
+    interrupted export resumes after it instead of starting over."""
+    __tablename__ = "export_checkpoints"
+    sink_name = Column(String, primary_key=True)
+    last_updated = Column(DateTime, nullable=False)
+    last_url = Column(String, nullable=False)
+    exported_count = Column(BigInteger, nullable=False, default=0)
+    updated_at = Column(DateTime, default=datetime.now, onupdate=datetime.now)
+
+
+class PaperClassification(Base):
+    """SQLAlchemy model for cached semantic filter results, see classification_cache.py.
+    Keyed by a hash of the title, abstract, desired category and model, so results of an
+    outdated category are never served but remain as a record of past evaluations."""
+    __tablename__ = "paper_classifications"
+    cache_key = Column(String(64), primary_key=True)
+    category_hash = Column(String(64), nullable=False)
+    model = Column(String, nullable=False)
+    title = Column(String)
+    belongs_to_category = Column(Boolean, nullable=False)
+    confidence = Column(Float, nullable=False)
+    created_at = Column(DateTime, default=datetime.now)
+
+
+class ClassificationBatch(Base):
+    """SQLAlchemy model for classification jobs submitted to the OpenAI Batch API.
+    requests maps the custom_id of every request in the job to the [cache_key, title]
+    pairs of its papers, in the order of their ids in the prompt, so results can be
+    cached by a later process than the one that submitted the job."""
+    __tablename__ = "classification_batches"
+    batch_id = Column(String, primary_key=True)
+    model = Column(String, nullable=False)
+    category_hash = Column(String(64), nullable=False)
+    requests = Column(Text, nullable=False)
+    status = Column(String, nullable=False, default="submitted")
+    submitted_at = Column(DateTime, default=datetime.now)
+    collected_at = Column(DateTime, nullable=True)
+
+
+class ExportWatermark(NamedTuple):
+    """Position of an incremental export in the (last_updated, url) order of papers."""
+    last_updated: datetime
+    url: str
+
+
+class UrlPartition(NamedTuple):
+    """URLs sorted by what the pipeline still has to do with them.
+
+    new: never stored, need a full extraction
+    retry: stored with a failed extraction that is due for another attempt
+    known: already extracted successfully, at most need a metrics refresh
+    deferred: failed extractions that are leased to a retry worker or not due yet
+    abandoned: failed extractions that used up their MAX_RETRIES attempts
+    """
+    new: list[str]
+    retry: list[str]
+    known: list[str]
+    deferred: list[str]
+    abandoned: list[str]
+
+
+class UpvoteVelocity(NamedTuple):
+    """Upvote growth of a paper over a window of its stored metric history."""
+    url: str
+    first_observed_at: datetime
+    last_observed_at: datetime
+    upvote_delta: int
+    # None when both observations were made at the same time
+    upvotes_per_hour: Optional[float]
+
+    @classmethod
+    def from_row(cls, row) -> "UpvoteVelocity":
+        """Build from a Postgres row, whose NUMERIC division comes back as a Decimal."""
+        return cls(
+            row.url,
+            row.first_observed_at,
+            row.last_observed_at,
+            int(row.upvote_delta),
+            None if row.upvotes_per_hour is None else float(row.upvotes_per_hour)
+        )
+
+
+class StartupProbe(NamedTuple):
+    """Schema version and missing tables found by Database._startup_probe."""
+    version: int
+    missing_tables: list[str]
+
+
+# Values of the retry scheduling columns once a paper has been extracted successfully
+RETRY_STATE_RESET = {
+    "retry_count": literal(0),
+    "next_retry_at": null(),
+    "lease_owner": null(),
+    "lease_expires_at": null(),
+}
+# Backoff of failed extractions: base * 2^retry_count, capped
+RETRY_BACKOFF_BASE_SECONDS = 3600
+RETRY_BACKOFF_MAX_SECONDS = 24 * 3600
+MAX_RETRIES = 8
+
+
+def retry_backoff_seconds(retry_count: int) -> int:
+    """Delay before the next retry of a paper that already failed retry_count retries."""
+    return min(RETRY_BACKOFF_BASE_SECONDS * 2 ** retry_count, RETRY_BACKOFF_MAX_SECONDS)
+
+
+# Columns filled from extracted paper details
+PAPER_DETAIL_COLUMNS = (
+    "title", "authors", "abstract", "pdf_url", "arxiv_url", "github_url",
+    "publication_date", "submission_date", "upvotes", "comments"
+)
+
+
+def _paper_date(paper_data: dict, kind: str, now: datetime) -> datetime:
+    """Assemble the publication or submission date of extracted paper details."""
+    try:
+        return datetime(
+            paper_data[f"utc_{kind}_date_year"],
+            paper_data[f"utc_{kind}_date_month"],
+            paper_data[f"utc_{kind}_date_day"]
+        )
+    except ValueError as e:
+        logger.warning("Invalid %s date in %s: %s", kind, paper_data['url'], e)
+        return now
+
+
+def _paper_rows(papers_data: list[dict]) -> list[dict]:
+    """Turn extracted paper details into papers table rows in one pass over the batch.
+
+    Every row gets the same columns, as a multi-row INSERT requires. Duplicate URLs are
+    collapsed to their last occurrence, since ON CONFLICT cannot update a row twice.
+    """
+    now = datetime.now()
+    papers_by_url = {paper_data["url"]: paper_data for paper_data in papers_data}
+    succeeded = [p for p in papers_by_url.values() if p.get("extraction_success")]
+    failed = [p for p in papers_by_url.values() if not p.get("extraction_success")]
+
+    # Dates and author lists are assembled column-wise for the whole batch up front
+    publication_dates = [_paper_date(p, "publication", now) for p in succeeded]
+    submission_dates = [_paper_date(p, "submission", now) for p in succeeded]
+    author_lists = [p["authors"].split(", ") for p in succeeded]
+
+    rows = []
+    for paper_data, publication_date, submission_date, authors in zip(
+        succeeded, publication_dates, submission_dates, author_lists
+    ):
+        rows.append({
+            "url": paper_data["url"],
+            "title": paper_data["paper_title"],
+            "authors": authors,
+            "abstract": paper_data["abstract_body"],
+            "pdf_url": paper_data.get("view_pdf_url"),
+            "arxiv_url": paper_data.get("view_arxiv_page_url"),
+            "github_url": paper_data.get("github_repo_url"),
+            "publication_date": publication_date,
+            "submission_date": submission_date,
+            "upvotes": paper_data.get("number_of_upvotes", 0),
+            "comments": paper_data.get("number_of_comments", 0),
+            "notification_sent": False,
+            "extraction_success": True,
+            "extraction_error": None,
+            "last_extraction_attempt": paper_data.get("last_extraction_attempt") or now,
+            "last_updated": now,
+        })
+    # NOT NULL constraints are checked on the proposed row before ON CONFLICT applies,
+    # so failed extractions carry placeholders. Only papers that were never extracted
+    # keep them; stored details win on conflict.
+    placeholders = {
+        **dict.fromkeys(PAPER_DETAIL_COLUMNS),
+        "title": "",
+        "authors": [],
+        "abstract": "",
+        "publication_date": now,
+        "submission_date": now,
+        "upvotes": 0,
+        "comments": 0,
+    }
+    for paper_data in failed:
+        rows.append({
+            "url": paper_data["url"],
+            **placeholders,
+            "notification_sent": paper_data.get("notification_sent", False),
+            "extraction_success": False,
+            "extraction_error": paper_data.get("extraction_error"),
+            "last_extraction_attempt": paper_data.get("last_extraction_attempt") or now,
+            "last_updated": now,
+        })
+    return rows
+
+
+# Rows fetched per round-trip by the streaming iterators
+DEFAULT_STREAM_BATCH_SIZE = 500
 
 
 class Database:
     """Class for interacting with the database using SQLAlchemy."""
-    CURRENT_SCHEMA_VERSION = 2
+    CURRENT_SCHEMA_VERSION = 8
 
-    def __init__(self, connection_string, skip_version_check=False):
+    def __init__(self, connection_string, skip_version_check=False, pool_mode=None):
         logger.info("Initializing Database connection")
         if not connection_string:
             logger.error("Database connection string is not set")
             raise ValueError("Database connection string is not set")
 
-        # Ensure sslmode=require is appended
-        if '?' not in connection_string:
+        # Ensure sslmode=require is appended to remote databases
+        if is_local_database(connection_string):
+            pass
+        elif '?' not in connection_string:
             connection_string += '?sslmode=require'
         elif 'sslmode' not in connection_string:
             connection_string += '&sslmode=require'
 
         logger.debug("Creating engine with connection string: %s", connection_string.split('?')[0])
-        self.engine = create_engine(
-            connection_string,
-            pool_pre_ping=True  # Pre-ping helps keep connections alive
-        )
+        # Pooling depends on whether Supabase is reached directly or through its pooler
+        self.engine, self.pool_metrics = create_database_engine(connection_string, pool_mode)
 
-        logger.info("Creating database tables if they don't exist")
-        Base.metadata.create_all(self.engine)
         self.session_factory = sessionmaker(bind=self.engine)
-        logger.info("Database initialization complete")
+        self.is_postgres = self.engine.dialect.name == "postgresql"
+        self.schema_version = None
 
-        # Only check version if not skipped
-        if not skip_version_check:
-            self._check_schema_version()
-        
-    def _check_schema_version(self):
-        """Verify database schema version is compatible."""
+        started = time.perf_counter()
+        # One round-trip proves connectivity, reads the schema version and finds missing
+        # tables. The create_all DDL and the version check only run when it finds a gap.
+        probe = self._startup_probe()
+        if (probe is not None and probe.version == self.CURRENT_SCHEMA_VERSION
+                and not probe.missing_tables):
+            self.schema_version = probe.version
+            logger.info("Database schema version %d verified", probe.version)
+        else:
+            logger.info("Creating database tables if they don't exist")
+            Base.metadata.create_all(self.engine)
+            # Only check version if not skipped
+            if not skip_version_check:
+                self.schema_version = self._check_schema_version()
+        self.startup_seconds = time.perf_counter() - started
+        logger.info("Database initialization complete in %.3fs", self.startup_seconds)
+
+    def _startup_probe(self):
+        """Read the schema version and the missing tables in a single query.
+
+        Returns:
+            Row: version and missing_tables, or None if schema_version does not exist yet
+        """
+        tables = list(Base.metadata.tables)
+        if not self.is_postgres:
+            return self._local_startup_probe(tables)
+        try:
+            with self.engine.connect() as connection:
+                return connection.execute(text(
+                    "SELECT (SELECT MAX(version) FROM schema_version) AS version, "
+                    "ARRAY(SELECT name FROM unnest(CAST(:tables AS text[])) AS name "
+                    "WHERE to_regclass(name) IS NULL) AS missing_tables"
+                ), {"tables": tables}).one()
+        except ProgrammingError:
+            # schema_version is missing on a new database
+            return None
+
+    def _local_startup_probe(self, tables: list[str]):
+        """Startup probe of local databases, which lack to_regclass and unnest."""
+        with self.engine.connect() as connection:
+            existing = set(inspect(connection).get_table_names())
+            if "schema_version" not in existing:
+                return None
+            version = connection.execute(text("SELECT MAX(version) FROM schema_version")).scalar()
+        return StartupProbe(version, [name for name in tables if name not in existing])
+
+    def _check_schema_version(self) -> int:
+        """Verify database schema version is compatible, migrating older schemas.
+
+        Returns:
+            int: The schema version of the database
+        """
         session = self.session_factory()
         try:
             # Create version table if it doesn't exist
@@ -91,13 +427,22 @@ class Database:
                     "INSERT INTO schema_version (version) VALUES (:version)"
                 ), {"version": self.CURRENT_SCHEMA_VERSION})
                 session.commit()
+                db_version = self.CURRENT_SCHEMA_VERSION
+            elif db_version < self.CURRENT_SCHEMA_VERSION and not self.is_postgres:
+                # Migrations build indexes concurrently under an advisory lock, both of
+                # which are Postgres-only. Local databases are disposable.
+                raise RuntimeError(
+                    f"Local database schema version {db_version} is outdated, recreate it"
+                )
             elif db_version < self.CURRENT_SCHEMA_VERSION:
-                logger.error(
-                    "Database schema version %d is older than required version %d. "
-                    "Please run migrations.",
+                logger.info(
+                    "Database schema version %d is older than required version %d, migrating",
                     db_version, self.CURRENT_SCHEMA_VERSION
                 )
-                raise RuntimeError("Database schema needs migration")
+                session.commit()
+                db_version = run_migrations(
+                    self.engine, self.CURRENT_SCHEMA_VERSION, self.pool_metrics.mode
+                )
             elif db_version > self.CURRENT_SCHEMA_VERSION:
                 logger.error(
                     "Database schema version %d is newer than supported version %d. "
@@ -107,13 +452,23 @@ class Database:
                 raise RuntimeError("Database schema version not supported")
                 
             logger.info("Database schema version: %d", db_version)
-            
+            return db_version
+
         except Exception as e:
             logger.error("Error checking schema version: %s", str(e))
             raise
         finally:
             session.close()
 
+    def ping(self) -> bool:
+        """Check connectivity with a constant-time query. Returns True if the database answers."""
+        try:
+            with self.engine.connect() as connection:
+                return connection.execute(text("SELECT 1")).scalar() == 1
+        except SQLAlchemyError as e:
+            logger.error("Database ping failed: %s", str(e))
+            return False
+
     def get_all_papers(self):
         """Get all papers from the database"""
         logger.info("Fetching all papers from database")
@@ -134,73 +489,73 @@ class Database:
         Returns:
             bool: True if this is a new paper, False if it's an update
         """
-        logger.info("Adding/updating paper: %s", paper_data['url'])
+        return self.add_papers([paper_data])[paper_data["url"]]
+
+    def add_papers(self, papers_data: list[dict]) -> dict[str, bool]:
+        """Add or update many papers with a single INSERT ... ON CONFLICT statement.
+
+        Postgres reports per row whether it was inserted or updated through the xmax
+        system column, which is 0 for freshly inserted rows. Local databases look up the
+        existing URLs in the same transaction instead. Papers whose extraction
+        failed only update the extraction status columns of an existing row, keeping
+        its stored details.
+
+        Returns:
+            dict[str, bool]: For each URL, True if this is a new paper, False if it's an update
+        """
+        rows = _paper_rows(papers_data)
+        if not rows:
+            return {}
+        logger.info("Upserting %d papers", len(rows))
+
+        stmt = (pg_insert if self.is_postgres else sqlite_insert)(Paper).values(rows)
+        succeeded = stmt.excluded.extraction_success
+        # Failed extractions carry no details, so the stored ones are kept
+        detail_columns = {
+            column: case((succeeded, stmt.excluded[column]), else_=Paper.__table__.c[column])
+            for column in PAPER_DETAIL_COLUMNS
+        }
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[Paper.url],
+            set_={
+                **detail_columns,
+                "notification_sent": case(
+                    (succeeded, Paper.notification_sent),
+                    else_=stmt.excluded.notification_sent
+                ),
+                # A successful extraction ends the paper's retry schedule and lease
+                **{
+                    column: case((succeeded, reset), else_=Paper.__table__.c[column])
+                    for column, reset in RETRY_STATE_RESET.items()
+                },
+                "extraction_success": succeeded,
+                "extraction_error": stmt.excluded.extraction_error,
+                "last_extraction_attempt": stmt.excluded.last_extraction_attempt,
+                "last_updated": stmt.excluded.last_updated,
+            }
+        )
+
         session = self.session_factory()
         try:
-            # Check if paper already exists
-            existing_paper = session.query(Paper).filter(
-                Paper.url == paper_data["url"]
-            ).first()
-            
-            is_new_paper = existing_paper is None
-            action = "Adding new" if is_new_paper else "Updating existing"
-            logger.info("%s paper: %s", action, paper_data['url'])
-
-            if paper_data.get("extraction_success"):
-                # Date handling with logging
-                try:
-                    publication_date = datetime(
-                        paper_data["utc_publication_date_year"],
-                        paper_data["utc_publication_date_month"],
-                        paper_data["utc_publication_date_day"]
-                    )
-                except ValueError as e:
-                    logger.warning("Invalid publication date in %s: %s", paper_data['url'], e)
-                    publication_date = datetime.now()
-
-                try:
-                    submission_date = datetime(
-                        paper_data["utc_submission_date_year"],
-                        paper_data["utc_submission_date_month"],
-                        paper_data["utc_submission_date_day"]
-                    )
-                except ValueError as e:
-                    logger.warning("Invalid submission date in %s: %s", paper_data['url'], e)
-                    submission_date = datetime.now()
-
-                # Create/update the paper entry with metrics
-                paper = Paper(
-                    url=paper_data["url"],
-                    title=paper_data["paper_title"],
-                    authors=paper_data["authors"].split(", "),
-                    abstract=paper_data["abstract_body"],
-                    pdf_url=paper_data.get("view_pdf_url"),
-                    arxiv_url=paper_data.get("view_arxiv_page_url"),
-                    github_url=paper_data.get("github_repo_url"),
-                    publication_date=publication_date,
-                    submission_date=submission_date,
-                    upvotes=paper_data.get("number_of_upvotes", 0),
-                    comments=paper_data.get("number_of_comments", 0)
-                )
+            if self.is_postgres:
+                stmt = stmt.returning(Paper.url, literal_column("xmax = 0").label("inserted"))
+                result = {row.url: row.inserted for row in session.execute(stmt)}
             else:
-                # Handle failed extraction
-                paper = Paper(
-                    url=paper_data["url"],
-                    extraction_success=False,
-                    extraction_error=paper_data.get("extraction_error"),
-                    last_extraction_attempt=paper_data["last_extraction_attempt"],
-                    notification_sent=paper_data.get("notification_sent", False)
-                )
-
-            logger.debug("Merging paper data for %s", paper_data['url'])
-            session.merge(paper)
+                urls = [row["url"] for row in rows]
+                existing = set(session.execute(
+                    select(Paper.url).where(Paper.url.in_(urls))
+                ).scalars())
+                session.execute(stmt)
+                result = {url: url not in existing for url in urls}
             session.commit()
-            logger.info("Successfully %s paper for %s", 
-                    'added' if is_new_paper else 'updated', paper_data['url'])
-            
-            return is_new_paper
+            logger.info(
+                "Successfully upserted %d papers (%d new)",
+                len(result), sum(result.values())
+            )
+            return result
         except Exception as e:
-            logger.error("Error adding/updating paper %s: %s", paper_data['url'], str(e))
+            session.rollback()
+            logger.error("Error upserting %d papers: %s", len(rows), str(e))
             raise
         finally:
             session.close()
@@ -225,23 +580,818 @@ class Database:
         finally:
             session.close()
 
+    def partition_urls(self, urls: list[str], min_age_hours: int = 1) -> UrlPartition:
+        """Sort URLs into new, retry, known and deferred papers with a single bulk lookup.
+
+        Failed extractions that are not due for a retry yet are deferred: those with a
+        backoff (next_retry_at) in the future, those attempted less than min_age_hours ago
+        without one, and those leased by a retry worker. Those that failed MAX_RETRIES
+        times are abandoned, as claim_failed_extractions gives up on them too.
+        """
+        logger.info("Looking up %d URLs in database", len(urls))
+        unique_urls = list(dict.fromkeys(urls))
+        if not unique_urls:
+            return UrlPartition([], [], [], [], [])
+        session = self.session_factory()
+        try:
+            rows = session.execute(select(
+                Paper.url, Paper.extraction_success, Paper.last_extraction_attempt,
+                Paper.next_retry_at, Paper.lease_expires_at, Paper.retry_count
+            ).where(Paper.url.in_(unique_urls))).all()
+        except SQLAlchemyError as e:
+            logger.error("Error looking up known papers: %s", str(e))
+            raise
+        finally:
+            session.close()
+
+        stored = {row.url: row for row in rows}
+        now = datetime.now()
+        retry_cutoff = now - timedelta(hours=min_age_hours)
+        partition = UrlPartition([], [], [], [], [])
+        for url in unique_urls:
+            row = stored.get(url)
+            if row is None:
+                partition.new.append(url)
+            elif row.extraction_success is False and (row.retry_count or 0) >= MAX_RETRIES:
+                partition.abandoned.append(url)
+            elif row.extraction_success is False:
+                if row.lease_expires_at is not None and row.lease_expires_at > now:
+                    due = False  # a retry worker is extracting it right now
+                elif row.next_retry_at is not None:
+                    due = row.next_retry_at <= now
+                else:
+                    due = (row.last_extraction_attempt is None
+                           or row.last_extraction_attempt < retry_cutoff)
+                (partition.retry if due else partition.deferred).append(url)
+            else:
+                partition.known.append(url)
+        logger.info(
+            "URL lookup: %d new, %d due for retry, %d known, %d deferred, %d abandoned",
+            len(partition.new), len(partition.retry), len(partition.known),
+            len(partition.deferred), len(partition.abandoned)
+        )
+        return partition
+
+    def count_failed_extractions(self, urls: list[str]) -> int:
+        """Number of the given URLs that are stored with a failed extraction."""
+        unique_urls = list(dict.fromkeys(urls))
+        if not unique_urls:
+            return 0
+        session = self.session_factory()
+        try:
+            return session.execute(
+                select(func.count()).select_from(Paper).where(
+                    Paper.url.in_(unique_urls), Paper.extraction_success.is_(False)
+                )
+            ).scalar()
+        except SQLAlchemyError as e:
+            logger.error("Error counting failed extractions: %s", str(e))
+            raise
+        finally:
+            session.close()
+
+    def update_paper_metrics(self, url: str, upvotes: int, comments: int) -> bool:
+        """Refresh the engagement metrics of a stored paper. Returns True if successful."""
+        logger.info("Updating metrics for %s", url)
+        session = self.session_factory()
+        try:
+            paper = session.query(Paper).filter(Paper.url == url).first()
+            if not paper:
+                logger.error("Paper not found: %s", url)
+                return False
+            paper.upvotes = upvotes
+            paper.comments = comments
+            session.commit()
+            return True
+        except SQLAlchemyError as e:
+            session.rollback()
+            logger.error("Error updating paper metrics: %s", str(e))
+            return False
+        finally:
+            session.close()
+
+    def get_listing_fingerprint(self, listing_url: str):
+        """Return the URL set hash recorded for a listing, or None if it was never recorded."""
+        session = self.session_factory()
+        try:
+            snapshot = session.get(ListingSnapshot, listing_url)
+            return snapshot.url_set_hash if snapshot else None
+        except SQLAlchemyError as e:
+            logger.error("Error reading listing ledger for %s: %s", listing_url, str(e))
+            return None
+        finally:
+            session.close()
+
+    def record_listing(self, listing_url: str, paper_count: int, url_set_hash: str) -> bool:
+        """Record the paper count and URL set hash of a fully processed listing."""
+        logger.info("Recording %d papers for listing %s", paper_count, listing_url)
+        session = self.session_factory()
+        try:
+            snapshot = session.get(ListingSnapshot, listing_url)
+            if snapshot is None:
+                snapshot = ListingSnapshot(listing_url=listing_url)
+                session.add(snapshot)
+            if snapshot.url_set_hash != url_set_hash:
+                snapshot.last_changed = datetime.now()
+            snapshot.paper_count = paper_count
+            snapshot.url_set_hash = url_set_hash
+            session.commit()
+            return True
+        except SQLAlchemyError as e:
+            session.rollback()
+            logger.error("Error recording listing %s: %s", listing_url, str(e))
+            return False
+        finally:
+            session.close()
+
+    def record_metrics(self, observations, observed_at=None) -> int:
+        """Append engagement observations to paper_metrics with a single COPY.
+
+        Local databases have no COPY and get one executemany INSERT instead.
+
+        Args:
+            observations: Iterable of (url, upvotes, comments) tuples
+            observed_at (datetime, optional): Observation time, now if not given
+
+        Returns:
+            int: Number of observations appended
+        """
+        observed_at = observed_at or datetime.now()
+        if not self.is_postgres:
+            return self._insert_metrics(observations, observed_at)
+        observed_at = observed_at.isoformat()
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        count = 0
+        for url, upvotes, comments in observations:
+            writer.writerow((url, observed_at, upvotes, comments))
+            count += 1
+        if not count:
+            return 0
+        buffer.seek(0)
+
+        logger.info("Appending %d metric observations", count)
+        connection = self.engine.raw_connection()
+        try:
+            with connection.cursor() as cursor:
+                cursor.copy_expert(
+                    "COPY paper_metrics (url, observed_at, upvotes, comments) "
+                    "FROM STDIN WITH (FORMAT csv)",
+                    buffer
+                )
+            connection.commit()
+            return count
+        except Exception as e:
+            connection.rollback()
+            logger.error("Error appending metric observations: %s", str(e))
+            # The raw driver connection raises driver errors, surface them like the ORM does
+            raise SQLAlchemyError(f"COPY into paper_metrics failed: {e}") from e
+        finally:
+            connection.close()
+
+    def _insert_metrics(self, observations, observed_at: datetime) -> int:
+        """Append engagement observations with a single executemany INSERT."""
+        rows = [
+            {"url": url, "observed_at": observed_at, "upvotes": upvotes, "comments": comments}
+            for url, upvotes, comments in observations
+        ]
+        if not rows:
+            return 0
+        logger.info("Appending %d metric observations", len(rows))
+        session = self.session_factory()
+        try:
+            session.execute(insert(PaperMetric), rows)
+            session.commit()
+            return len(rows)
+        except SQLAlchemyError as e:
+            session.rollback()
+            logger.error("Error appending metric observations: %s", str(e))
+            raise
+        finally:
+            session.close()
+
+    def upvote_velocity(
+        self, window_hours: float = 24, urls=None, limit=None
+    ) -> list[UpvoteVelocity]:
+        """Upvote velocity of papers over a recent window, computed from stored history.
+
+        Papers need at least two observations inside the window.
+
+        Args:
+            window_hours (float): How far back to look
+            urls (list[str], optional): Restrict the result to these papers
+            limit (int, optional): Return only the fastest growing papers
+
+        Returns:
+            list[UpvoteVelocity]: Velocity of each paper, fastest growing first
+        """
+        since = datetime.now() - timedelta(hours=window_hours)
+        if not self.is_postgres:
+            return self._local_upvote_velocity(since, urls, limit)
+        query = (
+            "SELECT url, first_observed_at, last_observed_at, upvote_delta, "
+            "upvote_delta / NULLIF(EXTRACT(EPOCH FROM last_observed_at - first_observed_at) "
+            "/ 3600.0, 0) AS upvotes_per_hour "
+            "FROM ("
+            "  SELECT url, MIN(observed_at) AS first_observed_at, "
+            "  MAX(observed_at) AS last_observed_at, "
+            "  (ARRAY_AGG(upvotes ORDER BY observed_at DESC))[1] "
+            "  - (ARRAY_AGG(upvotes ORDER BY observed_at))[1] AS upvote_delta "
+            "  FROM paper_metrics WHERE observed_at >= :since"
+            + (" AND url = ANY(:urls)" if urls is not None else "")
+            + "  GROUP BY url HAVING COUNT(*) > 1"
+            ") AS windowed "
+            "ORDER BY upvotes_per_hour DESC NULLS LAST"
+            + (" LIMIT :limit" if limit is not None else "")
+        )
+        params = {"since": since, "urls": list(urls or []), "limit": limit}
+        session = self.session_factory()
+        try:
+            rows = session.execute(text(query), params).all()
+            return [UpvoteVelocity.from_row(row) for row in rows]
+        except SQLAlchemyError as e:
+            logger.error("Error computing upvote velocity: %s", str(e))
+            raise
+        finally:
+            session.close()
+
+    def _local_upvote_velocity(self, since: datetime, urls, limit) -> list[UpvoteVelocity]:
+        """upvote_velocity for local databases, which have no ARRAY_AGG or EXTRACT(EPOCH)."""
+        stmt = select(PaperMetric.url, PaperMetric.observed_at, PaperMetric.upvotes).where(
+            PaperMetric.observed_at >= since
+        )
+        if urls is not None:
+            stmt = stmt.where(PaperMetric.url.in_(list(urls)))
+        session = self.session_factory()
+        try:
+            rows = session.execute(stmt.order_by(PaperMetric.url, PaperMetric.observed_at)).all()
+        except SQLAlchemyError as e:
+            logger.error("Error computing upvote velocity: %s", str(e))
+            raise
+        finally:
+            session.close()
+
+        history = {}
+        for row in rows:
+            history.setdefault(row.url, []).append(row)
+        velocities = []
+        for url, observations in history.items():
+            if len(observations) < 2:
+                continue
+            first, last = observations[0], observations[-1]
+            hours = (last.observed_at - first.observed_at).total_seconds() / 3600.0
+            delta = last.upvotes - first.upvotes
+            velocities.append(UpvoteVelocity(
+                url, first.observed_at, last.observed_at, delta, delta / hours if hours else None
+            ))
+        # Fastest growing first, papers without elapsed time last
+        velocities.sort(key=lambda v: (v.upvotes_per_hour is None, -(v.upvotes_per_hour or 0)))
+        return velocities if limit is None else velocities[:limit]
+
+    def claim_failed_extractions(
+        self,
+        worker_id: str,
+        limit: int = 10,
+        lease_seconds: int = 600,
+        max_retries: int = MAX_RETRIES
+    ) -> list[str]:
+        """Lease failed extractions that are due for a retry to a worker.
+
+        Rows are claimed with FOR UPDATE SKIP LOCKED, so concurrent workers never claim
+        the same paper (local databases get the same guarantee from SQLite allowing only
+        one writer at a time), and a lease that expires (e.g. because its worker died) makes the
+        paper claimable again.
+
+        Args:
+            worker_id (str): Unique identifier of the claiming worker
+            limit (int): Maximum number of papers to claim
+            lease_seconds (int): How long the claim is valid
+            max_retries (int): Papers that failed this many retries are not claimed
+
+        Returns:
+            list[str]: URLs of the claimed papers
+        """
+        now = datetime.now()
+        session = self.session_factory()
+        try:
+            urls = session.execute(text(
+                "UPDATE papers SET lease_owner = :worker_id, lease_expires_at = :expires_at "
+                "WHERE url IN ("
+                "  SELECT url FROM papers"
+                "  WHERE extraction_success = false AND retry_count < :max_retries"
+                "  AND (next_retry_at IS NULL OR next_retry_at <= :now)"
+                "  AND (lease_expires_at IS NULL OR lease_expires_at <= :now)"
+                "  ORDER BY COALESCE(next_retry_at, last_extraction_attempt)"
+                "  LIMIT :limit" + (" FOR UPDATE SKIP LOCKED" if self.is_postgres else "") +
+                ") RETURNING url"
+            ).bindparams(
+                # Typed, so local databases store and compare them in their own format
+                bindparam("expires_at", type_=DateTime), bindparam("now", type_=DateTime)
+            ), {
+                "worker_id": worker_id,
+                "expires_at": now + timedelta(seconds=lease_seconds),
+                "max_retries": max_retries,
+                "now": now,
+                "limit": limit
+            }).scalars().all()
+            session.commit()
+            logger.info("Worker %s claimed %d failed extractions", worker_id, len(urls))
+            return urls
+        except SQLAlchemyError as e:
+            session.rollback()
+            logger.error("Error claiming failed extractions: %s", str(e))
+            raise
+        finally:
+            session.close()
+
+    def record_retry_failure(self, url: str, worker_id: Optional[str], error: str) -> bool:
+        """Schedule the next retry of a failed paper with exponential backoff.
+
+        Every failed extraction goes through here, so that retry_count counts the attempts
+        towards MAX_RETRIES. Papers leased to worker_id, or not leased at all (as in the
+        tracker, which passes no worker_id), are updated and their lease is released. Does
+        nothing if the lease has meanwhile passed to another worker. Returns True if the
+        paper was updated.
+        """
+        now = datetime.now()
+        session = self.session_factory()
+        try:
+            if not self.is_postgres:
+                return self._local_record_retry_failure(session, url, worker_id, error, now)
+            result = session.execute(text(
+                "UPDATE papers SET retry_count = retry_count + 1, "
+                "next_retry_at = :now + make_interval(secs => "
+                "LEAST(:base * power(2, retry_count), :max_backoff)), "
+                "extraction_error = :error, last_extraction_attempt = :now, "
+                "lease_owner = NULL, lease_expires_at = NULL "
+                "WHERE url = :url AND (lease_owner IS NULL OR lease_expires_at <= :now "
+                "OR lease_owner = :worker_id)"
+            ), {
+                "now": now,
+                "base": RETRY_BACKOFF_BASE_SECONDS,
+                "max_backoff": RETRY_BACKOFF_MAX_SECONDS,
+                "error": error,
+                "url": url,
+                "worker_id": worker_id
+            })
+            session.commit()
+            if result.rowcount == 0:
+                logger.warning("Lease on %s no longer held by %s", url, worker_id)
+            return result.rowcount > 0
+        except SQLAlchemyError as e:
+            session.rollback()
+            logger.error("Error recording retry failure for %s: %s", url, str(e))
+            return False
+        finally:
+            session.close()
+
+    def _local_record_retry_failure(
+        self, session, url: str, worker_id: str, error: str, now: datetime
+    ) -> bool:
+        """record_retry_failure for local databases, which have no interval arithmetic.
+
+        SQLite allows one writer at a time, so the read and the update cannot interleave
+        with another worker's.
+        """
+        retry_count = session.execute(select(Paper.retry_count).where(
+            Paper.url == url,
+            or_(
+                Paper.lease_owner.is_(None),
+                Paper.lease_expires_at <= now,
+                Paper.lease_owner == worker_id
+            )
+        )).scalar()
+        if retry_count is None:
+            logger.warning("Lease on %s no longer held by %s", url, worker_id)
+            return False
+        session.execute(update(Paper).where(Paper.url == url).values(
+            retry_count=retry_count + 1,
+            next_retry_at=now + timedelta(seconds=retry_backoff_seconds(retry_count)),
+            extraction_error=error,
+            last_extraction_attempt=now,
+            lease_owner=None,
+            lease_expires_at=None
+        ))
+        session.commit()
+        return True
+
+    def get_classification(self, cache_key: str):
+        """Return the cached (belongs_to_category, confidence) under a key, or None."""
+        session = self.session_factory()
+        try:
+            cached = session.get(PaperClassification, cache_key)
+            return (cached.belongs_to_category, cached.confidence) if cached else None
+        except SQLAlchemyError as e:
+            logger.error("Error reading cached classification: %s", str(e))
+            return None
+        finally:
+            session.close()
+
+    def save_classification(
+        self,
+        cache_key: str,
+        category_hash: str,
+        model: str,
+        title: str,
+        belongs: bool,
+        confidence: float
+    ) -> bool:
+        """Store a classification result. Returns True if successful."""
+        session = self.session_factory()
+        try:
+            session.merge(PaperClassification(
+                cache_key=cache_key,
+                category_hash=category_hash,
+                model=model,
+                title=title,
+                belongs_to_category=belongs,
+                confidence=confidence,
+                created_at=datetime.now()
+            ))
+            session.commit()
+            return True
+        except SQLAlchemyError as e:
+            session.rollback()
+            logger.error("Error caching classification of %s: %s", title, str(e))
+            return False
+        finally:
+            session.close()
+
+    def get_cached_classification_keys(self, cache_keys: list[str]) -> set[str]:
+        """Return which of the given cache keys have a stored classification."""
+        if not cache_keys:
+            return set()
+        session = self.session_factory()
+        try:
+            return set(session.execute(
+                select(PaperClassification.cache_key).where(
+                    PaperClassification.cache_key.in_(cache_keys)
+                )
+            ).scalars())
+        except SQLAlchemyError as e:
+            logger.error("Error looking up cached classifications: %s", str(e))
+            raise
+        finally:
+            session.close()
+
+    def save_classification_batch(
+        self, batch_id: str, model: str, category_hash: str, requests: dict
+    ) -> None:
+        """Record a submitted Batch API classification job until its results are collected."""
+        session = self.session_factory()
+        try:
+            session.add(ClassificationBatch(
+                batch_id=batch_id,
+                model=model,
+                category_hash=category_hash,
+                requests=json.dumps(requests)
+            ))
+            session.commit()
+        except SQLAlchemyError as e:
+            session.rollback()
+            logger.error("Error recording classification batch %s: %s", batch_id, str(e))
+            raise
+        finally:
+            session.close()
+
+    def get_pending_classification_batches(self) -> list[tuple[str, str, str, dict]]:
+        """Return (batch_id, model, category_hash, requests) of uncollected jobs."""
+        session = self.session_factory()
+        try:
+            batches = session.execute(
+                select(ClassificationBatch).where(ClassificationBatch.collected_at.is_(None))
+                .order_by(ClassificationBatch.submitted_at)
+            ).scalars().all()
+            return [
+                (batch.batch_id, batch.model, batch.category_hash, json.loads(batch.requests))
+                for batch in batches
+            ]
+        except SQLAlchemyError as e:
+            logger.error("Error fetching pending classification batches: %s", str(e))
+            raise
+        finally:
+            session.close()
+
+    def finish_classification_batch(self, batch_id: str, status: str) -> bool:
+        """Mark a classification job as collected with its final status."""
+        session = self.session_factory()
+        try:
+            batch = session.get(ClassificationBatch, batch_id)
+            if batch is None:
+                logger.error("Classification batch not found: %s", batch_id)
+                return False
+            batch.status = status
+            batch.collected_at = datetime.now()
+            session.commit()
+            return True
+        except SQLAlchemyError as e:
+            session.rollback()
+            logger.error("Error finishing classification batch %s: %s", batch_id, str(e))
+            return False
+        finally:
+            session.close()
+
+    def get_papers_submitted_between(self, start: datetime, end: datetime, columns=None):
+        """Get successfully extracted papers submitted in [start, end), via ix_papers_submission_date.
+
+        Returns:
+            list: Rows of the given columns, all columns if not given
+        """
+        selected = [Paper.__table__.c[name] for name in columns] if columns else [Paper.__table__]
+        session = self.session_factory()
+        try:
+            return session.execute(select(*selected).where(
+                Paper.submission_date >= start,
+                Paper.submission_date < end,
+                Paper.extraction_success == True
+            ).order_by(Paper.submission_date, Paper.url)).all()
+        except SQLAlchemyError as e:
+            logger.error("Error fetching papers submitted since %s: %s", start, str(e))
+            raise
+        finally:
+            session.close()
+
+    def get_papers(self, urls: list[str]) -> list[Paper]:
+        """Get the stored papers with the given URLs."""
+        if not urls:
+            return []
+        session = self.session_factory()
+        try:
+            return session.query(Paper).filter(Paper.url.in_(list(dict.fromkeys(urls)))).all()
+        except SQLAlchemyError as e:
+            logger.error("Error fetching %d papers: %s", len(urls), str(e))
+            raise
+        finally:
+            session.close()
+
+    def get_changed_papers(self, after, until: datetime, limit: int, columns=None):
+        """Get the next batch of papers changed since an export watermark.
+
+        Pages through papers in (last_updated, url) order with a keyset condition served by
+        ix_papers_last_updated, so every batch costs the same however far the export is.
+
+        Args:
+            after (Optional[ExportWatermark]): Watermark of the previous batch, None to start
+                from the beginning
+            until (datetime): Only papers last updated before this time are returned
+            limit (int): Maximum number of papers in the batch
+            columns: Column names to select, all columns if not given
+
+        Returns:
+            list: Rows of the selected columns plus last_updated and url, oldest change first
+        """
+        names = list(dict.fromkeys([*(columns or Paper.__table__.c.keys()), "last_updated", "url"]))
+        stmt = select(*(Paper.__table__.c[name] for name in names)).where(
+            Paper.last_updated < until
+        )
+        if after is not None:
+            stmt = stmt.where(
+                tuple_(Paper.last_updated, Paper.url) > tuple_(
+                    literal(after.last_updated, DateTime), literal(after.url, String)
+                )
+            )
+        stmt = stmt.order_by(Paper.last_updated, Paper.url).limit(limit)
+        session = self.session_factory()
+        try:
+            return session.execute(stmt).all()
+        except SQLAlchemyError as e:
+            logger.error("Error fetching changed papers: %s", str(e))
+            raise
+        finally:
+            session.close()
+
+    def get_export_checkpoint(self, sink_name: str):
+        """Return the watermark a sink has been exported up to, or None if it never was."""
+        session = self.session_factory()
+        try:
+            checkpoint = session.get(ExportCheckpoint, sink_name)
+            if checkpoint is None:
+                return None
+            return ExportWatermark(checkpoint.last_updated, checkpoint.last_url)
+        except SQLAlchemyError as e:
+            logger.error("Error reading export checkpoint of %s: %s", sink_name, str(e))
+            raise
+        finally:
+            session.close()
+
+    def save_export_checkpoint(
+        self, sink_name: str, watermark: ExportWatermark, exported: int
+    ) -> None:
+        """Advance the watermark of a sink after it received a batch of exported papers."""
+        session = self.session_factory()
+        try:
+            checkpoint = session.get(ExportCheckpoint, sink_name)
+            if checkpoint is None:
+                checkpoint = ExportCheckpoint(sink_name=sink_name, exported_count=0)
+                session.add(checkpoint)
+            checkpoint.last_updated = watermark.last_updated
+            checkpoint.last_url = watermark.url
+            checkpoint.exported_count += exported
+            session.commit()
+        except SQLAlchemyError as e:
+            session.rollback()
+            logger.error("Error saving export checkpoint of %s: %s", sink_name, str(e))
+            raise
+        finally:
+            session.close()
+
+    def iter_papers(self, columns=None, batch_size: int = DEFAULT_STREAM_BATCH_SIZE):
+        """Stream papers as lightweight rows of the given columns.
+
+        Rows are fetched from a server-side cursor batch_size at a time, so memory stays
+        flat however large the table grows. Use this for exports instead of get_all_papers.
+
+        Args:
+            columns: Column names to select, all columns if not given
+            batch_size (int): Number of rows fetched per round-trip
+
+        Yields:
+            Row: Named tuples of the selected columns, ordered by URL
+        """
+        selected = [Paper.__table__.c[name] for name in columns] if columns else [Paper.__table__]
+        yield from self._stream(select(*selected).order_by(Paper.url), batch_size)
+
+    def iter_failed_extractions(
+        self, min_age_hours: int = 1, batch_size: int = DEFAULT_STREAM_BATCH_SIZE
+    ):
+        """Stream (url, last_extraction_attempt) of failed extractions due for a retry.
+
+        Served by the partial ix_papers_failed_by_attempt index without reading the table.
+        """
+        retry_cutoff = datetime.now() - timedelta(hours=min_age_hours)
+        stmt = select(Paper.url, Paper.last_extraction_attempt).where(
+            Paper.extraction_success == False,
+            Paper.last_extraction_attempt < retry_cutoff
+        ).order_by(Paper.last_extraction_attempt)
+        yield from self._stream(stmt, batch_size)
+
+    def _stream(self, stmt, batch_size: int):
+        """Yield the rows of a select statement from a server-side cursor."""
+        with self.engine.connect() as connection:
+            result = connection.execution_options(yield_per=batch_size).execute(stmt)
+            yield from result
+
     def get_failed_extractions(self, min_age_hours: int = 1):
-        """Get papers that failed extraction and haven't been retried recently."""
+        """Get papers that failed extraction and haven't been retried recently.
+
+        Returns:
+            list: (url, last_extraction_attempt) rows of the papers eligible for retry
+        """
         logger.info("Fetching failed extractions older than %d hours", min_age_hours)
-        session = self.session_factory()
         try:
-            retry_cutoff = datetime.now() - timedelta(hours=min_age_hours)
-            papers = session.query(Paper).filter(
-                Paper.extraction_success == False,
-                Paper.last_extraction_attempt < retry_cutoff
-            ).all()
+            papers = list(self.iter_failed_extractions(min_age_hours))
             logger.info("Found %d failed extractions eligible for retry", len(papers))
             return papers
         except SQLAlchemyError as e:
             logger.error("Error fetching failed extractions: %s", str(e))
             return []
-        finally:
-            session.close()
+
+
+class AsyncDatabase:
+    """Async variant of Database for use from the extraction pipeline.
+
+    Every method of Database is available as a coroutine with the same signature. The
+    calls run on a dedicated thread pool sized to the engine's connection pool (pool_size
+    plus max_overflow, so 1 for in-memory SQLite), so a database round-trip no longer
+    blocks the event loop and the scrapes in flight, and concurrent calls never queue up
+    for more connections than the pool holds. Engines without a pool limit, such as the
+    NullPool of the transaction pooler mode, get DEFAULT_MAX_WORKERS threads.
+
+    Callers that accept either variant check the is_async marker rather than the class,
+    which is imported both as supabase_db and under the package path.
+    """
+    DEFAULT_MAX_WORKERS = 5
+    is_async = True
+
+    def __init__(self, db, max_workers: Optional[int] = None):
+        self.db = db
+        if max_workers is None:
+            pool_metrics = getattr(db, "pool_metrics", None)
+            max_workers = (
+                pool_metrics and pool_metrics.connection_limit
+            ) or self.DEFAULT_MAX_WORKERS
+        self.max_workers = max_workers
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="database"
+        )
+
+    async def __aenter__(self) -> "AsyncDatabase":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        self.close()
+
+    async def _run(self, method: str, *args, **kwargs):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._executor, partial(getattr(self.db, method), *args, **kwargs)
+        )
+
+    def close(self) -> None:
+        """Shut down the thread pool once pending calls are done."""
+        self._executor.shutdown(wait=True)
+
+    async def ping(self) -> bool:
+        return await self._run("ping")
+
+    async def get_all_papers(self):
+        return await self._run("get_all_papers")
+
+    async def add_paper(self, paper_data) -> bool:
+        return await self._run("add_paper", paper_data)
+
+    async def add_papers(self, papers_data: list[dict]) -> dict[str, bool]:
+        return await self._run("add_papers", papers_data)
+
+    async def update_notification_status(self, url: str, status: bool) -> bool:
+        return await self._run("update_notification_status", url, status)
+
+    async def partition_urls(self, urls: list[str], min_age_hours: int = 1) -> UrlPartition:
+        return await self._run("partition_urls", urls, min_age_hours)
+
+    async def count_failed_extractions(self, urls: list[str]) -> int:
+        return await self._run("count_failed_extractions", urls)
+
+    async def update_paper_metrics(self, url: str, upvotes: int, comments: int) -> bool:
+        return await self._run("update_paper_metrics", url, upvotes, comments)
+
+    async def get_listing_fingerprint(self, listing_url: str):
+        return await self._run("get_listing_fingerprint", listing_url)
+
+    async def record_listing(self, listing_url: str, paper_count: int, url_set_hash: str) -> bool:
+        return await self._run("record_listing", listing_url, paper_count, url_set_hash)
+
+    async def record_metrics(self, observations, observed_at=None) -> int:
+        return await self._run("record_metrics", observations, observed_at)
+
+    async def upvote_velocity(self, window_hours: float = 24, urls=None, limit=None):
+        return await self._run("upvote_velocity", window_hours, urls, limit)
+
+    async def claim_failed_extractions(
+        self,
+        worker_id: str,
+        limit: int = 10,
+        lease_seconds: int = 600,
+        max_retries: int = MAX_RETRIES
+    ) -> list[str]:
+        return await self._run(
+            "claim_failed_extractions", worker_id, limit, lease_seconds, max_retries
+        )
+
+    async def record_retry_failure(self, url: str, worker_id: Optional[str], error: str) -> bool:
+        return await self._run("record_retry_failure", url, worker_id, error)
+
+    async def get_failed_extractions(self, min_age_hours: int = 1):
+        return await self._run("get_failed_extractions", min_age_hours)
+
+    async def get_classification(self, cache_key: str):
+        return await self._run("get_classification", cache_key)
+
+    async def save_classification(
+        self,
+        cache_key: str,
+        category_hash: str,
+        model: str,
+        title: str,
+        belongs: bool,
+        confidence: float
+    ) -> bool:
+        return await self._run(
+            "save_classification", cache_key, category_hash, model, title, belongs, confidence
+        )
+
+    async def get_cached_classification_keys(self, cache_keys: list[str]) -> set[str]:
+        return await self._run("get_cached_classification_keys", cache_keys)
+
+    async def save_classification_batch(
+        self, batch_id: str, model: str, category_hash: str, requests: dict
+    ) -> None:
+        return await self._run(
+            "save_classification_batch", batch_id, model, category_hash, requests
+        )
+
+    async def get_pending_classification_batches(self) -> list[tuple[str, str, str, dict]]:
+        return await self._run("get_pending_classification_batches")
+
+    async def finish_classification_batch(self, batch_id: str, status: str) -> bool:
+        return await self._run("finish_classification_batch", batch_id, status)
+
+    async def get_papers_submitted_between(self, start: datetime, end: datetime, columns=None):
+        return await self._run("get_papers_submitted_between", start, end, columns)
+
+    async def get_papers(self, urls: list[str]) -> list[Paper]:
+        return await self._run("get_papers", urls)
+
+    async def get_changed_papers(self, after, until: datetime, limit: int, columns=None):
+        return await self._run("get_changed_papers", after, until, limit, columns)
+
+    async def get_export_checkpoint(self, sink_name: str):
+        return await self._run("get_export_checkpoint", sink_name)
+
+    async def save_export_checkpoint(
+        self, sink_name: str, watermark: ExportWatermark, exported: int
+    ) -> None:
+        return await self._run("save_export_checkpoint", sink_name, watermark, exported)
 
 
 if __name__ == "__main__":
@@ -289,6 +1439,5 @@ if __name__ == "__main__":
     except (SQLAlchemyError, ValueError) as e:
         logger.error("Test failed! ❌ Error: %s", str(e))
 
-# TODO: stream the DB contents to a Notion database a la Chief AI Officer database
 # TODO: make db entries nullable. this will require db migrations.
 # TODO: add a column storing wether a post on x has been made for a paper
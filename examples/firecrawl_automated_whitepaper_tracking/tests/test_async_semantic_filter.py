@@ -0,0 +1,100 @@
+__doc__ = """Module for testing the async semantic filter."""
+
+import asyncio
+import json
+import os
+import sys
+from types import SimpleNamespace
+
+# Add the project root to the Python path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "../../../"))
+sys.path.insert(0, project_root)
+
+from examples.firecrawl_automated_whitepaper_tracking.semantic_filter import (
+    AsyncSemanticFilter,
+    TokenUsage,
+    classification_messages,
+)
+
+# Abstract close enough to the category definition to pass the prefilter
+AGENT_ABSTRACT = "LLM agents that plan, use tools and act autonomously in open-ended tasks."
+
+
+class FakeAsyncClient:
+    """Stands in for the chat completions endpoint of AsyncOpenAI."""
+
+    def __init__(self, confidence):
+        self.chat = SimpleNamespace(completions=self)
+        self.confidence = confidence
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.calls = 0
+        self.closed = False
+
+    async def create(self, **kwargs):
+        self.calls += 1
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(0.01)
+        self.in_flight -= 1
+        content = json.dumps({"belongs_to_category": True, "confidence": self.confidence})
+        return SimpleNamespace(
+            choices=[SimpleNamespace(message=SimpleNamespace(content=content))],
+            usage=SimpleNamespace(
+                prompt_tokens=1200, completion_tokens=15,
+                prompt_tokens_details=SimpleNamespace(cached_tokens=1024)
+            )
+        )
+
+    async def close(self):
+        self.closed = True
+
+
+def test_requests_are_bounded_and_cached():
+    """At most max_concurrency requests are in flight, and repeats are cache hits."""
+    openai_client = FakeAsyncClient(confidence=0.9)
+
+    async def classify():
+        async with AsyncSemanticFilter(max_concurrency=2, openai_client=openai_client) as classifier:
+            papers = [
+                {"paper_title": f"Async filter {i}", "abstract_body": AGENT_ABSTRACT}
+                for i in range(6)
+            ]
+            first = await asyncio.gather(*(classifier.should_process(p, True) for p in papers))
+            second = await asyncio.gather(*(classifier.should_process(p, True) for p in papers))
+            updated = await classifier.should_process(papers[0], False)
+        return first, second, updated
+
+    first, second, updated = asyncio.run(classify())
+    assert first == second == [(True, 0.9)] * 6
+    assert updated == (False, 0.0)
+    assert openai_client.calls == 6 and openai_client.max_in_flight == 2
+    # An injected client belongs to the caller
+    assert not openai_client.closed
+
+
+def test_low_confidence_papers_are_not_processed():
+    """Papers below the confidence threshold are classified but not processed."""
+    classifier = AsyncSemanticFilter(openai_client=FakeAsyncClient(confidence=0.5))
+    paper = {"paper_title": "Async filter low confidence", "abstract_body": AGENT_ABSTRACT}
+    assert asyncio.run(classifier.should_process(paper, True)) == (False, 0.5)
+
+
+def test_prompts_share_a_prefix_and_usage_is_accounted():
+    """Only the user message differs between papers, and cached tokens are billed less."""
+    first = classification_messages("Title A", "Abstract A", "AI Agents")
+    second = classification_messages("Title B", "Abstract B", "AI Agents")
+    assert first[0] == second[0] and "AI Agents" in first[0]["content"]
+    assert "AI Agents" not in first[1]["content"]
+
+    usage = TokenUsage()
+    usage.record(SimpleNamespace(
+        prompt_tokens=2000, completion_tokens=20,
+        prompt_tokens_details=SimpleNamespace(cached_tokens=1500)
+    ))
+    usage.record(SimpleNamespace(
+        prompt_tokens=2000, completion_tokens=20, prompt_tokens_details=None
+    ), papers=3)
+    assert (usage.requests, usage.papers, usage.cached_tokens) == (2, 4, 1500)
+    assert usage.cache_hit_rate == 0.375
+    assert usage.cost_per_paper < usage.cost
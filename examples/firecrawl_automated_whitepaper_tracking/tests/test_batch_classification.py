@@ -0,0 +1,114 @@
+__doc__ = """Module for testing multi-paper and Batch API classification."""
+
+import json
+import os
+import sys
+from types import SimpleNamespace
+
+# Add the project root to the Python path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "../../../"))
+sys.path.insert(0, project_root)
+
+from examples.firecrawl_automated_whitepaper_tracking.classification_batch import (
+    collect_classification_batches,
+    submit_classification_batch,
+)
+from examples.firecrawl_automated_whitepaper_tracking.classification_cache import (
+    ClassificationCache,
+)
+from examples.firecrawl_automated_whitepaper_tracking.semantic_filter import (
+    CLASSIFIER_MODEL,
+    parse_batch_classifications,
+)
+from examples.firecrawl_automated_whitepaper_tracking.supabase_db import Database
+
+
+class FakeBatchClient:
+    """Stands in for the files and batches endpoints of the OpenAI client."""
+
+    def __init__(self):
+        self.files = self
+        self.batches = self
+        self.lines = []
+        self.status = "in_progress"
+
+    def create(self, file=None, purpose=None, input_file_id=None, **kwargs):
+        if file is not None:
+            self.lines = [json.loads(line) for line in file[1].decode().splitlines()]
+            return SimpleNamespace(id="file-in")
+        return SimpleNamespace(id="batch-1")
+
+    def retrieve(self, batch_id):
+        return SimpleNamespace(status=self.status, output_file_id="file-out")
+
+    def content(self, file_id):
+        # Every paper of every request belongs to the category
+        results = []
+        for line in self.lines:
+            paper_count = line["body"]["messages"][1]["content"].count("paper_title:")
+            content = json.dumps({"classifications": [
+                {"id": i, "belongs_to_category": True, "confidence": 0.9}
+                for i in range(paper_count)
+            ]})
+            results.append(json.dumps({
+                "custom_id": line["custom_id"],
+                "response": {"status_code": 200, "body": {
+                    "choices": [{"message": {"content": content}}]
+                }},
+            }))
+        return SimpleNamespace(text="\n".join(results))
+
+
+def test_invalid_entries_are_dropped_individually():
+    """One bad entry does not discard the valid results of the other papers."""
+    content = json.dumps({"classifications": [
+        {"id": 0, "belongs_to_category": True, "confidence": 0.9},
+        {"id": 1, "belongs_to_category": "maybe", "confidence": 0.5},
+        {"id": 7, "belongs_to_category": False, "confidence": 0.1},
+        {"belongs_to_category": False, "confidence": 0.1},
+        {"id": 2, "belongs_to_category": False, "confidence": 0.2},
+    ]})
+    results = parse_batch_classifications(content, 3)
+    assert sorted(results) == [0, 2]
+    assert results[2].confidence == 0.2
+    assert parse_batch_classifications("not json", 3) == {}
+
+
+def test_batch_results_are_collected_into_the_cache():
+    """A submitted job only holds uncached papers, and its results become cache hits."""
+    db = Database("sqlite://")
+    papers = [(f"Title {i}", f"Abstract {i}") for i in range(5)]
+    ClassificationCache(db).put("Title 0", "Abstract 0", "Agents", CLASSIFIER_MODEL, False, 0.1)
+
+    openai_client = FakeBatchClient()
+    assert submit_classification_batch(db, papers, "Agents", 3, openai_client) == "batch-1"
+    assert [len(requests) for _, _, _, requests in db.get_pending_classification_batches()] == [2]
+    assert collect_classification_batches(db, openai_client).stored == 0
+
+    openai_client.status = "completed"
+    assert collect_classification_batches(db, openai_client) == (4, [], [])
+    assert db.get_pending_classification_batches() == []
+    cache = ClassificationCache(db)
+    assert cache.get("Title 4", "Abstract 4", "Agents", CLASSIFIER_MODEL) == (True, 0.9)
+    assert cache.get("Title 0", "Abstract 0", "Agents", CLASSIFIER_MODEL) == (False, 0.1)
+    assert submit_classification_batch(db, papers, "Agents", 3, openai_client) is None
+    db.engine.dispose()
+
+
+
+def test_tracker_papers_are_reported_for_notification():
+    """Relevant papers submitted with a URL are returned, failed ones as unclassified."""
+    db = Database("sqlite://")
+    papers = [(f"Title {i}", f"Abstract {i}", f"https://hf.co/papers/{i}") for i in range(3)]
+    openai_client = FakeBatchClient()
+    submit_classification_batch(db, papers, "Agents", 2, openai_client)
+    openai_client.status = "completed"
+    content = openai_client.content
+    # The request holding the last paper fails
+    openai_client.content = lambda file_id: SimpleNamespace(
+        text=content(file_id).text.splitlines()[0]
+    )
+    assert collect_classification_batches(db, openai_client) == (
+        2, ["https://hf.co/papers/0", "https://hf.co/papers/1"], ["https://hf.co/papers/2"]
+    )
+    db.engine.dispose()
@@ -0,0 +1,38 @@
+__doc__ = """Module for testing the classification cache."""
+
+import os
+import sys
+
+# Add the project root to the Python path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "../../../"))
+sys.path.insert(0, project_root)
+
+from examples.firecrawl_automated_whitepaper_tracking.classification_cache import (
+    ClassificationCache,
+)
+from examples.firecrawl_automated_whitepaper_tracking.supabase_db import Database
+
+
+def test_results_survive_the_process_and_expire_with_the_category():
+    """A new cache finds results in the database, but not for an edited category."""
+    db = Database("sqlite://")
+    ClassificationCache(db).put("Title", "Abstract", "AI Agents", "gpt-4o-mini", True, 0.9)
+
+    cache = ClassificationCache(db)
+    assert cache.get("Title", "Abstract", "AI Agents", "gpt-4o-mini") == (True, 0.9)
+    assert cache.get("Title", "Abstract", "AI Agents", "gpt-4o-mini") == (True, 0.9)
+    assert cache.get("Title", "Abstract", "AI Agents v2", "gpt-4o-mini") is None
+    assert cache.get("Title", "Abstract", "AI Agents", "gpt-4o") is None
+    assert (cache.memory_hits, cache.db_hits, cache.misses) == (1, 1, 2)
+    db.engine.dispose()
+
+
+def test_lru_evicts_the_least_recently_used_entry():
+    """Without a database only the most recently used results are kept."""
+    cache = ClassificationCache(max_size=2)
+    cache.put("a", "", "c", "m", True, 1.0)
+    cache.put("b", "", "c", "m", False, 0.1)
+    cache.get("a", "", "c", "m")
+    cache.put("c", "", "c", "m", True, 0.5)
+    assert cache.get("b", "", "c", "m") is None
+    assert cache.get("a", "", "c", "m") == (True, 1.0)
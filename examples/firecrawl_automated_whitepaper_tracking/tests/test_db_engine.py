@@ -0,0 +1,63 @@
+__doc__ = """Module for testing the pooler-aware engine factory."""
+
+import os
+import sys
+
+from sqlalchemy import text
+
+# Add the project root to the Python path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "../../../"))
+sys.path.insert(0, project_root)
+
+from examples.firecrawl_automated_whitepaper_tracking.db_engine import (
+    DIRECT_MAX_OVERFLOW,
+    DIRECT_POOL_SIZE,
+    POOL_MODE_DIRECT,
+    POOL_MODE_LOCAL,
+    POOL_MODE_SESSION,
+    POOL_MODE_TRANSACTION,
+    create_database_engine,
+    detect_pool_mode,
+)
+from examples.firecrawl_automated_whitepaper_tracking.supabase_db import AsyncDatabase, Database
+
+
+def test_pool_mode_is_detected_from_the_connection_string():
+    """Port 6543 means the transaction pooler, other pooler ports the session pooler."""
+    pooler = "postgres.ref:pw@aws-0-eu-central-1.pooler.supabase.com"
+    assert detect_pool_mode(f"postgresql://{pooler}:6543/postgres") == POOL_MODE_TRANSACTION
+    assert detect_pool_mode(f"postgresql://{pooler}:5432/postgres") == POOL_MODE_SESSION
+    assert detect_pool_mode("postgresql://u:pw@db.ref.supabase.co:5432/postgres") == POOL_MODE_DIRECT
+    assert detect_pool_mode("sqlite://") == POOL_MODE_LOCAL
+
+
+def test_metrics_count_checkouts_per_mode(tmp_path):
+    """Pooled modes reuse connections, the transaction mode opens one per checkout."""
+    url = f"sqlite:///{tmp_path / 'papers.db'}"
+    for mode, expected_connects in ((POOL_MODE_DIRECT, 1), (POOL_MODE_TRANSACTION, 3)):
+        engine, metrics = create_database_engine(url, mode)
+        for _ in range(3):
+            with engine.connect() as connection:
+                connection.execute(text("SELECT 1"))
+        assert metrics.checkouts == metrics.checkins == 3
+        assert metrics.connects == expected_connects
+        assert metrics.peak_checked_out == 1
+        assert len(metrics.checkout_latencies) == 3
+        engine.dispose()
+
+
+def test_connection_limit_sizes_the_database_threads(tmp_path):
+    """AsyncDatabase gets one thread per connection the pool can open."""
+    url = f"sqlite:///{tmp_path / 'papers.db'}"
+    engine, metrics = create_database_engine(url, POOL_MODE_DIRECT)
+    assert metrics.connection_limit == DIRECT_POOL_SIZE + DIRECT_MAX_OVERFLOW
+    engine.dispose()
+    engine, metrics = create_database_engine(url, POOL_MODE_TRANSACTION)
+    assert metrics.connection_limit is None
+    engine.dispose()
+
+    db = Database("sqlite://")
+    async_db = AsyncDatabase(db)
+    assert async_db.max_workers == 1
+    async_db.close()
+    db.engine.dispose()
@@ -0,0 +1,124 @@
+__doc__ = """Module for testing discovery and extraction against recorded responses."""
+
+import asyncio
+import os
+import sys
+
+import pytest
+
+# Add the project root to the Python path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "../../../"))
+sys.path.insert(0, project_root)
+
+# firecrawl_crawl_extract requires these at import time; no test reaches a real service
+os.environ.setdefault("POSTGRES_URL", "sqlite://")
+os.environ.setdefault("FIRECRAWL_API_KEY", "fc-test")
+os.environ.setdefault("FIRECRAWL_CACHE_MODE", "off")
+
+from examples.firecrawl_automated_whitepaper_tracking import firecrawl_crawl_extract
+from examples.firecrawl_automated_whitepaper_tracking.tests.test_hf_paper_parser import PAGE, URL
+
+LISTING_URL = "https://huggingface.co/papers?date=2024-12-19"
+PAPER_URLS = ["https://huggingface.co/papers/2412.14161", "https://huggingface.co/papers/2412.13501"]
+
+
+class RecordingClient:
+    """Answers discovery requests like Firecrawl and records them."""
+
+    def __init__(self):
+        self.requests = []
+
+    async def request_json(self, method, url, json_data=None, stats=None):
+        self.requests.append((method, url))
+        if url == "/v1/crawl":
+            return {"success": True, "id": "crawl-1"}
+        if url == "/v1/crawl/crawl-1":
+            return {"status": "completed", "total": 2, "data": [
+                {"metadata": {"sourceURL": url}} for url in PAPER_URLS
+            ]}
+        return {"success": True, "data": {"links": [f"{url}#community" for url in PAPER_URLS]}}
+
+
+class OfflineClient:
+    """Fails the test on any request."""
+
+    async def request_json(self, method, url, json_data=None, stats=None):
+        raise AssertionError(f"{method} {url} reached the network in replay mode")
+
+
+def discover(client, mode, target_url=LISTING_URL):
+    async def collect():
+        return [
+            url async for url in firecrawl_crawl_extract.iter_paper_urls(
+                target_url, mode, client=client
+            )
+        ]
+    return asyncio.run(collect())
+
+
+@pytest.mark.parametrize("mode", ["links", "crawl"])
+def test_replay_discovers_recorded_listings_offline(tmp_path, monkeypatch, mode):
+    """Recorded discovery responses are replayed without HTTP calls, and never served live."""
+    cache_class = firecrawl_crawl_extract.FirecrawlCache
+    monkeypatch.setattr(firecrawl_crawl_extract, "firecrawl_cache", cache_class(tmp_path))
+    client = RecordingClient()
+    assert discover(client, mode) == PAPER_URLS
+    # Listings change during the day, so recording runs always ask Firecrawl
+    assert discover(client, mode) == PAPER_URLS
+    assert len(client.requests) == 2 * len(set(client.requests))
+
+    monkeypatch.setattr(
+        firecrawl_crawl_extract, "firecrawl_cache", cache_class(tmp_path, mode="replay")
+    )
+    assert discover(OfflineClient(), mode) == PAPER_URLS
+    with pytest.raises(firecrawl_crawl_extract.CacheMissError):
+        discover(OfflineClient(), mode, "https://huggingface.co/papers?date=2024-12-20")
+
+
+class PageSession:
+    """Serves paper pages like aiohttp.ClientSession.get, counting the fetches."""
+
+    def __init__(self, page):
+        self.page = page
+        self.fetches = 0
+
+    def get(self, url):
+        self.fetches += 1
+        session = self
+
+        class Response:
+            async def __aenter__(self):
+                if session.page is None:
+                    raise AssertionError(f"{url} was fetched in replay mode")
+                return self
+
+            async def __aexit__(self, *exc_info):
+                return False
+
+            def raise_for_status(self):
+                pass
+
+            async def text(self):
+                return session.page
+
+        return Response()
+
+
+def test_replay_parses_recorded_paper_pages_offline(tmp_path, monkeypatch):
+    """Paper page HTML is recorded, so replayed extractions are parsed without the network."""
+    cache_class = firecrawl_crawl_extract.FirecrawlCache
+    monkeypatch.setattr(firecrawl_crawl_extract, "firecrawl_cache", cache_class(tmp_path))
+    session = PageSession(PAGE)
+    recorded = asyncio.run(
+        firecrawl_crawl_extract.extract_paper_details(URL, session, OfflineClient())
+    )
+    asyncio.run(firecrawl_crawl_extract.extract_paper_details(URL, session, OfflineClient()))
+    assert session.fetches == 1
+
+    monkeypatch.setattr(
+        firecrawl_crawl_extract, "firecrawl_cache", cache_class(tmp_path, mode="replay")
+    )
+    replayed = asyncio.run(
+        firecrawl_crawl_extract.extract_paper_details(URL, PageSession(None), OfflineClient())
+    )
+    assert replayed == recorded and replayed["number_of_upvotes"] == 42
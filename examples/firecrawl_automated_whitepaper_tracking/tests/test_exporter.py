@@ -0,0 +1,84 @@
+__doc__ = """Module for testing the incremental paper export."""
+
+import json
+import os
+import sys
+
+import pytest
+
+# Add the project root to the Python path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "../../../"))
+sys.path.insert(0, project_root)
+
+from examples.firecrawl_automated_whitepaper_tracking.exporter import (
+    ExportSink,
+    FileSink,
+    export_changes,
+)
+from examples.firecrawl_automated_whitepaper_tracking.supabase_db import Database
+from examples.firecrawl_automated_whitepaper_tracking.tests.test_supabase_db_local import paper
+
+
+class FailingSink(ExportSink):
+    """Accepts a number of batches, then fails like an interrupted export."""
+    name = "failing"
+
+    def __init__(self, accepted_batches):
+        self.accepted_batches = accepted_batches
+        self.urls = []
+
+    def write(self, rows):
+        if self.accepted_batches == 0:
+            raise ConnectionError("sink went away")
+        self.accepted_batches -= 1
+        self.urls.extend(row["url"] for row in rows)
+
+
+@pytest.fixture
+def db():
+    database = Database("sqlite://")
+    yield database
+    database.engine.dispose()
+
+
+def test_only_changed_papers_are_exported(db, tmp_path):
+    """A second export only emits the papers updated after the first one."""
+    db.add_papers([paper("a"), paper("b")])
+    sink = FileSink(tmp_path / "papers.jsonl")
+    assert export_changes(db, sink, safety_lag_seconds=0) == 2
+    assert export_changes(db, sink, safety_lag_seconds=0) == 0
+
+    db.update_paper_metrics("b", 10, 2)
+    assert export_changes(db, sink, safety_lag_seconds=0) == 1
+    records = [json.loads(line) for line in sink.path.read_text().splitlines()]
+    assert [r["url"] for r in records] == ["a", "b", "b"]
+    assert records[-1]["upvotes"] == 10 and records[-1]["authors"] == ["Jane Doe", "John Smith"]
+
+
+def test_interrupted_export_resumes_from_its_checkpoint(db):
+    """Batches accepted before a failure are not exported again."""
+    db.add_papers([paper(url) for url in "abcde"])
+    sink = FailingSink(accepted_batches=1)
+    with pytest.raises(ConnectionError):
+        export_changes(db, sink, batch_size=2, safety_lag_seconds=0)
+    sink.accepted_batches = 10
+    assert export_changes(db, sink, batch_size=2, safety_lag_seconds=0) == 3
+    assert sink.urls == list("abcde")
+
+
+def test_csv_sink_writes_one_header(tmp_path):
+    """Appending batches to a CSV file keeps a single header row."""
+    sink = FileSink(tmp_path / "papers.csv")
+    sink.write([{"url": "a", "authors": ["x"]}])
+    sink.write([{"url": "b", "authors": []}])
+    assert sink.path.read_text().splitlines() == ["url,authors", 'a,"[""x""]"', "b,[]"]
+
+
+def test_sinks_must_implement_write():
+    """A sink without write cannot be created."""
+
+    class IncompleteSink(ExportSink):
+        name = "incomplete"
+
+    with pytest.raises(TypeError):
+        IncompleteSink()
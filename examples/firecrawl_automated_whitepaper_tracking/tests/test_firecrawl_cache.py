@@ -0,0 +1,123 @@
+__doc__ = """Module for testing the Firecrawl response cache."""
+
+import asyncio
+import os
+import sys
+import time
+
+import pytest
+
+# Add the project root to the Python path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "../../../"))
+sys.path.insert(0, project_root)
+
+from examples.firecrawl_automated_whitepaper_tracking.firecrawl_cache import (
+    CacheMissError,
+    FirecrawlCache,
+    MODE_READ_WRITE,
+    MODE_REPLAY,
+    cache_key,
+)
+
+PARAMS = {'formats': ['extract'], 'extract': {'schema': {'title': 'ExtractSchema'}}}
+
+
+def test_cache_key_depends_on_url_schema_and_options():
+    """The key changes with the URL, the schema or the options, but not with key order."""
+    key = cache_key("https://huggingface.co/papers/1", PARAMS)
+    assert key == cache_key(
+        "https://huggingface.co/papers/1",
+        {'extract': {'schema': {'title': 'ExtractSchema'}}, 'formats': ['extract']}
+    )
+    assert key != cache_key("https://huggingface.co/papers/2", PARAMS)
+    assert key != cache_key(
+        "https://huggingface.co/papers/1",
+        {'formats': ['extract'], 'extract': {'schema': {'title': 'MetricsSchema'}}}
+    )
+    assert key != cache_key("https://huggingface.co/papers/1", {**PARAMS, 'timeout': 5})
+
+
+def test_fetch_records_and_replays(tmp_path):
+    """A recorded response is served without calling Firecrawl, also in replay mode."""
+    calls = []
+    cache = FirecrawlCache(tmp_path, mode=MODE_READ_WRITE)
+    fetch = lambda: calls.append(1) or {"extract": {"paper_title": "A"}}  # noqa: E731
+
+    assert cache.fetch("u", PARAMS, fetch) == {"extract": {"paper_title": "A"}}
+    assert cache.fetch("u", PARAMS, fetch) == {"extract": {"paper_title": "A"}}
+    assert len(calls) == 1
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    replay = FirecrawlCache(tmp_path, mode=MODE_REPLAY)
+    assert replay.fetch("u", PARAMS, fetch) == {"extract": {"paper_title": "A"}}
+    with pytest.raises(CacheMissError):
+        replay.fetch("other", PARAMS, fetch)
+    assert len(calls) == 1
+
+
+def test_expired_entries_are_refetched(tmp_path):
+    """Entries older than the TTL count as misses."""
+    cache = FirecrawlCache(tmp_path, ttl_seconds=60)
+    key = cache_key("u", PARAMS)
+    cache.put(key, {"n": 1})
+    assert cache.get(key) == {"n": 1}
+    assert cache.get(key, ttl_seconds=-1) is None
+
+
+def test_lru_eviction_keeps_recently_used_entries(tmp_path):
+    """Once over the size limit the least recently used entries are removed."""
+    cache = FirecrawlCache(tmp_path, max_bytes=10**6)
+    for name in ("a", "b", "c"):
+        cache.put(name, {"body": "x" * 100})
+    past = time.time() - 100
+    for name, age in (("a", 2), ("b", 1), ("c", 3)):
+        os.utime(tmp_path / f"{name}.json", (past + age, past + age))
+    # A new process orders the entries it finds on disk by modification time
+    cache = FirecrawlCache(tmp_path, max_bytes=10**6)
+    cache.get("a")  # touching "a" makes "b" the least recently used entry
+
+    entry_size = (tmp_path / "a.json").stat().st_size
+    cache.max_bytes = entry_size * 3
+    cache.put("d", {"body": "x" * 100})
+
+    assert not (tmp_path / "b.json").exists()
+    assert all((tmp_path / f"{name}.json").exists() for name in ("a", "c", "d"))
+
+
+def test_writes_do_not_rescan_the_cache_directory(tmp_path, monkeypatch):
+    """The directory is listed once, and the running size matches the files on disk."""
+    cache = FirecrawlCache(tmp_path)
+    cache.put("a", {"body": "x" * 100})
+    entry_size = (tmp_path / "a.json").stat().st_size
+    cache.max_bytes = entry_size * 2
+
+    def fail_glob(self, pattern):
+        raise AssertionError("cache directory listed again")
+
+    monkeypatch.setattr(type(tmp_path), "glob", fail_glob)
+    for name in ("b", "c", "d", "b"):
+        cache.put(name, {"body": "y" * 100})
+    on_disk = sorted(path.name for path in tmp_path.iterdir())
+    assert on_disk == ["b.json", "d.json"]
+    assert cache._total_bytes == sum(path.stat().st_size for path in tmp_path.iterdir())
+
+
+def test_batch_scrape_submits_only_uncached_urls(tmp_path):
+    """Cached URLs are served locally and only the rest go into the batch job."""
+    submitted = []
+
+    class Client:
+        async def batch_scrape_urls(self, urls, params):
+            submitted.append(urls)
+            return {url: {"extract": {"paper_title": url}} for url in urls if url != "missing"}
+
+    cache = FirecrawlCache(tmp_path)
+    cache.put(cache_key("a", PARAMS), {"extract": {"paper_title": "cached"}})
+
+    responses = asyncio.run(cache.abatch_scrape_urls(Client(), ["a", "b", "missing"], PARAMS))
+    assert submitted == [["b", "missing"]]
+    assert responses == {
+        "a": {"extract": {"paper_title": "cached"}},
+        "b": {"extract": {"paper_title": "b"}},
+    }
+    assert cache.get(cache_key("b", PARAMS)) == {"extract": {"paper_title": "b"}}
@@ -0,0 +1,86 @@
+__doc__ = """Module for testing the async Firecrawl client against a local server."""
+
+import asyncio
+import os
+import sys
+
+import aiohttp
+import pytest
+from aiohttp import web
+
+# Add the project root to the Python path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "../../../"))
+sys.path.insert(0, project_root)
+
+from examples.firecrawl_automated_whitepaper_tracking import firecrawl_client
+from examples.firecrawl_automated_whitepaper_tracking.firecrawl_client import (
+    AsyncFirecrawlClient,
+    FirecrawlAPIError,
+)
+
+
+async def run_against(routes, call):
+    """Serve the routes locally and run call(client) against them."""
+    app = web.Application()
+    app.add_routes(routes)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = runner.addresses[0][1]
+    try:
+        async with AsyncFirecrawlClient("test", f"http://127.0.0.1:{port}") as client:
+            return await call(client)
+    finally:
+        await runner.cleanup()
+
+
+def test_rate_limits_and_unavailable_responses_are_retried(monkeypatch):
+    """429, 503 and 504 responses are retried like 502, honouring Retry-After."""
+    monkeypatch.setattr(firecrawl_client, "BACKOFF_FACTOR", 0)
+    statuses = [429, 503]
+    delays = []
+    sleep = asyncio.sleep
+
+    async def record_sleep(delay):
+        delays.append(delay)
+        await sleep(0)
+
+    monkeypatch.setattr(firecrawl_client.asyncio, "sleep", record_sleep)
+
+    async def scrape(request):
+        if statuses:
+            return web.Response(status=statuses.pop(0), headers={"Retry-After": "0.25"})
+        return web.json_response({"success": True, "data": {"markdown": "ok"}})
+
+    async def unavailable(request):
+        return web.Response(status=504)
+
+    routes = [web.post("/v1/scrape", scrape), web.get("/v1/down", unavailable)]
+    data = asyncio.run(run_against(routes, lambda client: client.scrape_url("https://hf.co")))
+    assert data == {"markdown": "ok"}
+    # aiohttp itself also sleeps, for zero seconds
+    assert [delay for delay in delays if delay] == [0.25, 0.25]
+
+    with pytest.raises(aiohttp.ClientResponseError) as error:
+        asyncio.run(run_against(routes, lambda client: client.request_json("GET", "/v1/down")))
+    assert error.value.status == 504
+
+
+def test_batch_scrape_raises_once_the_timeout_passes():
+    """A job that keeps running past the timeout fails instead of being polled forever."""
+    polls = []
+
+    async def start(request):
+        return web.json_response({"success": True, "id": "job-1"})
+
+    async def status(request):
+        polls.append(1)
+        return web.json_response({"status": "scraping"})
+
+    routes = [web.post("/v1/batch/scrape", start), web.get("/v1/batch/scrape/job-1", status)]
+    with pytest.raises(FirecrawlAPIError, match="did not complete"):
+        asyncio.run(run_against(routes, lambda client: client.batch_scrape_urls(
+            ["https://hf.co/papers/1"], poll_interval=0.05, timeout=0.2
+        )))
+    assert 1 < len(polls) < 10
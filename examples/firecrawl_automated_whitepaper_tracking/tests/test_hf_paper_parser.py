@@ -0,0 +1,77 @@
+__doc__ = """Module for testing the local Hugging Face paper page parser."""
+
+import html
+import json
+import os
+import sys
+
+# Add the project root to the Python path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "../../../"))
+sys.path.insert(0, project_root)
+
+from examples.firecrawl_automated_whitepaper_tracking.hf_paper_parser import parse_paper_html
+
+URL = "https://huggingface.co/papers/2412.14161"
+
+PAPER_PROPS = {
+    "paper": {
+        "id": "2412.14161",
+        "title": "TheAgentCompany: Benchmarking LLM Agents on Consequential Real World Tasks",
+        "summary": "We interact with computers on an everyday basis...\n",
+        "authors": [{"name": "Frank F. Xu"}, {"name": "Yufan Song"}, {"_id": "no-name"}],
+        "publishedAt": "2024-12-18T18:55:40.000Z",
+        "submittedOnDailyAt": "2024-12-19T01:23:45.000Z",
+        "upvotes": 42,
+    },
+    "discussion": {"numComments": 3},
+}
+
+PAGE = f"""
+<html><head>
+<meta property="og:title" content="Paper page - TheAgentCompany">
+</head><body>
+<div class="SVELTE_HYDRATER contents" data-target="PaperContent"
+     data-props="{html.escape(json.dumps(PAPER_PROPS))}"></div>
+<h1>TheAgentCompany: Benchmarking LLM Agents on Consequential Real World Tasks</h1>
+<a href="https://arxiv.org/abs/2412.14161">View arXiv page</a>
+<a href="https://arxiv.org/pdf/2412.14161">View PDF</a>
+<a href="https://github.com/TheAgentCompany/TheAgentCompany">GitHub</a>
+<a href="https://github.com/huggingface">Hugging Face on GitHub</a>
+</body></html>
+"""
+
+
+def test_parses_all_fields_from_embedded_paper_record():
+    """A complete paper page fills every ExtractSchema field without an LLM."""
+    details = parse_paper_html(PAGE, URL)
+    assert details == {
+        "paper_title": "TheAgentCompany: Benchmarking LLM Agents on Consequential Real World Tasks",
+        "abstract_body": "We interact with computers on an everyday basis...",
+        "authors": "Frank F. Xu, Yufan Song",
+        "number_of_upvotes": 42,
+        "number_of_comments": 3,
+        "utc_publication_date_day": 18,
+        "utc_publication_date_month": 12,
+        "utc_publication_date_year": 2024,
+        "utc_submission_date_day": 19,
+        "utc_submission_date_month": 12,
+        "utc_submission_date_year": 2024,
+        "view_arxiv_page_url": "https://arxiv.org/abs/2412.14161",
+        "view_pdf_url": "https://arxiv.org/pdf/2412.14161",
+        "github_repo_url": "https://github.com/TheAgentCompany/TheAgentCompany",
+    }
+
+
+def test_missing_fields_are_left_out():
+    """Without the embedded record only the rendered parts are parsed."""
+    page = """
+    <h1> A Plain
+      Title </h1>
+    <a href="https://github.com/huggingface">Hugging Face on GitHub</a>
+    """
+    details = parse_paper_html(page, URL)
+    assert details == {
+        "paper_title": "A Plain Title",
+        "view_arxiv_page_url": "https://arxiv.org/abs/2412.14161",
+        "view_pdf_url": "https://arxiv.org/pdf/2412.14161",
+    }
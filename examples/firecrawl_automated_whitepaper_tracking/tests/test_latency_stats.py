@@ -0,0 +1,18 @@
+__doc__ = """Module for testing the shared summary statistics."""
+
+import os
+import sys
+
+# Add the project root to the Python path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "../../../"))
+sys.path.insert(0, project_root)
+
+from examples.firecrawl_automated_whitepaper_tracking.latency_stats import percentile
+
+
+def test_percentile_uses_nearest_rank():
+    """Percentiles pick an observed value."""
+    values = [float(v) for v in range(1, 21)]
+    assert percentile(values, 50) == 10.0
+    assert percentile(values, 95) == 19.0
+    assert percentile([], 95) == 0.0
@@ -0,0 +1,90 @@
+__doc__ = """Module for testing the staged asyncio pipeline."""
+
+import asyncio
+import os
+import sys
+
+import pytest
+
+# Add the project root to the Python path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "../../../"))
+sys.path.insert(0, project_root)
+
+from examples.firecrawl_automated_whitepaper_tracking.pipeline import Pipeline, Stage
+
+
+async def _source(items):
+    for item in items:
+        yield item
+
+
+def test_items_flow_through_all_stages():
+    """Every stage sees each forwarded item, and None drops an item."""
+    seen = []
+
+    async def double(item):
+        return item * 2
+
+    async def keep_even_halves(item):
+        return item if item % 4 == 0 else None
+
+    async def collect(item):
+        seen.append(item)
+
+    pipeline = Pipeline([
+        Stage("double", double, workers=2),
+        Stage("filter", keep_even_halves, workers=3),
+        Stage("collect", collect),
+    ])
+    asyncio.run(pipeline.run(_source(range(10))))
+
+    assert sorted(seen) == [0, 4, 8, 12, 16]
+    double_stats, filter_stats, collect_stats = pipeline.stats
+    assert (double_stats.processed, double_stats.forwarded) == (10, 10)
+    assert (filter_stats.forwarded, filter_stats.dropped) == (5, 5)
+    assert collect_stats.processed == 5
+
+
+def test_handler_failures_are_isolated():
+    """An exception drops only the failing item and is counted against its stage."""
+    seen = []
+
+    async def fail_on_three(item):
+        if item == 3:
+            raise ValueError("bad item")
+        return item
+
+    async def collect(item):
+        seen.append(item)
+
+    pipeline = Pipeline([Stage("check", fail_on_three), Stage("collect", collect)])
+    asyncio.run(pipeline.run(_source(range(5))))
+
+    assert sorted(seen) == [0, 1, 2, 4]
+    assert pipeline.stats[0].failed == 1
+
+
+def test_slow_stage_applies_backpressure():
+    """A slow stage never lets its input queue grow past the bound."""
+    async def fast(item):
+        return item
+
+    async def slow(item):
+        await asyncio.sleep(0.005)
+
+    pipeline = Pipeline([Stage("fast", fast, workers=4), Stage("slow", slow, queue_size=3)])
+    asyncio.run(pipeline.run(_source(range(30))))
+
+    slow_stats = pipeline.stats[1]
+    assert slow_stats.processed == 30
+    assert 0 < slow_stats.max_queue_depth <= 3
+    assert slow_stats.throughput > 0
+
+
+def test_stage_needs_a_worker():
+    """Stages without workers are rejected."""
+    async def handler(item):
+        return item
+
+    with pytest.raises(ValueError):
+        Stage("empty", handler, workers=0)
@@ -0,0 +1,65 @@
+__doc__ = """Module for testing the lexical prefilter."""
+
+import asyncio
+import os
+import sys
+
+# Add the project root to the Python path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "../../../"))
+sys.path.insert(0, project_root)
+
+from examples.firecrawl_automated_whitepaper_tracking.category_prompt import (
+    CATEGORY_EXEMPLARS,
+    DESIRED_CATEGORY,
+)
+from examples.firecrawl_automated_whitepaper_tracking.labelled_papers import LABELLED_PAPERS
+from examples.firecrawl_automated_whitepaper_tracking.prefilter import (
+    DEFAULT_PREFILTER_THRESHOLD,
+    LexicalPrefilter,
+    calibrate,
+)
+from examples.firecrawl_automated_whitepaper_tracking.semantic_filter import AsyncSemanticFilter
+from examples.firecrawl_automated_whitepaper_tracking.tests.test_async_semantic_filter import (
+    FakeAsyncClient,
+)
+
+
+def test_calibration_keeps_every_labelled_agent_paper():
+    """The shipped threshold is the calibrated one and rejects no relevant labelled paper."""
+    prefilter = LexicalPrefilter(DESIRED_CATEGORY, CATEGORY_EXEMPLARS)
+    calibrated, trade_off = calibrate(prefilter, LABELLED_PAPERS)
+    assert round(calibrated.threshold, 3) == DEFAULT_PREFILTER_THRESHOLD
+    assert calibrated.recall_loss == 0.0 and calibrated.calls_saved > 0
+    assert [point.recall_loss for point in trade_off] == sorted(
+        point.recall_loss for point in trade_off
+    )
+
+
+def test_exemplars_separate_agent_papers_from_other_papers():
+    """With the exemplars, more irrelevant papers score below every relevant one."""
+
+    def irrelevant_below_relevant(prefilter):
+        relevant = min(prefilter.score(t, a) for t, a, label in LABELLED_PAPERS if label)
+        return sum(
+            prefilter.score(t, a) < relevant for t, a, label in LABELLED_PAPERS if not label
+        )
+
+    with_exemplars = irrelevant_below_relevant(
+        LexicalPrefilter(DESIRED_CATEGORY, CATEGORY_EXEMPLARS)
+    )
+    assert with_exemplars > irrelevant_below_relevant(LexicalPrefilter(DESIRED_CATEGORY))
+    # Exemplars are not among the papers the threshold is calibrated on
+    titles = {exemplar.splitlines()[0] for exemplar in CATEGORY_EXEMPLARS}
+    assert not titles & {title for title, _, _ in LABELLED_PAPERS}
+
+
+def test_off_topic_papers_skip_the_classifier():
+    """A paper far from the category is rejected without an OpenAI request."""
+    openai_client = FakeAsyncClient(confidence=0.9)
+    classifier = AsyncSemanticFilter(openai_client=openai_client)
+    paper = {
+        "paper_title": "Diffusion Models for Video Super-Resolution",
+        "abstract_body": "We propose a diffusion model that upsamples low resolution video frames.",
+    }
+    assert asyncio.run(classifier.should_process(paper, True)) == (False, 0.0)
+    assert openai_client.calls == 0
@@ -0,0 +1,100 @@
+__doc__ = """Module for testing the adaptive sliding-window scheduler."""
+
+import asyncio
+import os
+import sys
+
+import aiohttp
+
+# Add the project root to the Python path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "../../../"))
+sys.path.insert(0, project_root)
+
+from examples.firecrawl_automated_whitepaper_tracking.scheduler import AdaptiveScheduler
+
+
+def _throttled() -> aiohttp.ClientResponseError:
+    return aiohttp.ClientResponseError(None, (), status=429, message="Too Many Requests")
+
+
+def _collect(scheduler: AdaptiveScheduler, items, worker) -> list:
+    async def run():
+        return [pair async for pair in scheduler.run(items, worker)]
+    return asyncio.run(run())
+
+
+def test_window_stays_full_and_grows_on_success():
+    """A slow item does not hold back the others, and successes widen the window."""
+    in_flight = 0
+    peak = 0
+
+    async def worker(item):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.05 if item == 0 else 0.001)
+        in_flight -= 1
+        return item * 2
+
+    scheduler = AdaptiveScheduler(
+        min_concurrency=1, max_concurrency=4, initial_concurrency=2, latency_spike_factor=1000
+    )
+    results = _collect(scheduler, range(20), worker)
+
+    assert sorted(results) == [(i, i * 2) for i in range(20)]
+    assert results[-1] == (0, 0)  # the slow item finished last, the rest flowed past it
+    assert scheduler.concurrency == 4
+    assert peak == scheduler.stats.peak_concurrency <= 4
+    assert scheduler.stats.completed == 20
+    assert len(scheduler.stats.queue_waits) == 20
+
+
+def test_window_halves_on_throttling_within_bounds():
+    """429 responses halve the window but never below the minimum."""
+    async def worker(item):
+        raise _throttled()
+
+    scheduler = AdaptiveScheduler(min_concurrency=2, max_concurrency=16, initial_concurrency=16)
+    results = _collect(scheduler, range(5), worker)
+
+    assert all(isinstance(error, aiohttp.ClientResponseError) for _, error in results)
+    assert scheduler.concurrency == 2
+    assert scheduler.stats.failed == 5
+    assert scheduler.stats.congestion_events == 5
+
+
+def test_window_halves_on_latency_spike():
+    """A request far slower than the running average counts as congestion."""
+    async def worker(item):
+        await asyncio.sleep(0.1 if item == 9 else 0.001)
+        return item
+
+    scheduler = AdaptiveScheduler(max_concurrency=8, initial_concurrency=1)
+    _collect(scheduler, range(10), worker)
+    assert scheduler.stats.congestion_events == 1
+    assert scheduler.stats.latencies[9] >= 0.1
+
+
+def test_other_errors_do_not_shrink_the_window():
+    """Failures that are not congestion are reported without touching the window."""
+    async def worker(item):
+        raise ValueError("bad page")
+
+    scheduler = AdaptiveScheduler(initial_concurrency=4)
+    _collect(scheduler, range(3), worker)
+    assert scheduler.concurrency == 4
+    assert scheduler.stats.congestion_events == 0
+
+
+def test_async_sources_are_consumed_as_items_arrive():
+    """Items of an async stream are scheduled while the stream is still producing."""
+    async def source():
+        for item in range(3):
+            await asyncio.sleep(0.01)
+            yield item
+
+    async def worker(item):
+        return item
+
+    scheduler = AdaptiveScheduler()
+    assert sorted(_collect(scheduler, source(), worker)) == [(0, 0), (1, 1), (2, 2)]
@@ -0,0 +1,141 @@
+__doc__ = """Module for testing the database layer on a local SQLite backend."""
+
+import os
+import sys
+from datetime import datetime, timedelta
+from decimal import Decimal
+from types import SimpleNamespace
+
+import pytest
+
+# Add the project root to the Python path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "../../../"))
+sys.path.insert(0, project_root)
+
+from examples.firecrawl_automated_whitepaper_tracking.supabase_db import (
+    MAX_RETRIES,
+    RETRY_BACKOFF_BASE_SECONDS,
+    Database,
+    UpvoteVelocity,
+)
+
+
+def paper(url, success=True, upvotes=3):
+    """Extracted details of a paper, or a failed extraction."""
+    if not success:
+        return {"url": url, "extraction_success": False, "extraction_error": "timeout"}
+    return {
+        "url": url,
+        "paper_title": f"Title of {url}",
+        "authors": "Jane Doe, John Smith",
+        "abstract_body": "Abstract.",
+        "utc_publication_date_year": 2024,
+        "utc_publication_date_month": 3,
+        "utc_publication_date_day": 15,
+        "utc_submission_date_year": 2024,
+        "utc_submission_date_month": 3,
+        "utc_submission_date_day": 16,
+        "number_of_upvotes": upvotes,
+        "number_of_comments": 1,
+        "extraction_success": True,
+    }
+
+
+@pytest.fixture
+def db():
+    database = Database("sqlite://")
+    yield database
+    database.engine.dispose()
+
+
+def test_upsert_reports_new_papers_and_keeps_details_of_failed_retries(db):
+    """A failed extraction of a stored paper keeps its details, arrays round-trip."""
+    assert db.add_papers([paper("a"), paper("b")]) == {"a": True, "b": True}
+    assert db.add_papers([paper("a", upvotes=9), paper("b", success=False)]) == {
+        "a": False, "b": False
+    }
+    assert db.add_paper(paper("b")) is False
+    assert db.add_paper(paper("a", success=False)) is False
+
+    stored = {p.url: p for p in db.get_all_papers()}
+    assert stored["a"].authors == ["Jane Doe", "John Smith"]
+    assert stored["a"].upvotes == 9
+    assert stored["a"].extraction_success is False
+    assert stored["b"].extraction_success is True
+    assert [row.url for row in db.iter_papers(["url"], batch_size=1)] == ["a", "b"]
+
+
+def test_partition_and_retry_leases(db):
+    """Leased papers are hidden from the tracker and a failed retry backs off."""
+    db.add_papers([paper("known"), paper("failed")])
+    old = datetime.now() - timedelta(hours=2)
+    db.add_paper({**paper("failed", success=False), "last_extraction_attempt": old})
+    assert db.partition_urls(["new", "known", "failed"]) == (
+        ["new"], ["failed"], ["known"], [], []
+    )
+
+    assert db.claim_failed_extractions("w1") == ["failed"]
+    assert db.claim_failed_extractions("w2") == []
+    assert db.partition_urls(["failed"]).deferred == ["failed"]
+    assert db.count_failed_extractions(["new", "known", "failed"]) == 1
+
+    assert db.record_retry_failure("failed", "w2", "not leased") is False
+    assert db.record_retry_failure("failed", "w1", "still failing") is True
+    row = next(p for p in db.get_all_papers() if p.url == "failed")
+    assert row.retry_count == 1 and row.lease_owner is None
+    assert row.next_retry_at - row.last_extraction_attempt == timedelta(
+        seconds=RETRY_BACKOFF_BASE_SECONDS
+    )
+    assert db.claim_failed_extractions("w1") == []
+
+
+def test_tracker_failures_count_towards_max_retries(db):
+    """Unleased failures back off too, and papers out of retries are abandoned."""
+    db.add_paper(paper("flaky", success=False))
+    for attempt in range(MAX_RETRIES):
+        assert db.record_retry_failure("flaky", None, f"attempt {attempt}") is True
+        assert db.partition_urls(["flaky"]).deferred == (
+            ["flaky"] if attempt < MAX_RETRIES - 1 else []
+        )
+    assert db.partition_urls(["flaky"]).abandoned == ["flaky"]
+
+
+def test_metric_history_and_velocity(db):
+    """Observations are appended and velocity is computed from the stored history."""
+    now = datetime.now()
+    assert db.record_metrics([("a", 1, 0), ("b", 5, 0)], now - timedelta(hours=2)) == 2
+    assert db.record_metrics([("a", 9, 2), ("b", 6, 0)], now) == 2
+    assert db.record_metrics([]) == 0
+
+    velocities = db.upvote_velocity(window_hours=3)
+    assert [v.url for v in velocities] == ["a", "b"]
+    assert velocities[0].upvote_delta == 8
+    assert velocities[0].upvotes_per_hour == pytest.approx(4)
+    assert [v.url for v in db.upvote_velocity(urls=["b"])] == ["b"]
+    assert isinstance(velocities[0], UpvoteVelocity)
+
+
+def test_postgres_velocity_rows_become_floats():
+    """Postgres rows map to the same UpvoteVelocity types as the local computation."""
+    now = datetime.now()
+    row = SimpleNamespace(
+        url="a", first_observed_at=now - timedelta(hours=2), last_observed_at=now,
+        upvote_delta=8, upvotes_per_hour=Decimal("4.0000000000000000")
+    )
+    velocity = UpvoteVelocity.from_row(row)
+    assert velocity == ("a", row.first_observed_at, now, 8, 4.0)
+    assert type(velocity.upvotes_per_hour) is float
+    row.upvotes_per_hour = None
+    assert UpvoteVelocity.from_row(row).upvotes_per_hour is None
+
+
+def test_existing_local_database_skips_table_creation(tmp_path):
+    """A second start against an up-to-date file is verified by the probe alone."""
+    url = f"sqlite:///{tmp_path / 'papers.db'}"
+    Database(url).engine.dispose()
+    reopened = Database(url)
+    probe = reopened._startup_probe()
+    assert probe.version == Database.CURRENT_SCHEMA_VERSION
+    assert probe.missing_tables == []
+    assert reopened.schema_version == Database.CURRENT_SCHEMA_VERSION
+    reopened.engine.dispose()